@@ -1,3 +1,31 @@
 __version__ = "0.7.1"
-__all__ = ["NixtlaClient"]
-from .nixtla_client import NixtlaClient
+__all__ = [
+    "AsyncNixtlaClient",
+    "BatchingForecaster",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FileRateLimiter",
+    "HedgePolicy",
+    "MemoryCache",
+    "MemoryRateLimiter",
+    "NixtlaClient",
+    "PartitionResult",
+    "RedisRateLimiter",
+    "RetryPolicy",
+    "SqliteCache",
+]
+from .nixtla_client import (
+    AsyncNixtlaClient,
+    BatchingForecaster,
+    CircuitBreaker,
+    CircuitOpenError,
+    FileRateLimiter,
+    HedgePolicy,
+    MemoryCache,
+    MemoryRateLimiter,
+    NixtlaClient,
+    PartitionResult,
+    RedisRateLimiter,
+    RetryPolicy,
+    SqliteCache,
+)
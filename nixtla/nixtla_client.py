@@ -1,21 +1,60 @@
-__all__ = ["ApiError", "NixtlaClient"]
+__all__ = [
+    "ApiError",
+    "AsyncNixtlaClient",
+    "BatchingForecaster",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FileRateLimiter",
+    "HedgePolicy",
+    "MemoryCache",
+    "MemoryRateLimiter",
+    "NixtlaClient",
+    "RedisRateLimiter",
+    "RetryPolicy",
+    "SqliteCache",
+]
 
+import asyncio
+import contextlib
+import contextvars
 import datetime
+import email.utils
+import hashlib
+import itertools
 import logging
 import math
 import os
+import random
 import re
+import shutil
+import sqlite3
+import statistics
+import struct
+import sys
+import threading
+import time
 import warnings
-from collections.abc import Sequence
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Generator, Hashable, Iterable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from enum import Enum
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
+    Awaitable,
     Callable,
     Dict,
     Literal,
+    NamedTuple,
     Optional,
     TypeVar,
     Union,
@@ -37,14 +76,21 @@ from tenacity import (
     retry_if_exception,
     stop_after_attempt,
     stop_after_delay,
-    wait_fixed,
 )
-from utilsforecast.compat import DataFrame, DFType, pl_DataFrame
+from utilsforecast.compat import DataFrame, DFType, Series, pl_DataFrame, pl_Series
 from utilsforecast.feature_engineering import _add_time_features, time_features
 from utilsforecast.preprocessing import fill_gaps, id_time_grid
 from utilsforecast.processing import ensure_sorted
 from utilsforecast.validation import ensure_time_dtype, validate_format
 
+try:
+    from polars import LazyFrame as pl_LazyFrame
+except ImportError:
+
+    class pl_LazyFrame:  # type: ignore[no-redef]
+        ...
+
+
 if TYPE_CHECKING:
     try:
         from fugue import AnyDataFrame
@@ -62,6 +108,10 @@ if TYPE_CHECKING:
         import triad
     except ModuleNotFoundError:
         pass
+    try:
+        import pyarrow as pa
+    except ModuleNotFoundError:
+        pass
     try:
         from polars import DataFrame as PolarsDataFrame
     except ModuleNotFoundError:
@@ -139,6 +189,38 @@ _FinetuneDepth = Literal[1, 2, 3, 4, 5]
 _Freq = Union[str, int, pd.offsets.BaseOffset]
 _FreqType = TypeVar("_FreqType", str, int, pd.offsets.BaseOffset)
 _ThresholdMethod = Literal["univariate", "multivariate"]
+_PayloadCodec = Literal["json", "binary"]
+_FreqValidation = Literal["grid", "vectorized"]
+_FallbackMethod = Literal["seasonal_naive", "historic_average"]
+_OnTimeout = Literal["raise", "partial"]
+_T = TypeVar("_T")
+
+
+class _ApiCall(NamedTuple):
+    endpoint: str
+    payload: dict[str, Any]
+    num_partitions: Optional[int] = None
+    # horizon, used to split the future exogenous when partitioning
+    h: int = 0
+    method: Literal["get", "post"] = "post"
+    # whether the series can be split automatically when the payload is large
+    auto_partition: bool = True
+    # concurrent calls with the same key, from any client, make a single request
+    single_flight_key: Optional[Hashable] = None
+
+
+# endpoints without side effects, whose responses can be cached
+_CACHEABLE_ENDPOINTS = {
+    "v2/forecast",
+    "v2/historic_forecast",
+    "v2/anomaly_detection",
+    "v2/online_anomaly_detection",
+    "v2/cross_validation",
+}
+
+# generator that yields the API calls required by a method,
+# receives their responses and returns the method's output
+_Steps = Generator[list[_ApiCall], list[dict[str, Any]], _T]
 
 
 class FinetunedModel(BaseModel, extra="allow"):  # type: ignore
@@ -217,7 +299,314 @@ _date_features_by_freq = {
 }
 
 
-def _retry_strategy(max_retries: int, retry_interval: int, max_wait_time: int):
+class _RetryBudget:
+    # token bucket shared by all the calls of a client: every request deposits
+    # `ratio` tokens and every retry takes one, so that retries can't exceed
+    # that fraction of the requests (plus the initial reserve)
+    def __init__(self, ratio: float, reserve: int):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.reserve)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _RetryStats:
+    # retries made by a single call to a client's method, which can span
+    # several threads (e.g. for partitioned requests)
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.wait_time = 0.0
+        self.retries_denied = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        requests: int = 0,
+        retries: int = 0,
+        wait_time: float = 0.0,
+        retries_denied: int = 0,
+    ) -> None:
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.wait_time += wait_time
+            self.retries_denied += retries_denied
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "wait_time": self.wait_time,
+            "retries_denied": self.retries_denied,
+        }
+
+
+_current_retry_stats: contextvars.ContextVar[Optional[_RetryStats]] = (
+    contextvars.ContextVar("_current_retry_stats", default=None)
+)
+
+
+def _record_retry_stats(**kwargs: Any) -> None:
+    stats = _current_retry_stats.get()
+    if stats is not None:
+        stats.record(**kwargs)
+
+
+# results of the last call of every client made by the current thread or
+# asyncio task. The mappings are replaced instead of modified, so that the
+# tasks, which start with a copy of the context, don't share them.
+_call_results: contextvars.ContextVar[
+    Optional[weakref.WeakKeyDictionary[Any, dict[str, Any]]]
+] = contextvars.ContextVar("_call_results", default=None)
+
+
+class _CallResult:
+    # attribute of a client that holds a result of its last call made by the
+    # current thread or asyncio task, e.g. the retry stats. Concurrent calls
+    # on a shared client don't overwrite each other's.
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        results = _call_results.get()
+        if results is None or self.name not in results.get(obj, {}):
+            raise AttributeError(
+                f"'{type(obj).__name__}' object has no attribute '{self.name}'"
+            )
+        return results[obj][self.name]
+
+    def _replace(
+        self, obj: Any, fn: Callable[[dict[str, Any]], dict[str, Any]]
+    ) -> None:
+        results = weakref.WeakKeyDictionary(_call_results.get() or {})
+        results[obj] = fn(results.get(obj, {}))
+        _call_results.set(results)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self._replace(obj, lambda values: {**values, self.name: value})
+
+    def __delete__(self, obj: Any) -> None:
+        # doesn't raise if the attribute isn't set
+        self._replace(
+            obj, lambda values: {k: v for k, v in values.items() if k != self.name}
+        )
+
+
+class _Deadline:
+    # time limit of a single call to a client's method, shared by all its
+    # requests (which can run in several threads)
+    def __init__(self, timeout: Optional[float], on_timeout: _OnTimeout):
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+        # set to stop the requests in flight, e.g. after a KeyboardInterrupt
+        self.cancelled = threading.Event()
+        # positions of the series without results when the call is partial
+        self.missing_series: set[int] = set()
+
+    def remaining(self) -> float:
+        if self.cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return math.inf
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def error(self) -> TimeoutError:
+        if self.cancelled.is_set() and self.timeout is None:
+            return TimeoutError("The call was cancelled.")
+        return TimeoutError(f"The call didn't complete within {self.timeout}s.")
+
+    def request_timeout(self, default: Optional[float]) -> Optional[float]:
+        # timeout of the next request, which can't go past the deadline
+        remaining = self.remaining()
+        if remaining == 0:
+            raise self.error()
+        if default is None:
+            return None if math.isinf(remaining) else remaining
+        return min(default, remaining)
+
+
+_current_deadline: contextvars.ContextVar[Optional[_Deadline]] = contextvars.ContextVar(
+    "_current_deadline", default=None
+)
+
+# set in the attempts of a hedged request once one of them has returned, so
+# that the others are dropped if they haven't been sent yet
+_current_hedge_done: contextvars.ContextVar[Optional[threading.Event]] = (
+    contextvars.ContextVar("_current_hedge_done", default=None)
+)
+
+
+# outputs that a call would set as attributes of the client (e.g. `weights_x`),
+# collected instead by the iter methods for each partition, whose calls run
+# at the same time
+_current_call_outputs: contextvars.ContextVar[Optional[dict[str, Any]]] = (
+    contextvars.ContextVar("_current_call_outputs", default=None)
+)
+
+
+def _is_partial() -> bool:
+    # whether the current call filled in the partitions that didn't complete
+    # before the deadline, whose responses can't be cached
+    deadline = _current_deadline.get()
+    return deadline is not None and bool(deadline.missing_series)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # the header can be either a number of seconds or an HTTP date
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((date - now).total_seconds(), 0.0)
+
+
+class _SingleFlight:
+    # makes concurrent callers of the same key (from threads or coroutines)
+    # wait for a single call instead of each making their own
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._in_flight[key]
+
+    def run(self, key: Hashable, fn: Callable[[], _T]) -> _T:
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+        future.set_result(result)
+        return result
+
+    async def arun(self, key: Hashable, fn: Callable[[], Awaitable[_T]]) -> _T:
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+        future.set_result(result)
+        return result
+
+
+_single_flight = _SingleFlight()
+
+
+class _ModelParamsCache:
+    # process-wide cache of the models' metadata, optionally persisted to a
+    # JSON file that can be shared by several processes
+    def __init__(self) -> None:
+        self._params: dict[str, tuple[float, tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, model: str, freq: str) -> str:
+        return f"{base_url} {model} {freq}"
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, Any]:
+        try:
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+
+    def get(
+        self, key: str, ttl: Optional[float], path: Optional[Path]
+    ) -> Optional[tuple[int, int]]:
+        with self._lock:
+            entry = self._params.get(key)
+            if entry is None and path is not None:
+                stored = self._read(path).get(key)
+                if stored is not None:
+                    params = (stored["input_size"], stored["horizon"])
+                    entry = (stored["time"], params)
+                    self._params[key] = entry
+        if entry is None:
+            return None
+        fetched_at, params = entry
+        if ttl is not None and time.time() - fetched_at > ttl:
+            return None
+        return params
+
+    def set(self, key: str, params: tuple[int, int], path: Optional[Path]) -> None:
+        now = time.time()
+        with self._lock:
+            self._params[key] = (now, params)
+            if path is None:
+                return
+            stored = self._read(path)
+            input_size, horizon = params
+            stored[key] = {"input_size": input_size, "horizon": horizon, "time": now}
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(
+                    f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                tmp_path.write_bytes(orjson.dumps(stored))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not save the model metadata to {path}: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._params.clear()
+
+
+_model_params_cache = _ModelParamsCache()
+
+
+def _retry_strategy(policy: "RetryPolicy", budget: Optional[_RetryBudget]):
     def should_retry(exc: Exception) -> bool:
         retriable_exceptions = (
             ConnectionResetError,
@@ -236,19 +625,339 @@ def _retry_strategy(max_retries: int, retry_interval: int, max_wait_time: int):
             isinstance(exc, ApiError) and exc.status_code in retriable_codes
         )
 
+    def before_attempt(retry_state: RetryCallState) -> None:
+        if retry_state.attempt_number == 1:
+            _record_retry_stats(requests=1)
+            if budget is not None:
+                budget.deposit()
+
     def after_retry(retry_state: RetryCallState) -> None:
         error = retry_state.outcome.exception()
         logger.error(f"Attempt {retry_state.attempt_number} failed with error: {error}")
 
+    def wait(retry_state: RetryCallState) -> float:
+        error = retry_state.outcome.exception()
+        return policy._delay(
+            attempt=retry_state.attempt_number,
+            retry_after=getattr(error, "retry_after", None),
+        )
+
+    def before_sleep(retry_state: RetryCallState) -> None:
+        _record_retry_stats(retries=1, wait_time=retry_state.next_action.sleep)
+
+    def deadline_reached(retry_state: RetryCallState) -> bool:
+        deadline = _current_deadline.get()
+        if deadline is None:
+            return False
+        # the sleep before the next attempt is computed before the stop
+        # conditions since tenacity 8.3
+        return deadline.remaining() <= retry_state.upcoming_sleep
+
+    def give_up(retry_state: RetryCallState) -> Any:
+        error = retry_state.outcome.exception()
+        deadline = _current_deadline.get()
+        if deadline is not None and deadline_reached(retry_state):
+            raise deadline.error() from error
+        raise error
+
+    def budget_exhausted(retry_state: RetryCallState) -> bool:
+        # evaluated after the other stop conditions, so that only the
+        # retries that are going to happen take a token
+        if budget is None or budget.withdraw():
+            return False
+        logger.warning("Retry budget exhausted, not retrying the request.")
+        _record_retry_stats(retries_denied=1)
+        return True
+
     return retry(
         retry=retry_if_exception(should_retry),
-        wait=wait_fixed(retry_interval),
+        wait=wait,
+        before=before_attempt,
         after=after_retry,
-        stop=stop_after_attempt(max_retries) | stop_after_delay(max_wait_time),
-        reraise=True,
+        before_sleep=before_sleep,
+        stop=(
+            stop_after_attempt(policy.max_retries)
+            | stop_after_delay(policy.max_wait_time)
+            | deadline_reached
+            | budget_exhausted
+        ),
+        retry_error_callback=give_up,
     )
 
 
+def _is_server_failure(exc: BaseException) -> bool:
+    # errors that show that the API is unavailable, as opposed to errors
+    # caused by the request (e.g. invalid inputs)
+    return isinstance(
+        exc, (ConnectionResetError, httpcore.NetworkError, httpx.TransportError)
+    ) or (
+        isinstance(exc, ApiError)
+        and exc.status_code is not None
+        and (exc.status_code >= 500 or exc.status_code == 408)
+    )
+
+
+@contextlib.contextmanager
+def _circuit_breaker_guard(breaker: Optional["CircuitBreaker"]) -> Iterator[None]:
+    if breaker is None:
+        yield
+        return
+    breaker._before_request()
+    ok = None
+    try:
+        yield
+        ok = True
+    except Exception as e:
+        ok = not _is_server_failure(e)
+        raise
+    finally:
+        breaker._after_request(ok)
+
+
+def _is_overload(exc: BaseException) -> bool:
+    return isinstance(exc, httpx.TimeoutException) or (
+        isinstance(exc, ApiError) and exc.status_code in (429, 503)
+    )
+
+
+class _ConcurrencyController:
+    """Limits the number of partitions in flight.
+
+    When adaptive, the limit follows an AIMD scheme: it grows by one after
+    a full window of successful requests as long as the p95 latency stays
+    below `latency_tolerance` times the best median latency observed and
+    the error rate is low. It's halved when the API signals overload
+    (429, 503 or timeouts), at most once per window."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        adaptive: bool,
+        initial_concurrency: int = 4,
+        latency_tolerance: float = 2.0,
+        max_error_rate: float = 0.05,
+        window_size: int = 50,
+    ):
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        if adaptive:
+            self.limit = min(initial_concurrency, max_concurrency)
+        else:
+            self.limit = max_concurrency
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._completions: deque[float] = deque(maxlen=window_size)
+        self._baseline_latency = math.inf
+        self._since_adjustment = 0
+        self._requests = 0
+        self._errors = 0
+        self._backoffs = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            self._record(ok=True)
+            self._latencies.append(latency)
+            if not self.adaptive or self._since_adjustment < self.limit:
+                return
+            latencies = np.array(self._latencies)
+            self._baseline_latency = min(
+                self._baseline_latency, float(np.median(latencies))
+            )
+            p95 = float(np.quantile(latencies, 0.95))
+            healthy = (
+                p95 <= self.latency_tolerance * self._baseline_latency
+                and self._error_rate() <= self.max_error_rate
+            )
+            if healthy and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._since_adjustment = 0
+
+    def on_error(self, exc: BaseException) -> None:
+        with self._lock:
+            self._record(ok=False)
+            self._errors += 1
+            if not self.adaptive or not _is_overload(exc):
+                return
+            # requests in flight when the API got overloaded fail together,
+            # so we only back off once per window
+            if self._backoffs and self._since_adjustment < self.limit:
+                return
+            self.limit = max(1, self.limit // 2)
+            self._since_adjustment = 0
+            self._backoffs += 1
+
+    def _record(self, ok: bool) -> None:
+        self._requests += 1
+        self._since_adjustment += 1
+        self._outcomes.append(ok)
+        self._completions.append(time.monotonic())
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return 1 - sum(self._outcomes) / len(self._outcomes)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            throughput = None
+            if len(self._completions) > 1:
+                elapsed = self._completions[-1] - self._completions[0]
+                if elapsed > 0:
+                    throughput = (len(self._completions) - 1) / elapsed
+            p95_latency = None
+            if self._latencies:
+                p95_latency = float(np.quantile(np.array(self._latencies), 0.95))
+            return {
+                "concurrency": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "throughput": throughput,
+                "p95_latency": p95_latency,
+                "error_rate": self._error_rate(),
+                "requests": self._requests,
+                "errors": self._errors,
+                "backoffs": self._backoffs,
+            }
+
+
+class _StepSlots:
+    # requests in flight of the calls of a step, which are made at the same
+    # time (e.g. the forecasts and the fitted values) but share the limit of
+    # the concurrency controller
+    def __init__(self, controller: _ConcurrencyController):
+        self.controller = controller
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float]) -> bool:
+        # returns False if no slot was released before the timeout
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self.in_flight < self.controller.limit, timeout
+            ):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+
+class _AsyncStepSlots:
+    # same as `_StepSlots` for the coroutines of the async client, which run
+    # in a single thread
+    def __init__(self, controller: _ConcurrencyController):
+        self.controller = controller
+        self.in_flight = 0
+        self._released = asyncio.Event()
+
+    async def acquire(self, timeout: Optional[float]) -> bool:
+        # there's no await between the check and the increment, so a free
+        # slot is taken right away, even with a zero timeout
+        if self.in_flight < self.controller.limit:
+            self.in_flight += 1
+            return True
+        try:
+            await asyncio.wait_for(self._acquire(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _acquire(self) -> None:
+        while self.in_flight >= self.controller.limit:
+            self._released.clear()
+            await self._released.wait()
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._released.set()
+
+
+_current_step_slots: contextvars.ContextVar[
+    Union[_StepSlots, _AsyncStepSlots, None]
+] = contextvars.ContextVar("_current_step_slots", default=None)
+
+
+class _HedgeTracker:
+    # latencies of the requests that can be hedged, used to compute the delay
+    # before sending a duplicate, and counters of the hedges and their outcome
+    def __init__(self, policy: "HedgePolicy"):
+        self.policy = policy
+        self._latencies: deque[float] = deque(maxlen=policy.window_size)
+        self._requests = 0
+        self._hedges = 0
+        self._wins = 0
+        self._losses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> Optional[float]:
+        if self.policy.delay is not None:
+            return self.policy.delay
+        if len(self._latencies) < self.policy.min_samples:
+            return None
+        latency = np.quantile(np.array(self._latencies), self.policy.percentile / 100)
+        return max(float(latency), self.policy.min_delay)
+
+    def start(self) -> Optional[float]:
+        # registers a request, returns the time to wait before hedging it
+        # or None if there isn't enough data to compute it
+        with self._lock:
+            self._requests += 1
+            return self._delay()
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.policy.max_hedge_ratio * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def on_hedge_result(self, hedge_won: bool) -> None:
+        with self._lock:
+            if hedge_won:
+                self._wins += 1
+            else:
+                self._losses += 1
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "delay": self._delay(),
+                "requests": self._requests,
+                "hedges": self._hedges,
+                "hedge_rate": self._hedges / self._requests if self._requests else 0.0,
+                "wins": self._wins,
+                "losses": self._losses,
+            }
+
+
 def _maybe_infer_freq(
     df: DataFrame,
     freq: Optional[_FreqType],
@@ -257,18 +966,15 @@ def _maybe_infer_freq(
 ) -> _FreqType:
     if freq is not None:
         return freq
-    if isinstance(df, pl_DataFrame):
-        raise ValueError(
-            "Cannot infer frequency for a polars DataFrame, please set the "
-            "`freq` argument to a valid polars offset.\nYou can find them at "
-            "https://pola-rs.github.io/polars/py-polars/html/reference/expressions/api/polars.Expr.dt.offset_by.html"
-        )
-    assert isinstance(df, pd.DataFrame)
-    sizes = df[id_col].value_counts(sort=True)
-    times = df.loc[df[id_col] == sizes.index[0], time_col].sort_values()
-    if times.dt.tz is not None:
-        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
-    inferred_freq = pd.infer_freq(times.values)
+    if isinstance(df, (pl_DataFrame, pl_LazyFrame)):
+        inferred_freq = _infer_polars_freq(df, id_col, time_col)
+    else:
+        assert isinstance(df, pd.DataFrame)
+        sizes = df[id_col].value_counts(sort=True)
+        times = df.loc[df[id_col] == sizes.index[0], time_col].sort_values()
+        if times.dt.tz is not None:
+            times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+        inferred_freq = pd.infer_freq(times.values)
     if inferred_freq is None:
         raise RuntimeError(
             "Could not infer the frequency of the time column. This could be due "
@@ -279,7 +985,129 @@ def _maybe_infer_freq(
     return inferred_freq
 
 
-def _standardize_freq(freq: _Freq, processed: ufp.ProcessedDF) -> str:
+_POLARS_DURATION_UNITS = [
+    ("w", datetime.timedelta(weeks=1)),
+    ("d", datetime.timedelta(days=1)),
+    ("h", datetime.timedelta(hours=1)),
+    ("m", datetime.timedelta(minutes=1)),
+    ("s", datetime.timedelta(seconds=1)),
+    ("ms", datetime.timedelta(milliseconds=1)),
+    ("us", datetime.timedelta(microseconds=1)),
+]
+
+
+def _infer_polars_freq(
+    df: Union[pl_DataFrame, pl_LazyFrame], id_col: str, time_col: str
+) -> Optional[_FreqType]:
+    # returns the polars offset between the timestamps of the longest series,
+    # only collecting that series when `df` is lazy
+    import polars as pl
+
+    longest = (
+        df.lazy().group_by(id_col).len().sort("len", descending=True).head(1)
+    ).select(id_col)
+    times = (
+        df.lazy()
+        .join(longest, on=id_col)
+        .select(pl.col(time_col).sort())
+        .collect()[time_col]
+    )
+    diffs = times.diff().drop_nulls().unique()
+    if times.dtype.is_integer():
+        return int(diffs[0]) if diffs.len() == 1 else None
+    if diffs.len() == 1:
+        diff = diffs[0]
+        for unit, duration in _POLARS_DURATION_UNITS:
+            if diff % duration == datetime.timedelta(0):
+                return f"{diff // duration}{unit}"
+        return None
+    # calendar offsets, which have a different duration every time
+    months = (times.dt.year() * 12 + times.dt.month()).diff().drop_nulls().unique()
+    same_day = times.dt.day().n_unique() == 1 or (times.dt.month_end() == times).all()
+    if months.len() != 1 or not same_day:
+        return None
+    n_months = months[0]
+    if n_months % 12 == 0:
+        return f"{n_months // 12}y"
+    return f"{n_months}mo"
+
+
+def _polars_steps_ok(times: pl_Series, freq: str, starts: np.ndarray) -> np.ndarray:
+    import polars as pl
+
+    n, unit = re.findall(r"(\d+)(\w+)", freq)[0]
+    durations = dict(_POLARS_DURATION_UNITS)
+    if unit in durations and getattr(times.dtype, "time_zone", None) is None:
+        return (times.diff().slice(1) == int(n) * durations[unit]).to_numpy()
+    # calendar offsets are applied to the first timestamp of each serie, as
+    # polars does when building the ranges, so that e.g. the days after the
+    # 28th are kept in the following months
+    sizes = np.diff(np.append(starts, times.len()))
+    steps = np.arange(times.len()) - np.repeat(starts, sizes)
+    offsets = pl.format("{}" + unit, pl.col("k") * int(n))
+    expected = (
+        pl.DataFrame({"first": times.gather(np.repeat(starts, sizes)), "k": steps})
+        .select(pl.col("first").dt.offset_by(offsets))
+        .to_series()
+    )
+    return (expected == times).to_numpy()[1:]
+
+
+def _pandas_steps_ok(
+    times: pd.DatetimeIndex, offset: pd.offsets.BaseOffset
+) -> np.ndarray:
+    if isinstance(offset, pd.offsets.Tick):
+        return np.asarray(times[1:] - times[:-1] == pd.Timedelta(offset))
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=pd.errors.PerformanceWarning)
+        return np.asarray(times[:-1] + offset == times[1:])
+
+
+def _irregular_series(
+    df: DFType, freq: _FreqType, id_col: str, time_col: str
+) -> list[Any]:
+    """Ids of the series that have missing or duplicate timestamps, or whose
+    timestamps don't match `freq`.
+
+    Compares the consecutive timestamps of each serie in a single pass over
+    the sorted times, instead of building the expected grid."""
+    ids = df[id_col]
+    times = df[time_col]
+    sort_idxs = ufp.maybe_compute_sort_indices(df, id_col, time_col)
+    if sort_idxs is not None:
+        ids = ufp.take_rows(ids, sort_idxs)
+        times = ufp.take_rows(times, sort_idxs)
+    if isinstance(ids, pl_Series):
+        same_id = (ids.slice(1) == ids.slice(0, ids.len() - 1)).to_numpy()
+    else:
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            id_values = ids.cat.codes.to_numpy()
+        else:
+            id_values = ids.to_numpy()
+        same_id = id_values[1:] == id_values[:-1]
+    starts = np.append(0, np.flatnonzero(~same_id) + 1)
+    irregular = np.zeros(len(ids), dtype=bool)
+    if isinstance(freq, int):
+        steps_ok = np.diff(times.to_numpy()) == freq
+    elif isinstance(times, pl_Series):
+        steps_ok = _polars_steps_ok(times, freq, starts)
+    else:
+        times = pd.DatetimeIndex(times)
+        offset = pd.tseries.frequencies.to_offset(freq)
+        steps_ok = _pandas_steps_ok(times, offset)
+        if isinstance(freq, str) and len(ids):
+            # the ranges of the aliases start at the first anchored date, e.g.
+            # the end of the month for 'ME'
+            firsts = times[starts]
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=pd.errors.PerformanceWarning)
+                irregular[starts] = np.asarray(firsts + offset * 0 != firsts)
+    irregular[1:] |= same_id & ~steps_ok
+    bad_ids = ufp.take_rows(ids, np.flatnonzero(irregular)).to_list()
+    return list(dict.fromkeys(bad_ids))
+
+
+def _standardize_freq(freq: _Freq, processed: Optional[ufp.ProcessedDF] = None) -> str:
     if isinstance(freq, str):
         # polars uses 'mo' for months, all other strings are compatible with pandas
         freq = freq.replace("mo", "MS")
@@ -294,21 +1122,40 @@ def _standardize_freq(freq: _Freq, processed: ufp.ProcessedDF) -> str:
     return freq
 
 
+def _tail_indices(indptr: np.ndarray, out_sizes: np.ndarray) -> np.ndarray:
+    # the i-th series' tail starts at indptr[i + 1] - out_sizes[i], so every
+    # position of the output is shifted by the same amount within a series
+    out_indptr = np.append(0, np.cumsum(out_sizes))
+    shifts = indptr[1:] - out_indptr[1:]
+    return np.arange(out_indptr[-1]) + np.repeat(shifts, out_sizes)
+
+
 def _array_tails(
     x: np.ndarray,
     indptr: np.ndarray,
     out_sizes: np.ndarray,
 ) -> np.ndarray:
-    if (out_sizes > np.diff(indptr)).any():
+    sizes = np.diff(indptr)
+    if (out_sizes > sizes).any():
         raise ValueError("out_sizes must be at most the original sizes.")
-    idxs = np.hstack(
-        [np.arange(end - size, end) for end, size in zip(indptr[1:], out_sizes)]
-    )
+    if np.array_equal(out_sizes, sizes):
+        # every series is kept whole
+        return x
+    idxs = _tail_indices(indptr, out_sizes)
+    if x.ndim == 2 and x.flags.f_contiguous:
+        # keeps the columns contiguous
+        out = np.empty((idxs.size, x.shape[1]), dtype=x.dtype, order="F")
+        for j in range(x.shape[1]):
+            np.take(x[:, j], idxs, out=out[:, j])
+        return out
     return x[idxs]
 
 
 def _tail(proc: ufp.ProcessedDF, n: int) -> ufp.ProcessedDF:
-    new_sizes = np.minimum(np.diff(proc.indptr), n)
+    sizes = np.diff(proc.indptr)
+    if sizes.max(initial=0) <= n:
+        return proc._replace(sort_idxs=None)
+    new_sizes = np.minimum(sizes, n)
     new_indptr = np.append(0, new_sizes.cumsum())
     new_data = _array_tails(proc.data, proc.indptr, new_sizes)
     return ufp.ProcessedDF(
@@ -320,38 +1167,65 @@ def _tail(proc: ufp.ProcessedDF, n: int) -> ufp.ProcessedDF:
     )
 
 
+def _partition_bounds(weights: np.ndarray, n_part: int) -> np.ndarray:
+    # splits the series in at most n_part contiguous groups with a similar
+    # total weight, returns the index of the first series of each group
+    # and the number of series as the last element
+    n_series = weights.size
+    cum_weights = np.cumsum(weights)
+    targets = cum_weights[-1] * np.arange(1, n_part) / n_part
+    cuts = np.searchsorted(cum_weights, targets, side="left") + 1
+    cuts = np.unique(np.clip(cuts, 1, n_series))
+    cuts = cuts[cuts < n_series]
+    return np.hstack([0, cuts, n_series])
+
+
 def _partition_series(
     payload: dict[str, Any], n_part: int, h: int
 ) -> list[dict[str, Any]]:
     parts = []
-    series = payload.pop("series")
-    n_series = len(series["sizes"])
+    series = payload["series"]
+    payload = {k: v for k, v in payload.items() if k != "series"}
+    sizes = np.asarray(series["sizes"], dtype=np.int64)
+    n_series = sizes.size
     n_part = min(n_part, n_series)
-    series_per_part = math.ceil(n_series / n_part)
-    prev_size = 0
-    for i in range(0, n_series, series_per_part):
-        sizes = series["sizes"][i : i + series_per_part]
-        curr_size = sum(sizes)
-        part_idxs = slice(prev_size, prev_size + curr_size)
-        prev_size += curr_size
+    # balance the partitions by number of observations (including the future
+    # values of the exogenous features) instead of by number of series
+    bounds = _partition_bounds(sizes + h, n_part)
+    indptr = np.append(0, sizes.cumsum())
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        part_idxs = slice(indptr[start], indptr[end])
         part_series = {
             "y": series["y"][part_idxs],
-            "sizes": sizes,
+            "sizes": series["sizes"][start:end],
         }
         if series["X"] is None:
             part_series["X"] = None
-            if h > 0:
-                part_series["X_future"] = None
         else:
             part_series["X"] = [x[part_idxs] for x in series["X"]]
-            if h > 0:
+        if h > 0:
+            if series["X_future"] is None:
+                # e.g. when there are only historical exogenous features
+                part_series["X_future"] = None
+            else:
                 part_series["X_future"] = [
-                    x[i * h : (i + series_per_part) * h] for x in series["X_future"]
+                    x[start * h : end * h] for x in series["X_future"]
                 ]
         parts.append({"series": part_series, **payload})
     return parts
 
 
+def _estimate_payload_size(series: dict[str, Any], h: int, codec: _PayloadCodec) -> int:
+    # approximate size of the serialized series, computed from their sizes and
+    # the number of exogenous features so that it's known before encoding them
+    n_series = len(series["sizes"])
+    n_obs = int(np.sum(series["sizes"]))
+    n_x = 0 if series.get("X") is None else len(series["X"])
+    n_x_future = 0 if series.get("X_future") is None else len(series["X_future"])
+    n_values = n_obs * (1 + n_x) + n_series * h * n_x_future
+    return n_values * _BYTES_PER_VALUE[codec] + n_series * _BYTES_PER_VALUE["json"]
+
+
 def _maybe_add_date_features(
     df: DFType,
     X_df: Optional[DFType],
@@ -394,20 +1268,38 @@ def _maybe_add_date_features(
         features_one_hot = [f for f in date_features if not callable(f)]
     else:
         features_one_hot = []
+    if h == 0:
+        # time_features returns an empty df, we use it as None here
+        X_df = None
     if features_one_hot:
-        X_df = ufp.assign_columns(X_df, target_col, 0)
-        full_df = ufp.vertical_concat([df, X_df])
+        if X_df is None:
+            full_df = df
+        else:
+            # the historic exogenous aren't in the future values
+            hist_cols = [
+                c
+                for c in df.columns
+                if c not in X_df.columns and c not in (target_col, *features_one_hot)
+            ]
+            X_df = ufp.assign_columns(X_df, target_col, 0)
+            if isinstance(df, pl_DataFrame):
+                import polars as pl
+
+                # matches the columns by name and fills the historic
+                # exogenous of the future values with nulls
+                full_df = pl.concat([df, X_df], how="diagonal_relaxed")
+            else:
+                full_df = ufp.vertical_concat([df, X_df])
         if isinstance(full_df, pd.DataFrame):
             full_df = pd.get_dummies(full_df, columns=features_one_hot, dtype="float32")
         else:
             full_df = full_df.to_dummies(columns=features_one_hot)
-        df = ufp.take_rows(full_df, slice(0, df.shape[0]))
-        X_df = ufp.take_rows(full_df, slice(df.shape[0], full_df.shape[0]))
-        X_df = ufp.drop_columns(X_df, target_col)
-        X_df = ufp.drop_index_if_pandas(X_df)
-    if h == 0:
-        # time_features returns an empty df, we use it as None here
-        X_df = None
+        n_hist = df.shape[0]
+        df = ufp.take_rows(full_df, slice(0, n_hist))
+        if X_df is not None:
+            X_df = ufp.take_rows(full_df, slice(n_hist, full_df.shape[0]))
+            X_df = ufp.drop_columns(X_df, [target_col, *hist_cols])
+            X_df = ufp.drop_index_if_pandas(X_df)
     return df, X_df
 
 
@@ -544,23 +1436,155 @@ def _preprocess(
         time_col=time_col,
         target_col=target_col,
     )
-    processed = ufp.process_df(
+    processed = _process_df(
         df=df, id_col=id_col, time_col=time_col, target_col=target_col
     )
-    if X_df is not None and X_df.shape[1] > 2:
-        X_df = ensure_time_dtype(X_df, time_col=time_col)
-        processed_X = ufp.process_df(
-            df=X_df,
+    X_future, futr_cols = _process_future_exog(X_df, id_col=id_col, time_col=time_col)
+    x_cols = [c for c in df.columns if c not in (id_col, time_col, target_col)]
+    return processed, X_future, x_cols, futr_cols
+
+
+def _column_to_float32(s: Series) -> np.ndarray:
+    # the categories are represented by their codes, like in `ufp.process_df`
+    if isinstance(s, pd.Series):
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.cat.codes
+        return s.to_numpy(dtype=np.float32, na_value=np.nan)
+    import polars as pl
+
+    if s.dtype == pl.Categorical:
+        s = s.to_physical()
+    return s.to_numpy().astype(np.float32, copy=False)
+
+
+def _process_df(
+    df: DFType, id_col: str, time_col: str, target_col: Optional[str]
+) -> ufp.ProcessedDF:
+    # same as `ufp.process_df`, but the values are gathered column by column
+    # into a float32 matrix in column-major order instead of stacking them
+    # in a float64 one and sorting its rows. The target and every exogenous
+    # feature are then contiguous float32 buffers, which is what the payloads
+    # are encoded with, so they're sent without further copies.
+    validate_format(df, id_col, time_col, target_col)
+    id_counts = ufp.counts_by_id(df, id_col)
+    uids = id_counts[id_col]
+    sizes = id_counts["counts"].to_numpy()
+    indptr = np.append(0, sizes.cumsum()).astype(np.int32)
+    last_idxs = indptr[1:] - 1
+    sort_idxs = ufp.maybe_compute_sort_indices(df, id_col, time_col)
+    if sort_idxs is not None:
+        last_idxs = sort_idxs[last_idxs]
+    value_cols = [c for c in df.columns if c not in (id_col, time_col, target_col)]
+    if target_col is not None:
+        value_cols = [target_col, *value_cols]
+    data = np.empty((df.shape[0], len(value_cols)), dtype=np.float32, order="F")
+    for j, col in enumerate(value_cols):
+        values = _column_to_float32(df[col])
+        if sort_idxs is None:
+            data[:, j] = values
+        else:
+            np.take(values, sort_idxs, out=data[:, j])
+    times = df[time_col].to_numpy()[last_idxs]
+    return ufp.ProcessedDF(uids, times, data, indptr, sort_idxs)
+
+
+def _process_future_exog(
+    X_df: Optional[DFType], id_col: str, time_col: str
+) -> tuple[Optional[np.ndarray], Optional[list[str]]]:
+    if X_df is None or X_df.shape[1] <= 2:
+        return None, None
+    X_df = ensure_time_dtype(X_df, time_col=time_col)
+    processed_X = _process_df(
+        df=X_df,
+        id_col=id_col,
+        time_col=time_col,
+        target_col=None,
+    )
+    futr_cols = [c for c in X_df.columns if c not in (id_col, time_col)]
+    return processed_X.data.T, futr_cols
+
+
+def _check_prepared(
+    prepared: "PreparedSeries",
+    freq: Optional[_Freq],
+    date_features: Union[bool, Sequence[Union[str, Callable]]],
+    date_features_to_one_hot: Union[bool, list[str]],
+) -> None:
+    if freq is not None and freq != prepared.freq:
+        raise ValueError(
+            f"The series were prepared with freq={prepared.freq!r}, got {freq!r}."
+        )
+    if date_features or date_features_to_one_hot:
+        raise ValueError(
+            "The date features of prepared series are set in `prepare`, "
+            "`date_features` and `date_features_to_one_hot` can't be used."
+        )
+
+
+def _prepared_forecast_inputs(
+    prepared: "PreparedSeries",
+    X_df: Optional[DFType],
+    h: int,
+    hist_exog_list: Optional[list[str]],
+) -> tuple[ufp.ProcessedDF, Optional[np.ndarray], list[str], Optional[list[str]]]:
+    # selects the features and builds the future values that `_validate_exog`
+    # and `_preprocess` produce from the dataframes, reusing the prepared data
+    id_col, time_col, target_col = (
+        prepared.id_col,
+        prepared.time_col,
+        prepared.target_col,
+    )
+    if X_df is not None and prepared.drop_id:
+        X_df = ufp.copy_if_pandas(X_df, deep=False)
+        X_df = ufp.assign_columns(X_df, id_col, 0)
+    # the features are selected by their names, so an empty frame is enough
+    template = ufp.take_rows(prepared.df, slice(0, 0))
+    template = template[[id_col, time_col, target_col, *prepared.exog_cols]]
+    template, X_df = _validate_exog(
+        df=template,
+        X_df=X_df,
+        id_col=id_col,
+        time_col=time_col,
+        target_col=target_col,
+        hist_exog=hist_exog_list,
+    )
+    x_cols = [*template.columns[3:], *prepared.date_feature_cols]
+    processed = prepared.processed
+    if x_cols != prepared.x_cols:
+        all_cols = [target_col, *prepared.x_cols]
+        idxs = [all_cols.index(c) for c in [target_col, *x_cols]]
+        processed = processed._replace(data=processed.data[:, idxs])
+    if prepared.date_feature_cols:
+        if X_df is None:
+            X_df = ufp.make_future_dataframe(
+                uids=processed.uids,
+                last_times=type(processed.uids)(processed.last_times),
+                freq=prepared.freq,
+                h=h,
+                id_col=id_col,
+                time_col=time_col,
+            )
+        futr_exog = [c for c in X_df.columns if c not in (id_col, time_col)]
+        # the future values go through the same steps as the history did, so
+        # that the one-hot encoded columns have the same names
+        X_df, _ = _maybe_add_date_features(
+            df=ufp.assign_columns(X_df, target_col, 0),
+            X_df=None,
+            features=prepared.date_features,
+            one_hot=prepared.date_features_to_one_hot,
+            freq=prepared.freq,
+            h=0,
             id_col=id_col,
             time_col=time_col,
-            target_col=None,
+            target_col=target_col,
         )
-        X_future = processed_X.data.T
-        futr_cols = [c for c in X_df.columns if c not in (id_col, time_col)]
-    else:
-        X_future = None
-        futr_cols = None
-    x_cols = [c for c in df.columns if c not in (id_col, time_col, target_col)]
+        # the one-hot encoded values that only appear in the future aren't
+        # features of the history, so they're ignored
+        for col in prepared.date_feature_cols:
+            if col not in X_df.columns:
+                X_df = ufp.assign_columns(X_df, col, 0)
+        X_df = X_df[[id_col, time_col, *futr_exog, *prepared.date_feature_cols]]
+    X_future, futr_cols = _process_future_exog(X_df, id_col=id_col, time_col=time_col)
     return processed, X_future, x_cols, futr_cols
 
 
@@ -570,10 +1594,124 @@ def _forecast_payload_to_in_sample(payload):
         for k, v in payload.items()
         if k not in ("h", "finetune_steps", "finetune_loss", "finetune_depth")
     }
-    del in_sample_payload["series"]["X_future"]
+    in_sample_payload["series"] = {
+        k: v for k, v in payload["series"].items() if k != "X_future"
+    }
     return in_sample_payload
 
 
+def _in_sample_tails(resp: dict[str, Any], n: int) -> dict[str, Any]:
+    # keeps the last n fitted values of every series
+    sizes = np.asarray(resp["sizes"], dtype=np.int64)
+    if sizes.max(initial=0) <= n:
+        return resp
+    out_sizes = np.minimum(sizes, n)
+    idxs = _tail_indices(np.append(0, sizes.cumsum()), out_sizes)
+    out = {**resp, "sizes": out_sizes, "mean": np.asarray(resp["mean"])[idxs]}
+    if resp.get("intervals") is not None:
+        out["intervals"] = {
+            k: None if v is None else np.asarray(v)[idxs]
+            for k, v in resp["intervals"].items()
+        }
+    if resp.get("feature_contributions") is not None:
+        out["feature_contributions"] = [
+            np.asarray(c)[idxs] for c in resp["feature_contributions"]
+        ]
+    return out
+
+
+_seasonality_by_freq = {
+    "min": 60,
+    "T": 60,
+    "h": 24,
+    "H": 24,
+    "B": 5,
+    "C": 5,
+    "D": 7,
+    "W": 52,
+    "M": 12,
+    "MS": 12,
+    "ME": 12,
+    "SM": 24,
+    "SMS": 24,
+    "Q": 4,
+    "QS": 4,
+    "QE": 4,
+}
+
+
+def _infer_season_length(freq: _Freq) -> int:
+    if not isinstance(freq, str):
+        return 1
+    # remove the multiplier and the anchor, e.g. 2W-SUN -> W
+    base = freq.split("-")[0].lstrip("0123456789")
+    return _seasonality_by_freq.get(base, 1)
+
+
+def _baseline_intervals(
+    mean: np.ndarray, std: np.ndarray, level: Optional[list[Union[int, float]]]
+) -> Optional[dict[str, np.ndarray]]:
+    if level is None:
+        return None
+    intervals = {}
+    for lv in level:
+        z = statistics.NormalDist().inv_cdf(0.5 + lv / 200)
+        intervals[f"lo-{lv}"] = mean - z * std
+        intervals[f"hi-{lv}"] = mean + z * std
+    return intervals
+
+
+def _baseline_responses(
+    processed: ufp.ProcessedDF,
+    h: int,
+    level: Optional[list[Union[int, float]]],
+    method: _FallbackMethod,
+    season_length: int,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    # forecasts and fitted values of all the series at once, with the same
+    # fields as the responses of the forecast and historic_forecast endpoints
+    y = processed.data[:, 0].astype(np.float64)
+    indptr = processed.indptr
+    sizes = np.diff(indptr)
+    n_series = sizes.size
+    series_idxs = np.repeat(np.arange(n_series), sizes)
+    steps = np.arange(h)
+    if method == "seasonal_naive":
+        # the series shorter than a season use their whole history
+        season = np.minimum(season_length, sizes)
+        mean = y[indptr[1:, None] - season[:, None] + steps % season[:, None]]
+        positions = np.arange(y.size) - indptr[series_idxs]
+        fitted_idxs = np.flatnonzero(positions >= season[series_idxs])
+        fitted = y[fitted_idxs - season[series_idxs[fitted_idxs]]]
+        # the errors grow with the number of seasons ahead
+        scale = np.sqrt(steps // season[:, None] + 1)
+    else:
+        average = np.bincount(series_idxs, weights=y, minlength=n_series) / sizes
+        mean = np.repeat(average[:, None], h, axis=1)
+        fitted_idxs = np.arange(y.size)
+        fitted = average[series_idxs]
+        scale = np.repeat(np.sqrt(1 + 1 / sizes)[:, None], h, axis=1)
+    fitted_series = series_idxs[fitted_idxs]
+    residuals = y[fitted_idxs] - fitted
+    n_fitted = np.bincount(fitted_series, minlength=n_series)
+    sse = np.bincount(fitted_series, weights=residuals**2, minlength=n_series)
+    sigma = np.sqrt(sse / np.maximum(n_fitted, 1))
+    mean = mean.ravel()
+    forecast = {
+        "mean": mean,
+        "intervals": _baseline_intervals(mean, (sigma[:, None] * scale).ravel(), level),
+        "weights_x": None,
+        "feature_contributions": None,
+    }
+    in_sample = {
+        "mean": fitted,
+        "sizes": n_fitted,
+        "intervals": _baseline_intervals(fitted, sigma[fitted_series], level),
+        "feature_contributions": None,
+    }
+    return forecast, in_sample
+
+
 def _maybe_add_intervals(
     df: DFType,
     intervals: Optional[dict[str, list[float]]],
@@ -608,9 +1746,11 @@ def _parse_in_sample_output(
     if processed.sort_idxs is not None:
         times = times[processed.sort_idxs]
         targets = targets[processed.sort_idxs]
-    times = _array_tails(times, processed.indptr, in_sample_output["sizes"])
-    targets = _array_tails(targets, processed.indptr, in_sample_output["sizes"])
-    uids = ufp.repeat(processed.uids, in_sample_output["sizes"])
+    # the sizes are a list in JSON responses, which polars can't repeat by
+    sizes = np.asarray(in_sample_output["sizes"], dtype=np.int64)
+    times = _array_tails(times, processed.indptr, sizes)
+    targets = _array_tails(targets, processed.indptr, sizes)
+    uids = ufp.repeat(processed.uids, sizes)
     out = type(df)(
         {
             id_col: uids,
@@ -713,6 +1853,13 @@ def _audit_duplicate_rows(
         if duplicates.any():
             return AuditDataSeverity.FAIL, df[duplicates]
         return AuditDataSeverity.PASS, pd.DataFrame()
+    elif isinstance(df, pl_DataFrame):
+        import polars as pl
+
+        duplicates_df = df.filter(pl.struct(id_col, time_col).is_duplicated())
+        if duplicates_df.height:
+            return AuditDataSeverity.FAIL, duplicates_df
+        return AuditDataSeverity.PASS, pl.DataFrame()
     else:
         raise ValueError(f"Dataframe type {type(df)} is not supported yet.")
 
@@ -741,6 +1888,19 @@ def _audit_missing_dates(
         if len(df_missing) > 0:
             return AuditDataSeverity.FAIL, df_missing
         return AuditDataSeverity.PASS, pd.DataFrame()
+    elif isinstance(df, pl_DataFrame):
+        import polars as pl
+
+        df = ensure_time_dtype(df, time_col=time_col)
+        df_complete = fill_gaps(
+            df, freq=freq, id_col=id_col, time_col=time_col, start=start, end=end
+        )
+        df_missing = df_complete.join(df, on=[id_col, time_col], how="anti").select(
+            id_col, time_col
+        )
+        if df_missing.height:
+            return AuditDataSeverity.FAIL, df_missing
+        return AuditDataSeverity.PASS, pl.DataFrame()
     else:
         raise ValueError(f"Dataframe type {type(df)} is not supported yet.")
 
@@ -761,6 +1921,18 @@ def _audit_categorical_variables(
         if categorical_cols:
             return AuditDataSeverity.FAIL, df[categorical_cols]
         return AuditDataSeverity.PASS, pd.DataFrame()
+    elif isinstance(df, pl_DataFrame):
+        import polars as pl
+
+        categorical_cols = [
+            col
+            for col, dtype in df.schema.items()
+            if col not in (id_col, time_col)
+            and isinstance(dtype, (pl.Categorical, pl.Enum, pl.String))
+        ]
+        if categorical_cols:
+            return AuditDataSeverity.FAIL, df.select(categorical_cols)
+        return AuditDataSeverity.PASS, pl.DataFrame()
     else:
         raise ValueError(f"Dataframe type {type(df)} is not supported yet.")
 
@@ -786,6 +1958,26 @@ def _audit_leading_zeros(
         if len(leading_zeros_df) > 0:
             return AuditDataSeverity.CASE_SPECIFIC, leading_zeros_df
         return AuditDataSeverity.PASS, pd.DataFrame()
+    elif isinstance(df, pl_DataFrame):
+        import polars as pl
+
+        # polars frames have no index, so the positions are row numbers of
+        # the sorted frame
+        idx = pl.col("_row_idx")
+        leading_zeros_df = (
+            df.with_row_index("_row_idx")
+            .group_by(id_col, maintain_order=True)
+            .agg(
+                first_index=idx.first(),
+                first_nonzero_index=idx.filter(pl.col(target_col).ne_missing(0))
+                .first()
+                .fill_null(idx.first()),
+            )
+            .filter(pl.col("first_index") != pl.col("first_nonzero_index"))
+        )
+        if leading_zeros_df.height:
+            return AuditDataSeverity.CASE_SPECIFIC, leading_zeros_df
+        return AuditDataSeverity.PASS, pl.DataFrame()
     else:
         raise ValueError(f"Dataframe type {type(df)} is not supported yet.")
 
@@ -799,10 +1991,52 @@ def _audit_negative_values(
         if len(negative_values) > 0:
             return AuditDataSeverity.CASE_SPECIFIC, negative_values
         return AuditDataSeverity.PASS, pd.DataFrame()
+    elif isinstance(df, pl_DataFrame):
+        import polars as pl
+
+        negative_values = df.filter(pl.col(target_col) < 0)
+        if negative_values.height:
+            return AuditDataSeverity.CASE_SPECIFIC, negative_values
+        return AuditDataSeverity.PASS, pl.DataFrame()
     else:
         raise ValueError(f"Dataframe type {type(df)} is not supported yet.")
 
 
+def _polars_agg_duplicates(
+    df: pl_DataFrame,
+    id_col: str,
+    time_col: str,
+    agg_dict: dict[str, Union[str, Callable]],
+) -> pl_DataFrame:
+    import polars as pl
+
+    aggs = []
+    for col, agg in agg_dict.items():
+        if not isinstance(agg, str):
+            raise ValueError(
+                "Only the names of the aggregations (e.g. 'sum') are supported "
+                "for polars DataFrames."
+            )
+        aggs.append(getattr(pl.col(col), agg)())
+    return df.group_by([id_col, time_col], maintain_order=True).agg(aggs)
+
+
+def _polars_drop_leading_zeros(
+    df: pl_DataFrame,
+    ids: pl_Series,
+    id_col: str,
+    time_col: str,
+    target_col: str,
+) -> pl_DataFrame:
+    # keeps the rows of the flagged series from their first non-zero value
+    import polars as pl
+
+    seen_nonzero = pl.col(target_col).ne_missing(0).cum_max().over(id_col)
+    return ensure_sorted(df, id_col=id_col, time_col=time_col).filter(
+        ~pl.col(id_col).is_in(ids.to_list()) | seen_nonzero
+    )
+
+
 class ApiError(Exception):
     """
     Exception raised for API errors.
@@ -814,9 +2048,14 @@ class ApiError(Exception):
 
     status_code: Optional[int]
     body: Any
+    retry_after: Optional[float]
 
     def __init__(
-        self, *, status_code: Optional[int] = None, body: Optional[Any] = None
+        self,
+        *,
+        status_code: Optional[int] = None,
+        body: Optional[Any] = None,
+        retry_after: Optional[float] = None,
     ):
         """
         Initializes the ApiError exception.
@@ -824,9 +2063,12 @@ class ApiError(Exception):
         Args:
             status_code (int, optional): The HTTP status code of the error.
             body (Any, optional): The body of the error response.
+            retry_after (float, optional): Seconds to wait before retrying
+                the request, from the `Retry-After` header of the response.
         """
         self.status_code = status_code
         self.body = body
+        self.retry_after = retry_after
 
     def __str__(self) -> str:
         """
@@ -837,32 +2079,1293 @@ class ApiError(Exception):
         """
         return f"status_code: {self.status_code}, body: {self.body}"
 
+    @classmethod
+    def _from_response(cls, resp: httpx.Response, body: Any) -> "ApiError":
+        return cls(
+            status_code=resp.status_code,
+            body=body,
+            retry_after=_parse_retry_after(resp.headers.get("retry-after")),
+        )
+
 
-class NixtlaClient:
+class CircuitOpenError(ApiError):
+    """
+    Exception raised when a request isn't sent because the circuit breaker
+    is open, i.e. the API failed too many times in a row.
+
+    Attributes:
+        retry_after (float): Seconds until the breaker lets a request through.
+    """
+
+    def __str__(self) -> str:
+        return f"Circuit breaker is open, retry after {self.retry_after:.1f}s"
+
+
+class RetryPolicy:
     def __init__(
         self,
-        api_key: Optional[str] = None,
-        base_url: Optional[str] = None,
-        timeout: Optional[int] = 60,
         max_retries: int = 6,
-        retry_interval: int = 10,
-        max_wait_time: int = 6 * 60,
+        initial_interval: float = 1.0,
+        multiplier: float = 2.0,
+        max_interval: float = 60.0,
+        jitter: bool = True,
+        max_wait_time: float = 6 * 60,
+        respect_retry_after: bool = True,
+        budget_ratio: Optional[float] = 0.2,
+        budget_reserve: int = 10,
     ):
         """
-        Client to interact with the Nixtla API.
+        Policy used to retry the requests that fail with transient errors.
+
+        The wait before the n-th retry is
+        `min(max_interval, initial_interval * multiplier ** (n - 1))`, and
+        with `jitter` a random time between 0 and that value is used instead
+        (full jitter), so that requests that failed together don't retry in
+        lockstep.
 
         Args:
-            api_key (str, optional): The authorization API key to interact
-                with the Nixtla API. If not provided, will use the
-                NIXTLA_API_KEY environment variable.
-            base_url (str, optional): Custom base URL.
-                If not provided, will use the NIXTLA_BASE_URL environment
-                variable.
-            timeout (int, optional): Request timeout in seconds.
-                Set to `None` to disable it. Defaults to 60.
-            max_retries (int, optional): The maximum number of attempts to
-                make when calling the API before giving up. It defines how
-                many times the client will retry the API call if it fails.
+            max_retries (int): The maximum number of attempts to make when
+                calling the API before giving up. Defaults to 6.
+            initial_interval (float): Wait in seconds before the first retry.
+                Defaults to 1.
+            multiplier (float): Factor applied to the wait after every retry.
+                Defaults to 2.
+            max_interval (float): Maximum wait in seconds between two
+                attempts. Defaults to 60.
+            jitter (bool): Wait a random time between 0 and the computed
+                interval. Defaults to True.
+            max_wait_time (float): The maximum total time in seconds spent
+                on all the attempts of a request. Defaults to 360.
+            respect_retry_after (bool): Wait at least the time requested by
+                the API in the `Retry-After` header of the response.
+                Defaults to True.
+            budget_ratio (float, optional): Maximum ratio of retries to
+                requests made by the client, shared by all its calls so that
+                retries can't take over the throughput when the API is
+                struggling. Set to `None` to disable the budget.
+                Defaults to 0.2.
+            budget_reserve (int): Number of retries allowed on top of the
+                ones given by `budget_ratio`, which also covers the first
+                requests of the client. Defaults to 10.
+        """
+        self.max_retries = max_retries
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.max_wait_time = max_wait_time
+        self.respect_retry_after = respect_retry_after
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+
+    def _delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = min(
+            self.max_interval, self.initial_interval * self.multiplier ** (attempt - 1)
+        )
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 95,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        max_hedge_ratio: float = 0.05,
+        window_size: int = 200,
+    ):
+        """
+        Policy used to hedge the requests that take longer than usual.
+
+        If a request hasn't completed after the hedging delay, a duplicate is
+        sent and the first successful response is used, which cuts the tail
+        latency caused by occasionally slow responses. Only the requests that
+        aren't split in partitions and that don't modify any state (e.g.
+        forecasts, but not fine-tuning) are hedged.
+
+        Every hedge sent counts toward the usage and the rate limits. Once
+        one of the attempts has returned, the other one is cancelled if it
+        hasn't been sent yet, but the synchronous client can't interrupt a
+        request that's already in flight, so it still completes and its
+        response is discarded.
+
+        Args:
+            delay (float, optional): Time in seconds to wait before hedging a
+                request. If None, it's the `percentile` of the latencies of
+                the last `window_size` requests. Defaults to None.
+            percentile (float): Percentile of the observed latencies used as
+                the delay. Defaults to 95.
+            min_delay (float): Minimum delay in seconds when it's computed
+                from the latencies. Defaults to 0.05.
+            min_samples (int): Number of latencies required before hedging
+                when the delay is computed from them. Defaults to 20.
+            max_hedge_ratio (float): Maximum ratio of hedges to requests, which
+                bounds the extra usage of the quota. Defaults to 0.05.
+            window_size (int): Number of recent latencies used to compute the
+                delay. Defaults to 200.
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.window_size = window_size
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: _PositiveInt = 5,
+        recovery_time: float = 30.0,
+        fallback: Optional[_FallbackMethod] = None,
+        season_length: Optional[_PositiveInt] = None,
+    ):
+        """
+        Circuit breaker that fails fast while the API is unavailable.
+
+        After `failure_threshold` consecutive requests fail with server
+        errors (5xx status codes, timeouts or connection errors) the breaker
+        opens and the requests raise `CircuitOpenError` without being sent
+        or retried. After `recovery_time` seconds a single request is let
+        through, which closes the breaker if it succeeds or opens it again
+        if it fails.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures that open
+                the breaker. Defaults to 5.
+            recovery_time (float): Time in seconds that the breaker stays
+                open before trying a request again. Defaults to 30.
+            fallback (str, optional): Local model used by `forecast` while the
+                breaker is open, either 'seasonal_naive' or 'historic_average'.
+                The forecasts have the same format as the ones from the API,
+                with prediction intervals from a normal distribution fitted on
+                the in-sample errors, and the client's `used_fallback`
+                attribute is set to True for the thread or asyncio task that
+                made the call. If None, `CircuitOpenError` is raised.
+                Defaults to None.
+            season_length (int, optional): Season length of the seasonal naive
+                model. If None, it's inferred from the frequency (e.g. 7 for
+                daily data) or 1 if it's unknown. Defaults to None.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.fallback = fallback
+        self.season_length = season_length
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._remaining() == 0:
+                return "half_open"
+            return "open"
+
+    def _remaining(self) -> float:
+        assert self._opened_at is not None
+        return max(self._opened_at + self.recovery_time - time.monotonic(), 0.0)
+
+    def _before_request(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._remaining()
+            if self._probing or remaining > 0:
+                raise CircuitOpenError(
+                    body="The API is unavailable, the request wasn't sent.",
+                    retry_after=remaining,
+                )
+            self._probing = True
+
+    def _after_request(self, ok: Optional[bool]) -> None:
+        # ok is None when the request was interrupted (e.g. cancelled)
+        with self._lock:
+            self._probing = False
+            if ok is None:
+                return
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"{self._failures} consecutive requests failed, "
+                        f"not sending requests for {self.recovery_time}s."
+                    )
+                self._opened_at = time.monotonic()
+
+
+class _ResponseCache:
+    # stores the responses encoded with the binary array format and keeps
+    # the counters, the subclasses implement the storage
+    def __init__(self, max_size_mb: float, ttl: Optional[float]):
+        self.max_size_mb = max_size_mb
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def _max_size(self) -> int:
+        return int(self.max_size_mb * 2**20)
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # decode into a copy, so that the cached response can't be modified
+        return _unpack_arrays(bytearray(value))
+
+    def set(self, key: str, resp: dict[str, Any]) -> None:
+        value = _pack_arrays(resp)
+        if len(value) > self._max_size:
+            return
+        with self._lock:
+            self._set(key, value)
+
+    def stats(self) -> dict[str, Any]:
+        """Usage of the cache.
+
+        Returns:
+            dict: Number of hits, misses and evicted entries, as well as the
+                number of entries stored and their size in MB.
+        """
+        with self._lock:
+            entries, size = self._usage()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": size / 2**20,
+        }
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._clear()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def _usage(self) -> tuple[int, int]:
+        raise NotImplementedError
+
+    def _clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(_ResponseCache):
+    def __init__(self, max_size_mb: float = 256, ttl: Optional[float] = None):
+        """
+        In-memory cache of the API responses, with least recently used eviction.
+
+        Args:
+            max_size_mb (float): Maximum size in MB of the stored responses.
+                The least recently used ones are removed when it's exceeded.
+                Defaults to 256.
+            ttl (float, optional): Time in seconds after which a response is
+                considered stale and requested again. If None, the responses
+                don't expire. Defaults to None.
+        """
+        super().__init__(max_size_mb=max_size_mb, ttl=ttl)
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    def _pop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if self._is_expired(created):
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (time.time(), value)
+        self._size += len(value)
+        while self._size > self._max_size:
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _usage(self) -> tuple[int, int]:
+        return len(self._entries), self._size
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+class SqliteCache(_ResponseCache):
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size_mb: float = 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        On-disk cache of the API responses, stored in a SQLite database.
+
+        The database can be shared by several clients and processes, which
+        makes the responses available across sessions.
+
+        Args:
+            path (str or Path): Path to the database file. It's created if it
+                doesn't exist.
+            max_size_mb (float): Maximum size in MB of the stored responses.
+                The least recently used ones are removed when it's exceeded.
+                Defaults to 1024.
+            ttl (float, optional): Time in seconds after which a response is
+                considered stale and requested again. If None, the responses
+                don't expire. Defaults to None.
+        """
+        super().__init__(max_size_mb=max_size_mb, ttl=ttl)
+        self.path = str(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["_conn"] = None
+        return state
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # the access is serialized by the lock
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self._is_expired(created):
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        conn.execute(
+            "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+        )
+        conn.commit()
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        conn = self._connection()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now, now),
+        )
+        _, size = self._usage()
+        if size > self._max_size:
+            rows = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed"
+            ).fetchall()
+            for old_key, old_size in rows:
+                if size <= self._max_size:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                size -= old_size
+                self.evictions += 1
+        conn.commit()
+
+    def _usage(self) -> tuple[int, int]:
+        entries, size = (
+            self._connection()
+            .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses")
+            .fetchone()
+        )
+        return entries, size
+
+    def _clear(self) -> None:
+        conn = self._connection()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
+
+
+class _RateLimiter:
+    # token bucket that refills at the per-minute quota, the subclasses store
+    # its state (available tokens and time of the last update) so that it can
+    # be shared by several clients or processes
+    def __init__(
+        self,
+        requests_per_minute: Optional[float],
+        burst: Optional[int],
+        time_fn: Callable[[], float],
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.time_fn = time_fn
+        self._seeded = requests_per_minute is not None
+
+    @property
+    def _capacity(self) -> float:
+        if self.burst is not None:
+            return float(self.burst)
+        assert self.requests_per_minute is not None
+        return max(self.requests_per_minute / 10, 1.0)
+
+    def _seed(self, usage: dict[str, Any]) -> None:
+        # uses the limit of the account and the requests already made in
+        # the current minute
+        minute = usage.get("minute") or {}
+        limit = minute.get("limit")
+        if isinstance(limit, (int, float)) and limit > 0:
+            self.requests_per_minute = limit
+            available = max(limit - minute.get("used", 0), 0)
+
+            def start(state: Optional[dict[str, float]]) -> tuple[dict, None]:
+                tokens = min(available, self._capacity)
+                if state is not None:
+                    # other clients are already using the bucket
+                    tokens = min(tokens, state["tokens"])
+                return {"tokens": tokens, "time": self.time_fn()}, None
+
+            self._update(start)
+        self._seeded = True
+
+    def _refill(self, state: Optional[dict[str, float]]) -> tuple[float, float]:
+        now = self.time_fn()
+        if state is None:
+            return self._capacity, now
+        assert self.requests_per_minute is not None
+        elapsed = max(now - state["time"], 0.0)
+        tokens = state["tokens"] + elapsed * self.requests_per_minute / 60
+        return min(tokens, self._capacity), now
+
+    def acquire(self) -> float:
+        """Reserve a request.
+
+        Returns:
+            float: Time in seconds to wait before sending the request.
+        """
+        if self.requests_per_minute is None:
+            return 0.0
+        rate = self.requests_per_minute / 60
+
+        def take(state: Optional[dict[str, float]]) -> tuple[dict, float]:
+            tokens, now = self._refill(state)
+            # the tokens can go below zero, which reserves the next ones
+            tokens -= 1
+            return {"tokens": tokens, "time": now}, max(-tokens / rate, 0.0)
+
+        return self._update(take)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the API rejected a request."""
+        if self.requests_per_minute is None:
+            return
+
+        def empty(state: Optional[dict[str, float]]) -> tuple[dict, None]:
+            tokens, now = self._refill(state)
+            return {"tokens": min(tokens, 0.0), "time": now}, None
+
+        self._update(empty)
+
+    def _update(
+        self, fn: Callable[[Optional[dict[str, float]]], tuple[dict, _T]]
+    ) -> _T:
+        # atomically applies fn to the stored state and saves the new one
+        raise NotImplementedError
+
+
+class MemoryRateLimiter(_RateLimiter):
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        time_fn: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Rate limiter shared by the clients and threads of a process.
+
+        Args:
+            requests_per_minute (float, optional): Maximum number of requests
+                sent per minute. If None, the limit of the account is
+                requested with `usage()` before the first request.
+                Defaults to None.
+            burst (int, optional): Number of requests that can be sent at once
+                before they're paced. If None, a tenth of
+                `requests_per_minute` is used. Defaults to None.
+            time_fn (callable): Clock that returns the current time in
+                seconds. Defaults to `time.monotonic`.
+        """
+        super().__init__(
+            requests_per_minute=requests_per_minute, burst=burst, time_fn=time_fn
+        )
+        self._state: Optional[dict[str, float]] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _update(
+        self, fn: Callable[[Optional[dict[str, float]]], tuple[dict, _T]]
+    ) -> _T:
+        with self._lock:
+            self._state, result = fn(self._state)
+        return result
+
+
+def _lock_file(f: Any, lock: bool) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if lock else msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+
+class FileRateLimiter(_RateLimiter):
+    def __init__(
+        self,
+        path: Union[str, Path],
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        time_fn: Callable[[], float] = time.time,
+    ):
+        """
+        Rate limiter stored in a locked file, shared by the processes of a
+        machine (or of a network file system that supports locks).
+
+        Args:
+            path (str or Path): Path to the file that holds the state of the
+                limiter. It's created if it doesn't exist.
+            requests_per_minute (float, optional): Maximum number of requests
+                sent per minute by all the processes. If None, the limit of
+                the account is requested with `usage()` before the first
+                request. Defaults to None.
+            burst (int, optional): Number of requests that can be sent at once
+                before they're paced. If None, a tenth of
+                `requests_per_minute` is used. Defaults to None.
+            time_fn (callable): Clock that returns the current time in
+                seconds, which must be the same in all the processes.
+                Defaults to `time.time`.
+        """
+        super().__init__(
+            requests_per_minute=requests_per_minute, burst=burst, time_fn=time_fn
+        )
+        self.path = Path(path)
+
+    def _update(
+        self, fn: Callable[[Optional[dict[str, float]]], tuple[dict, _T]]
+    ) -> _T:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            _lock_file(f, lock=True)
+            try:
+                f.seek(0)
+                try:
+                    state = orjson.loads(f.read())
+                except orjson.JSONDecodeError:
+                    state = None
+                new_state, result = fn(state)
+                f.seek(0)
+                f.truncate()
+                f.write(orjson.dumps(new_state))
+                f.flush()
+            finally:
+                _lock_file(f, lock=False)
+        return result
+
+
+class RedisRateLimiter(_RateLimiter):
+    def __init__(
+        self,
+        client: Any,
+        key: str = "nixtla:rate_limiter",
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        lock_timeout: float = 5.0,
+        time_fn: Callable[[], float] = time.time,
+    ):
+        """
+        Rate limiter stored in Redis, shared by the processes of several
+        machines.
+
+        Args:
+            client: A `redis.Redis` client, or any object with the same `get`,
+                `set` and `delete` methods (e.g. from `fakeredis` or `valkey`).
+            key (str): Key that holds the state of the limiter. A lock is
+                stored in the same key with a `:lock` suffix.
+                Defaults to 'nixtla:rate_limiter'.
+            requests_per_minute (float, optional): Maximum number of requests
+                sent per minute by all the processes. If None, the limit of
+                the account is requested with `usage()` before the first
+                request. Defaults to None.
+            burst (int, optional): Number of requests that can be sent at once
+                before they're paced. If None, a tenth of
+                `requests_per_minute` is used. Defaults to None.
+            lock_timeout (float): Time in seconds after which the lock held
+                by a process is released, in case it died while holding it.
+                Defaults to 5.
+            time_fn (callable): Clock that returns the current time in
+                seconds, which must be the same in all the machines.
+                Defaults to `time.time`.
+        """
+        super().__init__(
+            requests_per_minute=requests_per_minute, burst=burst, time_fn=time_fn
+        )
+        self.client = client
+        self.key = key
+        self.lock_timeout = lock_timeout
+
+    def _update(
+        self, fn: Callable[[Optional[dict[str, float]]], tuple[dict, _T]]
+    ) -> _T:
+        lock_key = f"{self.key}:lock"
+        token = os.urandom(16).hex()
+        lock_ms = int(self.lock_timeout * 1000)
+        while not self.client.set(lock_key, token, nx=True, px=lock_ms):
+            time.sleep(0.001)
+        try:
+            raw = self.client.get(self.key)
+            state = None if raw is None else orjson.loads(raw)
+            new_state, result = fn(state)
+            self.client.set(self.key, orjson.dumps(new_state))
+        finally:
+            owner = self.client.get(lock_key)
+            if isinstance(owner, bytes):
+                owner = owner.decode()
+            if owner == token:
+                self.client.delete(lock_key)
+        return result
+
+
+_BINARY_CONTENT_TYPE = "application/vnd.nixtla.arrays"
+# upper bounds of the encoded size of a float32, e.g. "-0.12345678," in JSON
+_BYTES_PER_VALUE: dict[str, int] = {"json": 16, "binary": 4}
+_BINARY_MAGIC = b"NXTA"
+_BINARY_VERSION = 1
+_BINARY_PREFIX = struct.Struct("<BI")  # version, header size
+_BINARY_ALIGNMENT = 8
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
+def _pack_arrays(obj: dict[str, Any]) -> bytes:
+    return b"".join(_packed_parts(obj))
+
+
+def _packed_parts(obj: dict[str, Any]) -> list[Any]:
+    # the numpy arrays are stored as raw little-endian buffers after a JSON
+    # header that contains the rest of the values and the arrays' metadata:
+    # magic | version | header size | header | padding | buffers
+    # every buffer starts at an offset that's a multiple of 8
+    buffers: list[np.ndarray] = []
+    specs: list[dict[str, Any]] = []
+    offset = 0
+
+    def replace_arrays(x: Any) -> Any:
+        nonlocal offset
+        if isinstance(x, np.ndarray):
+            x = np.ascontiguousarray(x)
+            if x.dtype.byteorder == ">":
+                x = x.astype(x.dtype.newbyteorder("<"))
+            offset = _align(offset)
+            specs.append(
+                {"dtype": x.dtype.str, "shape": list(x.shape), "offset": offset}
+            )
+            buffers.append(x)
+            offset += x.nbytes
+            return {"__buffer__": len(buffers) - 1}
+        if isinstance(x, dict):
+            return {k: replace_arrays(v) for k, v in x.items()}
+        if isinstance(x, list):
+            return [replace_arrays(v) for v in x]
+        return x
+
+    data = replace_arrays(obj)
+    header = orjson.dumps({"data": data, "buffers": specs})
+    prefix_size = len(_BINARY_MAGIC) + _BINARY_PREFIX.size + len(header)
+    parts: list[Any] = [
+        _BINARY_MAGIC,
+        _BINARY_PREFIX.pack(_BINARY_VERSION, len(header)),
+        header,
+        bytes(_align(prefix_size) - prefix_size),
+    ]
+    position = 0
+    for arr, spec in zip(buffers, specs):
+        parts.append(bytes(spec["offset"] - position))
+        parts.append(arr.reshape(-1).view(np.uint8))
+        position = spec["offset"] + arr.nbytes
+    return parts
+
+
+def _unpack_arrays(content: Union[bytes, bytearray]) -> dict[str, Any]:
+    if content[: len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+        raise ValueError("Invalid binary payload.")
+    version, header_size = _BINARY_PREFIX.unpack_from(content, len(_BINARY_MAGIC))
+    if version != _BINARY_VERSION:
+        raise ValueError(f"Unsupported binary payload version: {version}.")
+    header_start = len(_BINARY_MAGIC) + _BINARY_PREFIX.size
+    header = orjson.loads(content[header_start : header_start + header_size])
+    buffers_start = _align(header_start + header_size)
+    # the arrays are views of the content, which are read-only for bytes
+    arrays = [
+        np.frombuffer(
+            content,
+            dtype=spec["dtype"],
+            count=math.prod(spec["shape"]),
+            offset=buffers_start + spec["offset"],
+        ).reshape(spec["shape"])
+        for spec in header["buffers"]
+    ]
+
+    def restore_arrays(x: Any) -> Any:
+        if isinstance(x, dict):
+            if x.keys() == {"__buffer__"}:
+                return arrays[x["__buffer__"]]
+            return {k: restore_arrays(v) for k, v in x.items()}
+        if isinstance(x, list):
+            return [restore_arrays(v) for v in x]
+        return x
+
+    return restore_arrays(header["data"])
+
+
+def _is_codec_rejection(error: "ApiError") -> bool:
+    # 415 is the standard status for unsupported bodies, while servers that
+    # only accept JSON report the binary payload as an invalid JSON
+    return error.status_code == 415 or (
+        error.status_code == 422 and "json_invalid" in str(error.body)
+    )
+
+
+def _encode_payload(
+    payload: dict[str, Any],
+    multithreaded_compress: bool,
+    codec: _PayloadCodec = "json",
+) -> tuple[bytes, dict[str, str]]:
+    def ensure_contiguous_if_array(x):
+        if not isinstance(x, np.ndarray):
+            return x
+        if np.issubdtype(x.dtype, np.floating):
+            # the float32 buffers of the processed series are used as they are
+            arr = np.ascontiguousarray(x, dtype=np.float32)
+            if np.isinf(arr).any():
+                x = np.nan_to_num(
+                    arr,
+                    nan=np.nan,
+                    posinf=np.finfo(np.float32).max,
+                    neginf=np.finfo(np.float32).min,
+                    copy=np.may_share_memory(arr, x),
+                )
+            else:
+                x = arr
+        else:
+            x = np.ascontiguousarray(x)
+        return x
+
+    def ensure_contiguous_arrays(d: dict[str, Any]) -> dict[str, Any]:
+        # the converted arrays aren't stored in the payload, so that they're
+        # released as soon as the payload is encoded
+        out = {}
+        for k, v in d.items():
+            if isinstance(v, np.ndarray):
+                out[k] = ensure_contiguous_if_array(v)
+            elif isinstance(v, list):
+                out[k] = [ensure_contiguous_if_array(x) for x in v]
+            elif isinstance(v, dict):
+                out[k] = ensure_contiguous_arrays(v)
+            else:
+                out[k] = v
+        return out
+
+    payload = ensure_contiguous_arrays(payload)
+    headers = {}
+    if codec == "binary":
+        content = _pack_arrays(payload)
+        headers["content-type"] = _BINARY_CONTENT_TYPE
+        headers["accept"] = f"{_BINARY_CONTENT_TYPE}, application/json"
+    else:
+        content = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    content_size_mb = len(content) / 2**20
+    if content_size_mb > 200:
+        raise ValueError(
+            f"The payload is too large. Set num_partitions={math.ceil(content_size_mb / 200)}"
+        )
+    if content_size_mb > 1:
+        threads = -1 if multithreaded_compress else 0
+        content = zstd.ZstdCompressor(level=1, threads=threads).compress(content)
+        headers["content-encoding"] = "zstd"
+    return content, headers
+
+
+class _EncodedPayload(NamedTuple):
+    codec: _PayloadCodec
+    content: bytes
+    headers: dict[str, str]
+
+
+# number of partitions that are encoded ahead of the ones in flight
+_ENCODE_AHEAD = 2
+
+
+def _decode_response(resp: httpx.Response) -> dict[str, Any]:
+    content_type = resp.headers.get("content-type", "")
+    if resp.status_code == 200 and content_type.startswith(_BINARY_CONTENT_TYPE):
+        # the arrays are views of a single writable copy of the body, which
+        # avoids creating a python object for every value
+        return _unpack_arrays(bytearray(resp.content))
+    try:
+        resp_body = orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
+        raise ApiError._from_response(resp, f"Could not parse JSON: {resp.content}")
+    if resp.status_code != 200:
+        raise ApiError._from_response(resp, resp_body)
+    if "data" in resp_body:
+        resp_body = resp_body["data"]
+    return resp_body
+
+
+def _payload_fingerprint(payload: dict[str, Any]) -> str:
+    # the binary encoding is deterministic and covers both the arrays'
+    # contents and the rest of the arguments. Its parts are hashed one at a
+    # time, so the arrays aren't copied into the encoded payload.
+    digest = hashlib.sha256()
+    for part in _packed_parts(payload):
+        digest.update(memoryview(part))
+    return digest.hexdigest()
+
+
+class _PartitionCheckpoint:
+    # stores the responses of the partitions of a request as they complete,
+    # so that running the same request again only requests the missing ones
+    def __init__(
+        self,
+        checkpoint_dir: Union[str, Path],
+        endpoint: str,
+        payloads: list[dict[str, Any]],
+    ):
+        digest = hashlib.sha256(endpoint.encode())
+        for payload in payloads:
+            digest.update(_payload_fingerprint(payload).encode())
+        self.path = Path(checkpoint_dir) / digest.hexdigest()
+
+    def _file(self, pos: int) -> Path:
+        return self.path / f"{pos}.json"
+
+    def load(self) -> dict[int, dict[str, Any]]:
+        results = {}
+        if not self.path.exists():
+            return results
+        for file in self.path.glob("*.json"):
+            try:
+                results[int(file.stem)] = orjson.loads(file.read_bytes())
+            except (ValueError, orjson.JSONDecodeError):
+                logger.warning(f"Ignoring invalid checkpoint file: {file}")
+        return results
+
+    def save(self, pos: int, resp: dict[str, Any]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so that an interrupted job doesn't
+        # leave partial responses behind
+        tmp_file = self._file(pos).with_suffix(".tmp")
+        tmp_file.write_bytes(orjson.dumps(resp, option=orjson.OPT_SERIALIZE_NUMPY))
+        os.replace(tmp_file, self._file(pos))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _concat_partitions(
+    values: list[Any],
+    offsets: Optional[np.ndarray] = None,
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    # copies the values of every partition (lists from JSON responses or
+    # arrays from binary ones) straight into a single preallocated array
+    if dtype is None:
+        dtype = next(
+            (np.asarray(v[:1]).dtype for v in values if len(v)), np.dtype(np.float64)
+        )
+    out = np.empty(sum(len(v) for v in values), dtype=dtype)
+    start = 0
+    for i, v in enumerate(values):
+        end = start + len(v)
+        out[start:end] = v
+        if offsets is not None:
+            out[start:end] += offsets[i]
+        start = end
+    return out
+
+
+def _missing_partition_result(
+    template: dict[str, Any], n_series: int, template_n_series: int
+) -> dict[str, Any]:
+    # stand-in for the response of a partition that didn't complete, which
+    # has no values for its series (or NaNs when the number of values per
+    # series is fixed, e.g. in forecasts)
+    if "sizes" in template:
+        n_values = 0
+    else:
+        n_values = len(template["mean"]) // template_n_series * n_series
+    resp: dict[str, Any] = {}
+    for k, v in template.items():
+        if k == "sizes":
+            resp[k] = np.zeros(n_series, dtype=np.int64)
+        elif k == "idxs":
+            resp[k] = np.empty(0, dtype=np.int64)
+        elif k in ("mean", "anomaly", "anomaly_score", "accumulated_anomaly_score"):
+            resp[k] = np.full(n_values, np.nan)
+        elif k == "intervals" and v is not None:
+            resp[k] = {name: np.full(n_values, np.nan) for name in v}
+        elif k == "feature_contributions" and v is not None:
+            resp[k] = np.full((len(v), n_values), np.nan)
+        else:
+            resp[k] = v
+    return resp
+
+
+def _compact_partition_result(resp: Any) -> Any:
+    # stores the values of a partition's (JSON) response in arrays as soon as
+    # it completes, which take a fraction of the memory of python lists
+    if isinstance(resp, dict):
+        return {
+            k: v if k == "weights_x" else _compact_partition_result(v)
+            for k, v in resp.items()
+        }
+    if isinstance(resp, list) and resp and not isinstance(resp[0], str):
+        values = np.asarray(resp)
+        # e.g. missing values, which are kept as they are
+        if values.dtype != object:
+            return values
+    return resp
+
+
+def _merge_partitioned_results(
+    results: list[dict[str, Any]],
+    payloads: list[dict[str, Any]],
+) -> dict[str, Any]:
+    first_res = results[0]
+    resp = {}
+    for k in (
+        "mean",
+        "sizes",
+        "anomaly",
+        "anomaly_score",
+        "accumulated_anomaly_score",
+    ):
+        if k in first_res:
+            resp[k] = _concat_partitions([res[k] for res in results])
+    if "idxs" in first_res:
+        offsets = np.cumsum([0] + [sum(p["series"]["sizes"]) for p in payloads[:-1]])
+        resp["idxs"] = _concat_partitions(
+            [res["idxs"] for res in results], offsets=offsets, dtype=np.int64
+        )
+    if first_res["intervals"] is None:
+        resp["intervals"] = None
+    else:
+        resp["intervals"] = {}
+        for k in first_res["intervals"].keys():
+            resp["intervals"][k] = _concat_partitions(
+                [res["intervals"][k] for res in results]
+            )
+    if "weights_x" not in first_res or first_res["weights_x"] is None:
+        resp["weights_x"] = None
+    else:
+        resp["weights_x"] = [res["weights_x"] for res in results]
+    if (
+        "feature_contributions" not in first_res
+        or first_res["feature_contributions"] is None
+    ):
+        resp["feature_contributions"] = None
+    else:
+        resp["feature_contributions"] = np.vstack(
+            [np.stack(res["feature_contributions"], axis=1) for res in results]
+        ).T
+    return resp
+
+
+def _series_complete_batches(
+    batches: Iterable["pa.RecordBatch"],
+    id_col: str,
+    time_col: str,
+    n_tail: int,
+    batch_size: int,
+) -> Iterator[pd.DataFrame]:
+    # groups the record batches of a dataset sorted by id in DataFrames of at
+    # least `batch_size` complete series, keeping only the last `n_tail` rows
+    # of each one. The rows of the last series of a record batch are carried
+    # over to the next one, since the series can continue there.
+    carry: Optional[pd.DataFrame] = None
+    ready: list[pd.DataFrame] = []
+    n_ready = 0
+    last_id = None
+    for batch in batches:
+        chunk = batch.to_pandas()
+        if chunk.empty:
+            continue
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        chunk = chunk.sort_values([id_col, time_col], kind="stable")
+        chunk = chunk.groupby(id_col, sort=False, observed=True).tail(n_tail)
+        ids = chunk[id_col]
+        if last_id is not None and ids.iloc[0] <= last_id:
+            raise ValueError(
+                f"Found rows of the series {ids.iloc[0]!r} after the ones of "
+                f"{last_id!r}. The dataset must be sorted by `{id_col}`."
+            )
+        is_last = (ids == ids.iloc[-1]).to_numpy()
+        carry = chunk[is_last]
+        complete = chunk[~is_last]
+        if not complete.empty:
+            last_id = complete[id_col].iloc[-1]
+            ready.append(complete)
+            n_ready += complete[id_col].nunique()
+        if n_ready >= batch_size:
+            yield pd.concat(ready, ignore_index=True)
+            ready, n_ready = [], 0
+    if carry is not None:
+        ready.append(carry)
+    if ready:
+        yield pd.concat(ready, ignore_index=True)
+
+
+async def _gather(*aws: Awaitable[_T]) -> list[_T]:
+    # cancel the pending requests if one of them fails
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def _is_arrow_data(df: Any) -> bool:
+    # pyarrow is only imported if the user already did, to check the inputs
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(df, (pa.Table, pa.RecordBatchReader))
+
+
+def _arrow_to_polars(
+    df: Union["pa.Table", "pa.RecordBatchReader"], id_col: str
+) -> pl_DataFrame:
+    # polars uses the arrow memory layout, so the numeric and temporal columns
+    # share the table's buffers instead of being copied
+    import polars as pl
+
+    if not isinstance(df, sys.modules["pyarrow"].Table):
+        df = df.read_all()
+    if id_col in df.column_names:
+        id_type = df.schema.field(id_col).type
+        if hasattr(id_type, "value_type"):
+            # dictionary encoded ids are processed as their values
+            ids = df[id_col].cast(id_type.value_type)
+            df = df.set_column(df.column_names.index(id_col), id_col, ids)
+    return pl.from_arrow(df, rechunk=False)
+
+
+def _polars_to_arrow(df: pl_DataFrame, id_col: str) -> "pa.Table":
+    table = df.to_arrow()
+    if id_col in table.column_names:
+        # every id is repeated for the rows of its series
+        table = table.set_column(
+            table.column_names.index(id_col),
+            id_col,
+            table[id_col].dictionary_encode(),
+        )
+    return table
+
+
+def _ensure_local_df(df: Any, method: str) -> None:
+    local_types = (pd.DataFrame, pl_DataFrame, pl_LazyFrame, PreparedSeries)
+    if not isinstance(df, local_types) and not _is_arrow_data(df):
+        raise ValueError(
+            f"{method} only supports pandas and polars DataFrames and pyarrow "
+            f"Tables, got {type(df).__name__}. Please use `NixtlaClient` for "
+            "distributed dataframes."
+        )
+
+
+class PreparedSeries(NamedTuple):
+    """Series validated and preprocessed by `NixtlaClient.prepare`.
+
+    They can be passed as `df` to `forecast`, `detect_anomalies`,
+    `detect_anomalies_online`, `cross_validation` and `finetune`, which then
+    skip the validations, the sorting and the computation of the date
+    features. The arrays are read-only, so the same prepared series can be
+    shared by several calls and threads.
+
+    Attributes:
+        df (pandas or polars DataFrame): Validated data, sorted by id and
+            time, with the date features.
+        processed (ProcessedDF): Target and features as a 2D array, with the
+            boundaries of the series and their ids and last timestamps.
+        freq (str, int or pandas offset): Frequency of the timestamps.
+        id_col (str): Column that identifies each series.
+        time_col (str): Column that identifies each timestep.
+        target_col (str): Column that contains the target.
+        exog_cols (list[str]): Exogenous features from the input data.
+        date_features (bool or list[str] or callable): Date features that
+            were computed.
+        date_features_to_one_hot (bool or list[str]): Date features that were
+            one-hot encoded.
+        date_feature_cols (list[str]): Columns with the date features.
+        drop_id (bool): Whether the input data had a single serie without
+            `id_col`, which is then removed from the outputs.
+    """
+
+    df: DataFrame
+    processed: ufp.ProcessedDF
+    freq: _Freq
+    id_col: str
+    time_col: str
+    target_col: str
+    exog_cols: list[str]
+    date_features: Union[bool, Sequence[Union[str, Callable]]]
+    date_features_to_one_hot: Union[bool, list[str]]
+    date_feature_cols: list[str]
+    drop_id: bool
+
+    @property
+    def x_cols(self) -> list[str]:
+        return [*self.exog_cols, *self.date_feature_cols]
+
+
+class PartitionResult(NamedTuple):
+    """Output of a partition yielded by the iter methods, e.g.
+    `NixtlaClient.forecast_iter`.
+
+    The partitions are processed at the same time, so their weights and
+    feature contributions are returned here instead of being set as
+    attributes of the client.
+
+    Attributes:
+        df (pandas or polars DataFrame): Output of the method for the series
+            of the partition.
+        weights_x (pandas or polars DataFrame, optional): Weights of the
+            exogenous features, like the client's `weights_x` attribute.
+            None if there aren't exogenous features.
+        feature_contributions (pandas or polars DataFrame, optional):
+            Contributions of the features to the forecasts, like the
+            client's `feature_contributions` attribute. None if they weren't
+            requested.
+    """
+
+    df: DataFrame
+    weights_x: Optional[Union[DataFrame, list[DataFrame]]]
+    feature_contributions: Optional[DataFrame]
+
+
+class NixtlaClient:
+    retry_stats = _CallResult()
+    used_fallback = _CallResult()
+    missing_series = _CallResult()
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = 60,
+        max_retries: int = 6,
+        retry_interval: int = 10,
+        max_wait_time: int = 6 * 60,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        payload_codec: _PayloadCodec = "json",
+        partition_size_mb: Optional[float] = 50,
+        max_concurrency: _PositiveInt = 10,
+        adaptive_concurrency: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        checkpoint_dir: Optional[Union[str, Path]] = None,
+        cache: Optional[Union[MemoryCache, SqliteCache]] = None,
+        model_params_cache: Optional[Union[str, Path]] = None,
+        model_params_ttl: Optional[float] = 24 * 60 * 60,
+        rate_limiter: Optional[
+            Union[MemoryRateLimiter, FileRateLimiter, RedisRateLimiter]
+        ] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        freq_validation: _FreqValidation = "grid",
+    ):
+        """
+        Client to interact with the Nixtla API.
+
+        Args:
+            api_key (str, optional): The authorization API key to interact
+                with the Nixtla API. If not provided, will use the
+                NIXTLA_API_KEY environment variable.
+            base_url (str, optional): Custom base URL.
+                If not provided, will use the NIXTLA_BASE_URL environment
+                variable.
+            timeout (int, optional): Request timeout in seconds.
+                Set to `None` to disable it. Defaults to 60.
+            max_retries (int, optional): The maximum number of attempts to
+                make when calling the API before giving up. It defines how
+                many times the client will retry the API call if it fails.
                 Default value is 6, indicating the client will attempt the
                 API call up to 6 times in total. Defaults to 6.
             retry_interval (int, optional): The interval in seconds between
@@ -880,6 +3383,111 @@ class NixtlaClient:
                 exceeds 360 seconds. The client throws a ReadTimeout error
                 after 60 seconds of inactivity. If you want to catch these
                 errors, use max_wait_time >> 60. Defaults to 360.
+            max_connections (int, optional): Maximum number of concurrent
+                connections kept by the client's connection pool. Set to
+                `None` to disable the limit. Defaults to 100.
+            max_keepalive_connections (int, optional): Maximum number of idle
+                connections kept alive in the pool to be reused by
+                subsequent requests. Set to `None` to disable the limit.
+                Defaults to 20.
+            keepalive_expiry (float, optional): Time in seconds after which
+                an idle connection is closed. Set to `None` to keep idle
+                connections open indefinitely. Defaults to 5.
+            http2 (bool): Use HTTP/2, which multiplexes concurrent requests
+                (e.g. from `num_partitions`) over a single connection.
+                Requires the `h2` package, which can be installed with
+                `pip install "nixtla[http2]"`. Defaults to False.
+            payload_codec (str): Format used to send the series to the API.
+                `json` encodes them as JSON arrays of numbers. `binary` sends
+                them as raw float32 buffers, which makes the payloads smaller
+                and faster to build, and asks the API to reply in the same
+                format, which is decoded directly into numpy arrays. Endpoints
+                that don't accept the binary format are detected on the first
+                request and use JSON from then on. Defaults to 'json'.
+            partition_size_mb (float, optional): Target size in MB of the
+                requests' bodies. When `num_partitions` is None and the
+                estimated size of a payload exceeds it, the series are split
+                in enough partitions to fit this budget (and at least as many
+                as requests can be made concurrently), which are sent in
+                parallel. Multivariate and fine-tuning requests are never
+                split automatically. Set to `None` to disable it. Defaults to 50.
+            max_concurrency (int): Maximum number of partitions sent to the
+                API at the same time, shared by the requests that a call makes
+                together (e.g. the forecasts and the fitted values with
+                `add_history=True`). Defaults to 10.
+            adaptive_concurrency (bool): Adjust the number of partitions in
+                flight to the API's responses instead of always using
+                `max_concurrency`. It starts low, grows while the latency
+                and error rate are stable and is halved when the API is
+                overloaded (429 and 503 status codes or timeouts). The
+                current state can be inspected with `concurrency_metrics`.
+                Defaults to False.
+            retry_policy (RetryPolicy, optional): Policy used to retry the
+                failed requests, with exponential backoff, jitter and a
+                retry budget. If provided, `max_retries`, `retry_interval` and
+                `max_wait_time` are ignored. If None, the requests are retried
+                every `retry_interval` seconds. In both cases the wait requested
+                by the API in the `Retry-After` header is respected.
+                Defaults to None.
+            checkpoint_dir (str or Path, optional): Directory where the
+                responses of the partitions of a request (e.g. when using
+                `num_partitions`) are saved as they complete. If a call fails,
+                running it again with the same data and arguments only
+                requests the partitions that are missing. The checkpoints of
+                a request are removed once all its partitions succeed.
+                Defaults to None.
+            cache (MemoryCache or SqliteCache, optional): Cache for the
+                responses of the forecasting and anomaly detection endpoints,
+                keyed by a hash of the request's data and arguments. Repeated
+                requests are served from it without calling the API. Its
+                counters can be inspected with `cache.stats()`.
+                Defaults to None.
+            model_params_cache (str or Path, optional): JSON file where the
+                models' metadata (input size and horizon) is stored so that
+                other processes and sessions don't have to request it again.
+                The metadata is always shared by the clients of the same
+                process. Defaults to None.
+            model_params_ttl (float, optional): Time in seconds after which
+                the models' metadata is requested again. If None, it never
+                expires. Defaults to 86400 (one day).
+            rate_limiter (MemoryRateLimiter, FileRateLimiter or RedisRateLimiter, optional):
+                Token bucket used to pace the requests (including the
+                partitions of a request and the retries) so that they stay
+                under the per-minute quota of the account. Unless it's given
+                a limit, it's seeded with the quota and the requests already
+                made this minute from `usage()`. The same limiter can be
+                shared by several clients and threads, and the file and Redis
+                ones by several processes. Defaults to None.
+            hedge_policy (HedgePolicy, optional): Send a duplicate of the
+                requests that take longer than usual and use the first
+                response. The hedges sent and how many of them were faster
+                than the original request can be inspected with
+                `hedge_metrics`. If None, the requests aren't hedged.
+                Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): Stop sending requests
+                for a while after several consecutive failures, so that the
+                calls fail fast (or use a local fallback model in `forecast`)
+                while the API is unavailable instead of retrying for up to
+                `max_wait_time` seconds. Defaults to None.
+            freq_validation (str): How the timestamps are checked against the
+                frequency. 'grid' builds the expected timestamps of every serie
+                and compares their number with the data. 'vectorized' compares
+                the consecutive timestamps of each serie in a single pass, which
+                doesn't allocate the grid, and reports the ids of the series
+                that fail. Defaults to 'grid'.
+
+        The client keeps a pool of connections that is shared by all calls
+        (and threads) using it, so that consecutive requests don't pay the
+        connection setup. Call `close` or use the client as a context manager
+        to release the connections when you're done with it.
+
+        After every call to the API, the `retry_stats` attribute holds the
+        number of requests made, the retries, the total time in seconds
+        spent waiting between attempts and the retries denied by the
+        retry budget. It and the other results of the last call (e.g.
+        `missing_series`) are kept for the thread or asyncio task that made
+        the call, so concurrent calls on the client don't overwrite each
+        other's.
         """
         if api_key is None:
             api_key = os.environ["NIXTLA_API_KEY"]
@@ -892,13 +3500,51 @@ class NixtlaClient:
                 "Content-Type": "application/json",
             },
             "timeout": timeout,
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "http2": http2,
         }
-        self._retry_strategy = _retry_strategy(
-            max_retries=max_retries,
-            retry_interval=retry_interval,
-            max_wait_time=max_wait_time,
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._payload_codec = payload_codec
+        self._freq_validation = freq_validation
+        self._json_endpoints: set[str] = set()
+        self._partition_size_mb = partition_size_mb
+        self._concurrency = _ConcurrencyController(
+            max_concurrency=max_concurrency, adaptive=adaptive_concurrency
         )
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                max_retries=max_retries,
+                initial_interval=retry_interval,
+                multiplier=1,
+                max_interval=retry_interval,
+                jitter=False,
+                max_wait_time=max_wait_time,
+                budget_ratio=None,
+            )
+        self._retry_budget = None
+        if retry_policy.budget_ratio is not None:
+            self._retry_budget = _RetryBudget(
+                ratio=retry_policy.budget_ratio, reserve=retry_policy.budget_reserve
+            )
+        self._retry_strategy = _retry_strategy(retry_policy, self._retry_budget)
+        self._checkpoint_dir = checkpoint_dir
+        self._cache = cache
         self._model_params: dict[tuple[str, str], tuple[int, int]] = {}
+        self._model_params_path = None
+        if model_params_cache is not None:
+            self._model_params_path = Path(model_params_cache)
+        self._model_params_ttl = model_params_ttl
+        self._rate_limiter = rate_limiter
+        self._hedging = None
+        if hedge_policy is not None:
+            self._hedging = _HedgeTracker(hedge_policy)
+        self._circuit_breaker = circuit_breaker
         self._is_azure = "ai.azure" in base_url
         self.supported_models: list[Any] = [re.compile("^timegpt-.+$"), "azureai"]
 
@@ -908,56 +3554,90 @@ class NixtlaClient:
         endpoint: str,
         payload: dict[str, Any],
         multithreaded_compress: bool,
+        encoded: Optional[_EncodedPayload] = None,
     ) -> dict[str, Any]:
-        def ensure_contiguous_if_array(x):
-            if not isinstance(x, np.ndarray):
-                return x
-            if np.issubdtype(x.dtype, np.floating):
-                x = np.nan_to_num(
-                    np.ascontiguousarray(x, dtype=np.float32),
-                    nan=np.nan,
-                    posinf=np.finfo(np.float32).max,
-                    neginf=np.finfo(np.float32).min,
-                    copy=False,
-                )
-            else:
-                x = np.ascontiguousarray(x)
-            return x
-
-        def ensure_contiguous_arrays(d: dict[str, Any]) -> None:
-            for k, v in d.items():
-                if isinstance(v, np.ndarray):
-                    d[k] = ensure_contiguous_if_array(v)
-                elif isinstance(v, list):
-                    d[k] = [ensure_contiguous_if_array(x) for x in v]
-                elif isinstance(v, dict):
-                    ensure_contiguous_arrays(v)
+        if encoded is None or encoded.codec != self._codec_for(endpoint):
+            encoded = self._encode(endpoint, payload, multithreaded_compress)
+        codec, content, headers = encoded
+        hedge_done = _current_hedge_done.get()
+        if hedge_done is not None and hedge_done.is_set():
+            raise CancelledError()
+        self._wait_for_rate_limiter(client)
+        with _circuit_breaker_guard(self._circuit_breaker):
+            resp = client.post(
+                url=endpoint,
+                content=content,
+                headers=headers,
+                timeout=self._request_timeout(),
+            )
+            try:
+                return _decode_response(resp)
+            except ApiError as e:
+                self._maybe_drain_rate_limiter(e)
+                if not self._maybe_fallback_to_json(endpoint, codec, e):
+                    raise
+        return self._make_request(client, endpoint, payload, multithreaded_compress)
+
+    def _wait_for_rate_limiter(self, client: httpx.Client) -> None:
+        limiter = self._rate_limiter
+        if limiter is None:
+            return
+        if not limiter._seeded:
+            _single_flight.run(
+                ("usage", id(limiter)), lambda: self._seed_rate_limiter(client)
+            )
+        delay = limiter.acquire()
+        if delay > 0:
+            time.sleep(delay)
 
-        ensure_contiguous_arrays(payload)
-        content = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
-        content_size_mb = len(content) / 2**20
-        if content_size_mb > 200:
-            raise ValueError(
-                f"The payload is too large. Set num_partitions={math.ceil(content_size_mb / 200)}"
-            )
-        headers = {}
-        if content_size_mb > 1:
-            threads = -1 if multithreaded_compress else 0
-            content = zstd.ZstdCompressor(level=1, threads=threads).compress(content)
-            headers["content-encoding"] = "zstd"
-        resp = client.post(url=endpoint, content=content, headers=headers)
+    def _seed_rate_limiter(self, client: httpx.Client) -> None:
+        assert self._rate_limiter is not None
+        if self._rate_limiter._seeded:
+            return
         try:
-            resp_body = orjson.loads(resp.content)
-        except orjson.JSONDecodeError:
-            raise ApiError(
-                status_code=resp.status_code,
-                body=f"Could not parse JSON: {resp.content}",
-            )
-        if resp.status_code != 200:
-            raise ApiError(status_code=resp.status_code, body=resp_body)
-        if "data" in resp_body:
-            resp_body = resp_body["data"]
-        return resp_body
+            usage = self._get_request(client, "/usage")
+        except (ApiError, httpx.HTTPError, ValueError) as e:
+            logger.warning(
+                f"Could not get the usage limits, requests won't be paced: {e}"
+            )
+            usage = {}
+        self._rate_limiter._seed(usage)
+
+    def _maybe_drain_rate_limiter(self, error: ApiError) -> None:
+        # the quota was exceeded (e.g. by other clients), so the next
+        # requests wait for new tokens
+        if self._rate_limiter is not None and error.status_code == 429:
+            self._rate_limiter.drain()
+
+    def _encode(
+        self, endpoint: str, payload: dict[str, Any], multithreaded_compress: bool
+    ) -> _EncodedPayload:
+        codec = self._codec_for(endpoint)
+        content, headers = _encode_payload(payload, multithreaded_compress, codec)
+        return _EncodedPayload(codec, content, headers)
+
+    def _request_timeout(self) -> Any:
+        deadline = _current_deadline.get()
+        if deadline is None:
+            return httpx.USE_CLIENT_DEFAULT
+        return deadline.request_timeout(self._client_kwargs["timeout"])
+
+    def _codec_for(self, endpoint: str) -> _PayloadCodec:
+        if endpoint in self._json_endpoints:
+            return "json"
+        return self._payload_codec
+
+    def _maybe_fallback_to_json(
+        self, endpoint: str, codec: _PayloadCodec, error: ApiError
+    ) -> bool:
+        if codec == "json" or not _is_codec_rejection(error):
+            return False
+        logger.warning(
+            f"The {endpoint} endpoint doesn't support the {codec} payload codec, "
+            "using JSON instead."
+        )
+        self._json_endpoints.add(endpoint)
+        return True
 
     def _make_request_with_retries(
         self,
@@ -966,23 +3646,107 @@ class NixtlaClient:
         payload: dict[str, Any],
         multithreaded_compress: bool = True,
     ) -> dict[str, Any]:
-        return self._retry_strategy(self._make_request)(
+        make_request = self._make_request
+        if self._hedging is not None and endpoint in _CACHEABLE_ENDPOINTS:
+            make_request = self._make_hedged_request
+        return self._retry_strategy(make_request)(
             client=client,
             endpoint=endpoint,
             payload=payload,
             multithreaded_compress=multithreaded_compress,
         )
 
-    def _get_request(
+    def _make_hedged_request(
         self,
         client: httpx.Client,
         endpoint: str,
-        params: Optional[dict[str, Any]] = None,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+    ) -> dict[str, Any]:
+        assert self._hedging is not None
+        delay = self._hedging.start()
+        if delay is None:
+            return self._make_timed_request(
+                client, endpoint, payload, multithreaded_compress
+            )
+        executor = self._get_hedge_executor()
+        done_event = threading.Event()
+
+        def submit() -> Future:
+            ctx = contextvars.copy_context()
+            ctx.run(_current_hedge_done.set, done_event)
+            return executor.submit(
+                ctx.run,
+                self._make_timed_request,
+                client,
+                endpoint,
+                payload,
+                multithreaded_compress,
+            )
+
+        # maps every attempt to whether it's the hedge
+        attempts = {submit(): False}
+        try:
+            done, _ = wait(attempts, timeout=delay)
+            hedged = not done and self._hedging.try_hedge()
+            if hedged:
+                attempts[submit()] = True
+            error: Optional[Exception] = None
+            while attempts:
+                done, _ = wait(attempts, return_when=FIRST_COMPLETED)
+                for future in done:
+                    is_hedge = attempts.pop(future)
+                    try:
+                        resp = future.result()
+                    except Exception as e:
+                        error = error or e
+                        continue
+                    if hedged:
+                        self._hedging.on_hedge_result(hedge_won=is_hedge)
+                    return resp
+            assert error is not None
+            raise error
+        finally:
+            # the attempts that haven't been sent are dropped, the ones in
+            # flight can't be interrupted so their response is discarded
+            done_event.set()
+            for future in attempts:
+                future.cancel()
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        # shared by the hedged requests, which send at most two attempts each
+        if self._hedge_executor is None:
+            with self._client_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        2 * self._concurrency.max_concurrency
+                    )
+        return self._hedge_executor
+
+    def _make_timed_request(
+        self,
+        client: httpx.Client,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+    ) -> dict[str, Any]:
+        assert self._hedging is not None
+        start = time.perf_counter()
+        resp = self._make_request(client, endpoint, payload, multithreaded_compress)
+        self._hedging.on_success(time.perf_counter() - start)
+        return resp
+
+    def _get_request(
+        self,
+        client: httpx.Client,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
-        resp = client.get(endpoint, params=params)
-        resp_body = resp.json()
-        if resp.status_code != 200:
-            raise ApiError(status_code=resp.status_code, body=resp_body)
+        with _circuit_breaker_guard(self._circuit_breaker):
+            resp = client.get(endpoint, params=params, timeout=self._request_timeout())
+            resp_body = resp.json()
+            if resp.status_code != 200:
+                raise ApiError._from_response(resp, resp_body)
         return resp_body
 
     def _make_partitioned_requests(
@@ -994,59 +3758,432 @@ class NixtlaClient:
         from tqdm.auto import tqdm
 
         num_partitions = len(payloads)
-        results: list[dict[str, Any]] = [{} for _ in range(num_partitions)]
-        max_workers = min(10, num_partitions)
-        with ThreadPoolExecutor(max_workers) as executor:
-            future2pos = {
-                executor.submit(
-                    self._make_request_with_retries,
-                    client=client,
-                    endpoint=endpoint,
-                    payload=payload,
-                    multithreaded_compress=False,
-                ): i
-                for i, payload in enumerate(payloads)
-            }
-            for future in tqdm(as_completed(future2pos), total=len(future2pos)):
-                pos = future2pos[future]
-                results[pos] = future.result()
-        resp = {"mean": np.hstack([res["mean"] for res in results])}
-        first_res = results[0]
-        for k in ("sizes", "anomaly"):
-            if k in first_res:
-                resp[k] = np.hstack([res[k] for res in results])
-        if "idxs" in first_res:
-            offsets = [0] + [sum(p["series"]["sizes"]) for p in payloads[:-1]]
-            resp["idxs"] = np.hstack(
-                [
-                    np.array(res["idxs"], dtype=np.int64) + offset
-                    for res, offset in zip(results, offsets)
-                ]
+        results, checkpoint = self._load_checkpoint(endpoint, payloads)
+        max_workers = min(self._concurrency.max_concurrency, num_partitions)
+        make_request = self._retry_strategy(self._make_controlled_request)
+        to_submit = deque(i for i in range(num_partitions) if not results[i])
+        future2pos: dict[Future, int] = {}
+        error: Optional[Exception] = None
+        deadline = _current_deadline.get()
+        timed_out: list[int] = []
+        pbar = tqdm(total=num_partitions, initial=num_partitions - len(to_submit))
+        executor = ThreadPoolExecutor(max_workers)
+        # the partitions are encoded in order by a single thread, ahead of
+        # the requests, so that the serialization of a partition overlaps
+        # with the requests of the previous ones. Only the partitions in
+        # flight or about to be sent are kept encoded in memory.
+        encoder = ThreadPoolExecutor(1)
+        encoding: dict[int, Future] = {}
+        # the requests in flight aren't waited for once the call is
+        # interrupted or the deadline expires
+        abandoned = False
+        slots = _current_step_slots.get()
+        if not isinstance(slots, _StepSlots):
+            slots = _StepSlots(self._concurrency)
+        try:
+            while (to_submit and error is None) or future2pos:
+                # the limit is read on every iteration since it can change
+                # while the requests complete
+                n_encode = self._concurrency.limit - len(future2pos) + _ENCODE_AHEAD
+                for pos in itertools.islice(to_submit, max(n_encode, 0)):
+                    if error is None and pos not in encoding:
+                        encoding[pos] = encoder.submit(
+                            self._encode, endpoint, payloads[pos], True
+                        )
+                timeout = None
+                if deadline is not None and deadline.expires_at is not None:
+                    timeout = deadline.remaining()
+                # the slots are shared with the other calls of the step, so a
+                # slot is only waited for when none of the requests of this
+                # call are in flight
+                while (
+                    error is None
+                    and to_submit
+                    and slots.acquire(timeout if not future2pos else 0)
+                ):
+                    pos = to_submit.popleft()
+                    # the threads don't inherit the context, which holds
+                    # the call's retry stats
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._send_partition,
+                        make_request,
+                        client,
+                        endpoint,
+                        payloads[pos],
+                        encoding.pop(pos),
+                    )
+                    future.add_done_callback(lambda _: slots.release())
+                    future2pos[future] = pos
+                done, _ = wait(future2pos, timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # the deadline expired
+                    abandoned = True
+                    break
+                for future in done:
+                    pos = future2pos.pop(future)
+                    try:
+                        results[pos] = future.result()
+                    except Exception as e:
+                        if deadline is not None and (
+                            deadline.remaining() == 0 or isinstance(e, TimeoutError)
+                        ):
+                            timed_out.append(pos)
+                        else:
+                            # stop submitting, but keep the requests in flight
+                            error = error or e
+                        continue
+                    if checkpoint is not None:
+                        checkpoint.save(pos, results[pos])
+                    pbar.update()
+        except BaseException:
+            # e.g. KeyboardInterrupt, stop the retries of the requests in
+            # flight and don't wait for them
+            abandoned = True
+            if deadline is not None:
+                deadline.cancelled.set()
+            raise
+        finally:
+            encoder.shutdown(wait=False, cancel_futures=True)
+            executor.shutdown(wait=not abandoned, cancel_futures=True)
+            pbar.close()
+        if error is not None:
+            raise error
+        missing = [*to_submit, *future2pos.values(), *timed_out]
+        if missing:
+            assert deadline is not None
+            self._fill_missing_partitions(results, payloads, missing, deadline)
+        resp = _merge_partitioned_results(results, payloads)
+        if checkpoint is not None and not missing:
+            checkpoint.clear()
+        return resp
+
+    @staticmethod
+    def _send_partition(
+        make_request: Callable[..., dict[str, Any]],
+        client: httpx.Client,
+        endpoint: str,
+        payload: dict[str, Any],
+        encoding: "Future[_EncodedPayload]",
+    ) -> dict[str, Any]:
+        resp = make_request(
+            client=client,
+            endpoint=endpoint,
+            payload=payload,
+            multithreaded_compress=False,
+            encoded=encoding.result(),
+        )
+        return _compact_partition_result(resp)
+
+    @staticmethod
+    def _fill_missing_partitions(
+        results: list[dict[str, Any]],
+        payloads: list[dict[str, Any]],
+        missing: list[int],
+        deadline: _Deadline,
+    ) -> None:
+        # the requests in flight see that the deadline expired and stop
+        deadline.cancelled.set()
+        completed = [pos for pos in range(len(results)) if results[pos]]
+        if deadline.on_timeout == "raise" or not completed:
+            raise deadline.error()
+        template = results[completed[0]]
+        template_n_series = len(payloads[completed[0]]["series"]["sizes"])
+        offsets = np.cumsum([0] + [len(p["series"]["sizes"]) for p in payloads])
+        for pos in missing:
+            n_series = len(payloads[pos]["series"]["sizes"])
+            results[pos] = _missing_partition_result(
+                template, n_series=n_series, template_n_series=template_n_series
             )
-        if "anomaly_score" in first_res:
-            resp["anomaly_score"] = np.hstack([res["anomaly_score"] for res in results])
-        if first_res["intervals"] is None:
-            resp["intervals"] = None
-        else:
-            resp["intervals"] = {}
-            for k in first_res["intervals"].keys():
-                resp["intervals"][k] = np.hstack(
-                    [res["intervals"][k] for res in results]
+            deadline.missing_series.update(range(offsets[pos], offsets[pos + 1]))
+        logger.warning(
+            f"The call didn't complete within {deadline.timeout}s, "
+            f"{len(missing)} of {len(results)} partitions are missing."
+        )
+
+    def _load_checkpoint(
+        self, endpoint: str, payloads: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], Optional[_PartitionCheckpoint]]:
+        results: list[dict[str, Any]] = [{} for _ in range(len(payloads))]
+        if self._checkpoint_dir is None:
+            return results, None
+        checkpoint = _PartitionCheckpoint(self._checkpoint_dir, endpoint, payloads)
+        saved = checkpoint.load()
+        for pos, resp in saved.items():
+            if pos < len(results):
+                results[pos] = resp
+        if saved:
+            logger.info(
+                f"Resuming from checkpoint {checkpoint.path}, "
+                f"{len(saved)} of {len(payloads)} partitions are done."
+            )
+        return results, checkpoint
+
+    def _make_controlled_request(
+        self,
+        client: httpx.Client,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+        encoded: Optional[_EncodedPayload] = None,
+    ) -> dict[str, Any]:
+        # reports every attempt to the concurrency controller
+        start = time.perf_counter()
+        try:
+            resp = self._make_request(
+                client, endpoint, payload, multithreaded_compress, encoded
+            )
+        except Exception as e:
+            self._concurrency.on_error(e)
+            raise
+        self._concurrency.on_success(time.perf_counter() - start)
+        return resp
+
+    @property
+    def concurrency_metrics(self) -> dict[str, Any]:
+        """State of the requests made for partitioned payloads.
+
+        Returns:
+            dict: Current number of partitions allowed in flight
+                (`concurrency`) and its maximum, throughput in requests per
+                second and 95th percentile of the latency in seconds over
+                the last requests, error rate over the last requests, and
+                the total number of requests, errors and times the
+                concurrency was reduced (`backoffs`).
+        """
+        return self._concurrency.metrics()
+
+    @property
+    def hedge_metrics(self) -> Optional[dict[str, Any]]:
+        """State of the hedged requests.
+
+        Returns:
+            dict, optional: Current hedging delay in seconds, number of
+                requests that could be hedged, hedges sent and their ratio
+                to the requests, and the number of hedges that completed
+                before (`wins`) and after (`losses`) the original request.
+                None if the client doesn't use a hedge policy.
+        """
+        if self._hedging is None:
+            return None
+        return self._hedging.metrics()
+
+    def _call_api(self, client: httpx.Client, call: _ApiCall) -> dict[str, Any]:
+        if call.single_flight_key is not None:
+            return _single_flight.run(
+                call.single_flight_key,
+                lambda: self._call_api(client, call._replace(single_flight_key=None)),
+            )
+        if call.method == "get":
+            return self._retry_strategy(self._get_request)(
+                client, call.endpoint, call.payload
+            )
+        cache_key = self._cache_key(call)
+        if cache_key is not None:
+            resp = self._cache.get(cache_key)
+            if resp is not None:
+                return resp
+        resp = self._post(client, call)
+        if cache_key is not None and not _is_partial():
+            self._cache.set(cache_key, resp)
+        return resp
+
+    def _cache_key(self, call: _ApiCall) -> Optional[str]:
+        if self._cache is None or call.endpoint not in _CACHEABLE_ENDPOINTS:
+            return None
+        digest = hashlib.sha256()
+        for part in (self._client_kwargs["base_url"], call.endpoint):
+            digest.update(f"{part}\0".encode())
+        digest.update(str(call.num_partitions).encode())
+        digest.update(_payload_fingerprint(call.payload).encode())
+        return digest.hexdigest()
+
+    def _post(self, client: httpx.Client, call: _ApiCall) -> dict[str, Any]:
+        num_partitions = self._num_partitions(call)
+        if num_partitions is None:
+            with self._step_slot():
+                return self._make_request_with_retries(
+                    client, call.endpoint, call.payload
                 )
-        if "weights_x" not in first_res or first_res["weights_x"] is None:
-            resp["weights_x"] = None
-        else:
-            resp["weights_x"] = [res["weights_x"] for res in results]
+        payloads = _partition_series(call.payload, num_partitions, call.h)
+        return self._make_partitioned_requests(client, call.endpoint, payloads)
+
+    @contextlib.contextmanager
+    def _step_slot(self) -> Iterator[None]:
+        # a request that isn't partitioned takes one of the slots of the step
+        slots = _current_step_slots.get()
+        if not isinstance(slots, _StepSlots):
+            yield
+            return
+        deadline = _current_deadline.get()
+        timeout = None
+        if deadline is not None and deadline.expires_at is not None:
+            timeout = deadline.remaining()
+        if not slots.acquire(timeout):
+            assert deadline is not None
+            raise deadline.error()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def _num_partitions(self, call: _ApiCall) -> Optional[int]:
         if (
-            "feature_contributions" not in first_res
-            or first_res["feature_contributions"] is None
+            call.num_partitions is not None
+            or not call.auto_partition
+            or self._partition_size_mb is None
+            or "series" not in call.payload
         ):
-            resp["feature_contributions"] = None
-        else:
-            resp["feature_contributions"] = np.vstack(
-                [np.stack(res["feature_contributions"], axis=1) for res in results]
-            ).T
-        return resp
+            return call.num_partitions
+        series = call.payload["series"]
+        codec = self._codec_for(call.endpoint)
+        size_mb = _estimate_payload_size(series, call.h, codec) / 2**20
+        if size_mb <= self._partition_size_mb:
+            return None
+        num_partitions = max(
+            math.ceil(size_mb / self._partition_size_mb),
+            min(self._concurrency.max_concurrency, len(series["sizes"])),
+        )
+        logger.info(
+            f"Estimated payload size is {size_mb:,.0f}MB, "
+            f"splitting the series in {num_partitions} partitions."
+        )
+        return num_partitions
+
+    def _run(
+        self,
+        steps: _Steps[_T],
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> _T:
+        # drives the generators that implement the endpoints (e.g. `_forecast`),
+        # which yield the API calls they need and receive their responses
+        with self._collect_retry_stats(), self._deadline(timeout_total, on_timeout):
+            try:
+                calls = next(steps)
+                while True:
+                    client = self._get_client()
+                    try:
+                        resps = self._call_apis(client, calls)
+                    except Exception as e:
+                        # the generators can handle the errors, e.g. to fall
+                        # back to a local model
+                        calls = steps.throw(e)
+                    else:
+                        calls = steps.send(resps)
+            except StopIteration as stop:
+                return stop.value
+
+    def _call_apis(
+        self, client: httpx.Client, calls: list[_ApiCall]
+    ) -> list[dict[str, Any]]:
+        if len(calls) == 1:
+            return [self._call_api(client, calls[0])]
+        # the calls of a step don't depend on each other, e.g. the forecasts
+        # and the fitted values, but they share the concurrency limit. The
+        # threads don't inherit the context, which holds the call's retry
+        # stats and deadline.
+        slots = _StepSlots(self._concurrency)
+
+        def submit(call: _ApiCall) -> Future:
+            ctx = contextvars.copy_context()
+            ctx.run(_current_step_slots.set, slots)
+            return executor.submit(ctx.run, self._call_api, client, call)
+
+        with ThreadPoolExecutor(len(calls)) as executor:
+            futures = [submit(call) for call in calls]
+            return [future.result() for future in futures]
+
+    @contextlib.contextmanager
+    def _collect_retry_stats(self) -> Iterator[None]:
+        if _current_retry_stats.get() is not None:
+            # nested call, the stats are collected by the outer one
+            yield
+            return
+        stats = _RetryStats()
+        token = _current_retry_stats.set(stats)
+        try:
+            yield
+        finally:
+            _current_retry_stats.reset(token)
+            self.retry_stats = stats.to_dict()
+
+    @contextlib.contextmanager
+    def _deadline(
+        self, timeout_total: Optional[float], on_timeout: _OnTimeout
+    ) -> Iterator[None]:
+        if _current_deadline.get() is not None:
+            # nested call, the outer one sets the deadline
+            yield
+            return
+        deadline = _Deadline(timeout_total, on_timeout)
+        token = _current_deadline.set(deadline)
+        self.missing_series = []
+        try:
+            yield
+        except Exception as e:
+            if deadline.remaining() > 0 or isinstance(e, TimeoutError):
+                raise
+            # e.g. the retries of a request stopped because of the deadline
+            raise deadline.error() from e
+        finally:
+            _current_deadline.reset(token)
+
+    def _drop_missing_series(
+        self, df: DFType, uids: Union[Series, pd.Index], id_col: str
+    ) -> DFType:
+        # removes the series without results from a partial output
+        deadline = _current_deadline.get()
+        if deadline is None or not deadline.missing_series:
+            return df
+        positions = np.array(sorted(deadline.missing_series))
+        missing = ufp.take_rows(uids, positions)
+        self.missing_series = list(missing)
+        return ufp.filter_with_mask(df, ~ufp.is_in(df[id_col], missing))
+
+    def _collect_lazy_steps(
+        self,
+        df: pl_LazyFrame,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        model: _Model = "timegpt-1",
+        restrict_input: bool = False,
+        level: Optional[list[Union[int, float]]] = None,
+        h: int = 0,
+        n_test: int = 0,
+    ) -> _Steps[tuple[pl_DataFrame, Optional[_Freq]]]:
+        # collects the rows of a LazyFrame sorted by polars. When the input can
+        # be restricted (no exogenous features), only the last rows of each
+        # series that the model uses are collected.
+        columns = df.collect_schema().names()
+        if id_col not in columns:
+            # single series, the id is added by the validations
+            return df.sort(time_col).collect(), freq
+        freq = _maybe_infer_freq(df, freq, id_col, time_col)
+        query = df.sort([id_col, time_col])
+        if restrict_input and set(columns) <= {id_col, time_col, target_col}:
+            if self._is_azure:
+                model = "azureai"
+            try:
+                input_size, model_horizon = yield from self._model_params_steps(
+                    model, _standardize_freq(freq)
+                )
+            except CircuitOpenError:
+                # the local fallback uses the whole history
+                return query.collect(), freq
+            n_tail = (
+                _restrict_input_samples(
+                    level=level,
+                    input_size=input_size,
+                    model_horizon=model_horizon,
+                    h=h,
+                )
+                + n_test
+            )
+            query = query.group_by(id_col, maintain_order=True).tail(n_tail)
+        return query.collect(), freq
 
     def _maybe_override_model(self, model: _Model) -> _Model:
         if self._is_azure and model != "azureai":
@@ -1057,23 +4194,117 @@ class NixtlaClient:
     def _make_client(self, **kwargs: Any) -> httpx.Client:
         return httpx.Client(**kwargs)
 
-    def _get_model_params(self, model: _Model, freq: str) -> tuple[int, int]:
+    def _get_client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            with self._client_lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = self._make_client(**self._client_kwargs)
+        return self._client
+
+    def close(self) -> None:
+        """Close the underlying connection pool and the threads of the hedges.
+
+        They're created again if the client is used after being closed."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+                self._hedge_executor = None
+
+    def __enter__(self) -> "NixtlaClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the connection pool and its lock can't be pickled, e.g. when the
+        # client is sent to the workers in the distributed methods
+        state = self.__dict__.copy()
+        state["_client"] = None
+        state["_hedge_executor"] = None
+        del state["_client_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._client_lock = threading.Lock()
+
+    def _model_params_steps(self, model: _Model, freq: str) -> _Steps[tuple[int, int]]:
+        # the metadata is looked up in the client (e.g. when it was fetched by
+        # the driver in the distributed methods), then in the process-wide cache
         key = (model, freq)
-        if key not in self._model_params:
+        if key in self._model_params:
+            return self._model_params[key]
+        shared_key = _model_params_cache.key(
+            self._client_kwargs["base_url"], model, freq
+        )
+        params = _model_params_cache.get(
+            shared_key, ttl=self._model_params_ttl, path=self._model_params_path
+        )
+        if params is None:
             logger.info("Querying model metadata...")
             payload = {"model": model, "freq": freq}
-            with self._make_client(**self._client_kwargs) as client:
-                if self._is_azure:
-                    resp_body = self._make_request_with_retries(
-                        client, "model_params", payload
-                    )
-                else:
-                    resp_body = self._retry_strategy(self._get_request)(
-                        client, "/model_params", payload
-                    )
-            params = resp_body["detail"]
-            self._model_params[key] = (params["input_size"], params["horizon"])
-        return self._model_params[key]
+            if self._is_azure:
+                call = _ApiCall(
+                    "model_params",
+                    payload,
+                    auto_partition=False,
+                    single_flight_key=shared_key,
+                )
+            else:
+                call = _ApiCall(
+                    "/model_params",
+                    payload,
+                    method="get",
+                    single_flight_key=shared_key,
+                )
+            [resp_body] = yield [call]
+            detail = resp_body["detail"]
+            params = (detail["input_size"], detail["horizon"])
+            _model_params_cache.set(shared_key, params, path=self._model_params_path)
+        self._model_params[key] = params
+        return params
+
+    def _prefetch_model_params(self, model: _Model, freq: Optional[_Freq]) -> None:
+        # fetches the metadata once in the driver, so that it's sent to the
+        # workers with the client instead of being requested by each of them
+        if freq is None:
+            return
+        if self._is_azure:
+            model = "azureai"
+        self._get_model_params(model, _standardize_freq(freq))
+
+    def _get_model_params(self, model: _Model, freq: str) -> tuple[int, int]:
+        return self._run(self._model_params_steps(model, freq))
+
+    def _fallback_responses(
+        self,
+        error: CircuitOpenError,
+        processed: ufp.ProcessedDF,
+        h: int,
+        freq: _Freq,
+        level: Optional[list[Union[int, float]]],
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        breaker = self._circuit_breaker
+        if breaker is None or breaker.fallback is None:
+            raise error
+        season_length = breaker.season_length
+        if season_length is None:
+            season_length = _infer_season_length(freq)
+        logger.warning(
+            f"{error}. Using the {breaker.fallback} model instead of TimeGPT."
+        )
+        self.used_fallback = True
+        return _baseline_responses(
+            processed=processed,
+            h=h,
+            level=level,
+            method=breaker.fallback,
+            season_length=season_length,
+        )
 
     def _maybe_assign_weights(
         self,
@@ -1083,12 +4314,16 @@ class NixtlaClient:
     ) -> None:
         if weights is None:
             return
-        if isinstance(weights[0], list):
-            self.weights_x = [
-                type(df)({"features": x_cols, "weights": w}) for w in weights
-            ]
+        if np.ndim(weights[0]) > 0:
+            # one set of weights per partition
+            self._set_output(
+                "weights_x",
+                [type(df)({"features": x_cols, "weights": w}) for w in weights],
+            )
         else:
-            self.weights_x = type(df)({"features": x_cols, "weights": weights})
+            self._set_output(
+                "weights_x", type(df)({"features": x_cols, "weights": weights})
+            )
 
     def _maybe_assign_feature_contributions(
         self,
@@ -1118,7 +4353,30 @@ class NixtlaClient:
                 dict(zip(shap_cols, insample_feat_contributions))
             )
             shap_df = ufp.vertical_concat([insample_shap_df, shap_df])
-        self.feature_contributions = ufp.horizontal_concat([out_df, shap_df])
+        self._set_output(
+            "feature_contributions", ufp.horizontal_concat([out_df, shap_df])
+        )
+
+    def _set_output(self, name: str, value: Any) -> None:
+        outputs = _current_call_outputs.get()
+        if outputs is None:
+            setattr(self, name, value)
+        else:
+            outputs[name] = value
+
+    def _get_output(self, name: str) -> Any:
+        outputs = _current_call_outputs.get()
+        if outputs is None:
+            return getattr(self, name, None)
+        return outputs.get(name)
+
+    def _clear_outputs(self, *names: str) -> None:
+        outputs = _current_call_outputs.get()
+        for name in names:
+            if outputs is None:
+                self.__dict__.pop(name, None)
+            else:
+                outputs.pop(name, None)
 
     def _run_validations(
         self,
@@ -1130,11 +4388,40 @@ class NixtlaClient:
         model: _Model,
         validate_api_key: bool,
         freq: Optional[_FreqType],
-    ) -> tuple[DFType, Optional[DFType], bool, _FreqType]:
-        if validate_api_key and not self.validate_api_key(log=False):
-            raise Exception("API Key not valid, please email support@nixtla.io")
+    ) -> _Steps[tuple[DFType, Optional[DFType], bool, _FreqType]]:
+        yield from self._validate_model(model, validate_api_key)
+        return self._validate_series(
+            df=df,
+            X_df=X_df,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            freq=freq,
+        )
+
+    def _validate_model(self, model: _Model, validate_api_key: bool) -> _Steps[None]:
+        if validate_api_key:
+            self._check_validate_api_key_support()
+            # the key is checked with the client of the call, so that the
+            # async one doesn't block the event loop
+            try:
+                yield [_ApiCall("/validate_api_key", {}, method="get")]
+            except ApiError as e:
+                raise Exception(
+                    "API Key not valid, please email support@nixtla.io"
+                ) from e
         if not _model_in_list(model, tuple(self.supported_models)):
             raise ValueError(f"unsupported model: {model}.")
+
+    def _validate_series(
+        self,
+        df: DFType,
+        X_df: Optional[DFType],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        freq: Optional[_FreqType],
+    ) -> tuple[DFType, Optional[DFType], bool, _FreqType]:
         drop_id = id_col not in df.columns
         if drop_id:
             df = ufp.copy_if_pandas(df, deep=False)
@@ -1156,7 +4443,13 @@ class NixtlaClient:
                 f"Target column ({target_col}) cannot contain missing values."
             )
         freq = _maybe_infer_freq(df, freq=freq, id_col=id_col, time_col=time_col)
-        if isinstance(freq, (str, int)):
+        irregular_ids: list[Any] = []
+        if self._freq_validation == "vectorized" and isinstance(
+            freq, (str, int, pd.offsets.BaseOffset)
+        ):
+            irregular_ids = _irregular_series(df, freq, id_col, time_col)
+            freq_ok = not irregular_ids
+        elif isinstance(freq, (str, int)):
             expected_ids_times = id_time_grid(
                 df,
                 freq=freq,
@@ -1180,7 +4473,7 @@ class NixtlaClient:
                 f"got {type(freq).__name__}."
             )
         if not freq_ok:
-            raise ValueError(
+            msg = (
                 "Series contain missing or duplicate timestamps, or the timestamps "
                 "do not match the provided frequency.\n"
                 "Please make sure that all series have a single observation from the first "
@@ -1188,6 +4481,12 @@ class NixtlaClient:
                 "You can refer to https://docs.nixtla.io/docs/tutorials-missing_values "
                 "for an end to end example."
             )
+            if irregular_ids:
+                shown = ", ".join(str(uid) for uid in irregular_ids[:10])
+                if len(irregular_ids) > 10:
+                    shown += f" and {len(irregular_ids) - 10:,} more"
+                msg += f"\nSeries with irregular timestamps: {shown}."
+            raise ValueError(msg)
         return df, X_df, drop_id, freq
 
     def validate_api_key(self, log: bool = True) -> bool:
@@ -1199,17 +4498,19 @@ class NixtlaClient:
         Returns:
             bool: Whether API key is valid.
         """
+        self._check_validate_api_key_support()
+        resp = self._get_client().get("/validate_api_key")
+        body = resp.json()
+        if log:
+            logger.info(body["detail"])
+        return resp.status_code == 200
+
+    def _check_validate_api_key_support(self) -> None:
         if self._is_azure:
             raise NotImplementedError(
                 "validate_api_key is not implemented for Azure deployments, "
                 "you can try using the forecasting methods directly."
             )
-        with self._make_client(**self._client_kwargs) as client:
-            resp = client.get("/validate_api_key")
-            body = resp.json()
-        if log:
-            logger.info(body["detail"])
-        return resp.status_code == 200
 
     def usage(self) -> dict[str, dict[str, int]]:
         """Query consumed requests and limits
@@ -1219,122 +4520,286 @@ class NixtlaClient:
         """
         if self._is_azure:
             raise NotImplementedError("usage is not implemented for Azure deployments")
-        with self._make_client(**self._client_kwargs) as client:
-            return self._get_request(client, "/usage")
+        return self._get_request(self._get_client(), "/usage")
 
-    def finetune(
+    def _prepare(
         self,
         df: DataFrame,
-        freq: Optional[_Freq] = None,
-        id_col: str = "unique_id",
-        time_col: str = "ds",
-        target_col: str = "y",
-        finetune_steps: _NonNegativeInt = 10,
-        finetune_depth: _FinetuneDepth = 1,
-        finetune_loss: _Loss = "default",
-        output_model_id: Optional[str] = None,
-        finetuned_model_id: Optional[str] = None,
-        model: _Model = "timegpt-1",
-    ) -> str:
-        """Fine-tune TimeGPT to your series.
-
-        Args:
-            df (pandas or polars DataFrame): The DataFrame on which the
-                function will operate. Expected to contain at least the
-                following columns:
-                - time_col:
-                    Column name in `df` that contains the time indices of
-                    the time series. This is typically a datetime column with
-                    regular intervals, e.g., hourly, daily, monthly data
-                    points.
-                - target_col:
-                    Column name in `df` that contains the target variable of
-                    the time series, i.e., the variable we wish to predict
-                    or analyze.
-                Additionally, you can pass multiple time series (stacked in
-                the dataframe) considering an additional column:
-                - id_col:
-                    Column name in `df` that identifies unique time series.
-                    Each unique value in this column corresponds to a unique
-                    time series.
-            freq (str, int, pandas offset, optional): Frequency of the
-                timestamps.  If `None`, it will be inferred automatically.
-                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-                Defaults to None.
-            id_col (str): Column that identifies each series. Defaults to
-                'unique_id'.
-            time_col (str): Column that identifies each timestep, its values
-                can be timestamps or integers. Defaults to 'ds'.
-            target_col (str): Column that contains the target. Defaults to 'y'.
-            finetune_steps (int): Number of steps used to finetune learning
-                TimeGPT in the new data. Defaults to 10.
-            finetune_depth (int): The depth of the finetuning. Uses a scale
-                from 1 to 5, where 1 means little finetuning, and 5 means that
-                the entire model is finetuned. Defaults to 1.
-            finetune_loss (str): Loss function to use for finetuning. Options
-                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
-                Defaults to 'default'.
-            output_model_id (str, optional): ID to assign to the fine-tuned model.
-                If `None`, an UUID is used. Defaults to None.
-            finetuned_model_id (str, optional): ID of previously fine-tuned
-                model to use as base. Defaults to None.
-            model (str):
-                Model to use as a string. Options are: `timegpt-1`, and
-                `timegpt-1-long-horizon`. We recommend using
-                `timegpt-1-long-horizon` for forecasting if you want to
-                predict more than one seasonal period given the frequency
-                of your data. Defaults to 'timegpt-1'.
-
-        Returns:
-            str: ID of the fine-tuned model.
-        """
-        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
-            raise ValueError("Can only fine-tune on pandas or polars dataframes.")
-        model = self._maybe_override_model(model)
-        logger.info("Validating inputs...")
-        df, X_df, drop_id, freq = self._run_validations(
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        date_features: Union[bool, Sequence[Union[str, Callable]]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        sort: bool = False,
+    ) -> PreparedSeries:
+        df, _, drop_id, freq = self._validate_series(
             df=df,
             X_df=None,
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
-            validate_api_key=False,
-            model=model,
             freq=freq,
         )
-
+        base_cols = (id_col, time_col, target_col)
+        exog_cols = [c for c in df.columns if c not in base_cols]
         logger.info("Preprocessing dataframes...")
-        processed, *_ = _preprocess(
+        df, _ = _maybe_add_date_features(
             df=df,
             X_df=None,
+            features=date_features,
+            one_hot=date_features_to_one_hot,
+            freq=freq,
             h=0,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+        )
+        processed = _process_df(
+            df=df, id_col=id_col, time_col=time_col, target_col=target_col
+        )
+        if sort and processed.sort_idxs is not None:
+            df = ufp.drop_index_if_pandas(ufp.take_rows(df, processed.sort_idxs))
+            processed = processed._replace(sort_idxs=None)
+        return PreparedSeries(
+            df=df,
+            processed=processed,
             freq=freq,
-            date_features=False,
-            date_features_to_one_hot=False,
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
+            exog_cols=exog_cols,
+            date_features=date_features,
+            date_features_to_one_hot=date_features_to_one_hot,
+            date_feature_cols=[
+                c for c in df.columns if c not in base_cols and c not in exog_cols
+            ],
+            drop_id=drop_id,
         )
-        standard_freq = _standardize_freq(freq, processed)
-        _validate_input_size(processed, 1, 1)
-        logger.info("Calling Fine-tune Endpoint...")
-        payload = {
-            "series": {
-                "y": processed.data[:, 0],
-                "sizes": np.diff(processed.indptr),
-            },
-            "model": model,
-            "freq": standard_freq,
-            "finetune_steps": finetune_steps,
-            "finetune_depth": finetune_depth,
-            "finetune_loss": finetune_loss,
-            "output_model_id": output_model_id,
-            "finetuned_model_id": finetuned_model_id,
-        }
-        with self._make_client(**self._client_kwargs) as client:
-            resp = self._make_request_with_retries(client, "v2/finetune", payload)
+
+    def _prepare_or_check(
+        self,
+        df: Union[DataFrame, PreparedSeries],
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        date_features: Union[bool, Sequence[Union[str, Callable]]],
+        date_features_to_one_hot: Union[bool, list[str]],
+    ) -> PreparedSeries:
+        if isinstance(df, PreparedSeries):
+            _check_prepared(df, freq, date_features, date_features_to_one_hot)
+            return df
+        logger.info("Validating inputs...")
+        return self._prepare(
+            df=df,
+            freq=freq,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            date_features=date_features,
+            date_features_to_one_hot=date_features_to_one_hot,
+        )
+
+    def prepare(
+        self,
+        df: DataFrame,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        date_features: Union[bool, list[Union[str, Callable]]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+    ) -> PreparedSeries:
+        """Validate and preprocess the series once, to use them in several calls.
+
+        The returned `PreparedSeries` can be passed as `df` to `forecast`,
+        `detect_anomalies`, `detect_anomalies_online`, `cross_validation` and
+        `finetune`, which then only build the payloads and call the API. The
+        calls use the frequency, columns and date features of the prepared
+        series.
+
+        Args:
+            df (pandas or polars DataFrame, LazyFrame or pyarrow Table): The
+                DataFrame with the series, with the same format as in
+                `forecast`. Exogenous features are kept, and they're selected
+                in every call as if `df` was passed.
+            freq (str, int or pandas offset, optional): Frequency of the
+                timestamps. If `None`, it will be inferred automatically.
+                Defaults to None.
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            date_features (bool or list[str] or callable, optional): Features
+                computed from the dates, as in `forecast`. They're computed
+                for the future timestamps in every call to `forecast`.
+                Defaults to False.
+            date_features_to_one_hot (bool or list[str]): Apply one-hot
+                encoding to these date features. Values that only appear in
+                the forecast horizon are ignored. Defaults to False.
+
+        Returns:
+            PreparedSeries: Validated series, sorted by id and time.
+        """
+        if _is_arrow_data(df):
+            df = _arrow_to_polars(df, id_col)
+        if isinstance(df, pl_LazyFrame):
+            df = df.collect()
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+            raise ValueError(
+                "prepare only supports pandas and polars DataFrames and pyarrow "
+                f"Tables, got {type(df).__name__}."
+            )
+        logger.info("Validating inputs...")
+        prepared = self._prepare(
+            df=df,
+            freq=freq,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            date_features=date_features,
+            date_features_to_one_hot=date_features_to_one_hot,
+            sort=True,
+        )
+        for arr in (prepared.processed.data, prepared.processed.indptr):
+            arr.flags.writeable = False
+        return prepared
+
+    def _finetune(
+        self,
+        df: DataFrame,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        output_model_id: Optional[str],
+        finetuned_model_id: Optional[str],
+        model: _Model,
+    ) -> _Steps[str]:
+        if isinstance(df, pl_LazyFrame):
+            df, freq = yield from self._collect_lazy_steps(
+                df, freq=freq, id_col=id_col, time_col=time_col, target_col=target_col
+            )
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame, PreparedSeries)):
+            raise ValueError("Can only fine-tune on pandas or polars dataframes.")
+        model = self._maybe_override_model(model)
+        yield from self._validate_model(model, validate_api_key=False)
+        prepared = self._prepare_or_check(
+            df=df,
+            freq=freq,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            date_features=False,
+            date_features_to_one_hot=False,
+        )
+        processed = prepared.processed
+        standard_freq = _standardize_freq(prepared.freq, processed)
+        _validate_input_size(processed, 1, 1)
+        logger.info("Calling Fine-tune Endpoint...")
+        payload = {
+            "series": {
+                "y": processed.data[:, 0],
+                "sizes": np.diff(processed.indptr),
+            },
+            "model": model,
+            "freq": standard_freq,
+            "finetune_steps": finetune_steps,
+            "finetune_depth": finetune_depth,
+            "finetune_loss": finetune_loss,
+            "output_model_id": output_model_id,
+            "finetuned_model_id": finetuned_model_id,
+        }
+        [resp] = yield [_ApiCall("v2/finetune", payload, auto_partition=False)]
         return resp["finetuned_model_id"]
 
+    def finetune(
+        self,
+        df: DataFrame,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        finetune_steps: _NonNegativeInt = 10,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        output_model_id: Optional[str] = None,
+        finetuned_model_id: Optional[str] = None,
+        model: _Model = "timegpt-1",
+    ) -> str:
+        """Fine-tune TimeGPT to your series.
+
+        Args:
+            df (pandas or polars DataFrame or LazyFrame):
+                The DataFrame on which the function will operate. Expected
+                to contain at least the following columns:
+                - time_col:
+                    Column name in `df` that contains the time indices of
+                    the time series. This is typically a datetime column with
+                    regular intervals, e.g., hourly, daily, monthly data
+                    points.
+                - target_col:
+                    Column name in `df` that contains the target variable of
+                    the time series, i.e., the variable we wish to predict
+                    or analyze.
+                Additionally, you can pass multiple time series (stacked in
+                the dataframe) considering an additional column:
+                - id_col:
+                    Column name in `df` that identifies unique time series.
+                    Each unique value in this column corresponds to a unique
+                    time series.
+            freq (str, int, pandas offset, optional): Frequency of the
+                timestamps.  If `None`, it will be inferred automatically.
+                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+                Defaults to None.
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            finetune_steps (int): Number of steps used to finetune learning
+                TimeGPT in the new data. Defaults to 10.
+            finetune_depth (int): The depth of the finetuning. Uses a scale
+                from 1 to 5, where 1 means little finetuning, and 5 means that
+                the entire model is finetuned. Defaults to 1.
+            finetune_loss (str): Loss function to use for finetuning. Options
+                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
+                Defaults to 'default'.
+            output_model_id (str, optional): ID to assign to the fine-tuned model.
+                If `None`, an UUID is used. Defaults to None.
+            finetuned_model_id (str, optional): ID of previously fine-tuned
+                model to use as base. Defaults to None.
+            model (str):
+                Model to use as a string. Options are: `timegpt-1`, and
+                `timegpt-1-long-horizon`. We recommend using
+                `timegpt-1-long-horizon` for forecasting if you want to
+                predict more than one seasonal period given the frequency
+                of your data. Defaults to 'timegpt-1'.
+
+        Returns:
+            str: ID of the fine-tuned model.
+        """
+        return self._run(
+            self._finetune(
+                df=df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                output_model_id=output_model_id,
+                finetuned_model_id=finetuned_model_id,
+                model=model,
+            )
+        )
+
     @overload
     def finetuned_models(self, as_df: Literal[False]) -> list[FinetunedModel]:
         """
@@ -1374,8 +4839,7 @@ class NixtlaClient:
         Returns:
             List of FinetunedModel or pd.DataFrame: List of available fine-tuned models.
         """
-        with self._make_client(**self._client_kwargs) as client:
-            resp_body = self._get_request(client, "/v2/finetuned_models")
+        resp_body = self._get_request(self._get_client(), "/v2/finetuned_models")
         models = [FinetunedModel(**m) for m in resp_body["finetuned_models"]]
         if as_df:
             models = pd.DataFrame([m.model_dump() for m in models])
@@ -1391,10 +4855,9 @@ class NixtlaClient:
         Returns:
             FinetunedModel: Fine-tuned model metadata.
         """
-        with self._make_client(**self._client_kwargs) as client:
-            resp_body = self._get_request(
-                client, f"/v2/finetuned_models/{finetuned_model_id}"
-            )
+        resp_body = self._get_request(
+            self._get_client(), f"/v2/finetuned_models/{finetuned_model_id}"
+        )
         return FinetunedModel(**resp_body)
 
     def delete_finetuned_model(self, finetuned_model_id: str) -> bool:
@@ -1406,11 +4869,10 @@ class NixtlaClient:
         Returns:
             bool: Whether delete was successful.
         """
-        with self._make_client(**self._client_kwargs) as client:
-            resp = client.delete(
-                f"/v2/finetuned_models/{finetuned_model_id}",
-                headers={"accept-encoding": "identity"},
-            )
+        resp = self._get_client().delete(
+            f"/v2/finetuned_models/{finetuned_model_id}",
+            headers={"accept-encoding": "identity"},
+        )
         return resp.status_code == 204
 
     def _distributed_forecast(
@@ -1439,9 +4901,11 @@ class NixtlaClient:
         feature_contributions: bool,
         model_parameters: _ExtraParamDataType,
         multivariate: bool,
+        history_window: Optional[_PositiveInt],
     ) -> DistributedDFType:
         import fugue.api as fa
 
+        self._prefetch_model_params(model, freq)
         schema, partition_config = _distributed_setup(
             df=df,
             method="forecast",
@@ -1500,135 +4964,71 @@ class NixtlaClient:
                 feature_contributions=feature_contributions,
                 model_parameters=model_parameters,
                 multivariate=multivariate,
+                history_window=history_window,
             ),
             partition=partition_config,
             as_fugue=True,
         )
         return fa.get_native_as_df(result_df)
 
-    def forecast(
+    def _forecast(
         self,
         df: AnyDFType,
         h: _PositiveInt,
-        freq: Optional[_Freq] = None,
-        id_col: str = "unique_id",
-        time_col: str = "ds",
-        target_col: str = "y",
-        X_df: Optional[AnyDFType] = None,
-        level: Optional[list[Union[int, float]]] = None,
-        quantiles: Optional[list[float]] = None,
-        finetune_steps: _NonNegativeInt = 0,
-        finetune_depth: _FinetuneDepth = 1,
-        finetune_loss: _Loss = "default",
-        finetuned_model_id: Optional[str] = None,
-        clean_ex_first: bool = True,
-        hist_exog_list: Optional[list[str]] = None,
-        validate_api_key: bool = False,
-        add_history: bool = False,
-        date_features: Union[bool, list[Union[str, Callable]]] = False,
-        date_features_to_one_hot: Union[bool, list[str]] = False,
-        model: _Model = "timegpt-1",
-        num_partitions: Optional[_PositiveInt] = None,
-        feature_contributions: bool = False,
-        model_parameters: _ExtraParamDataType = None,
-        multivariate: bool = False,
-    ) -> AnyDFType:
-        """Forecast your time series using TimeGPT.
-
-        Args:
-            df (pandas or polars DataFrame): The DataFrame on which the
-                function will operate. Expected to contain at least the
-                following columns:
-                - time_col:
-                    Column name in `df` that contains the time indices of
-                    the time series. This is typically a datetime column
-                    with regular intervals, e.g., hourly, daily, monthly
-                    data points.
-                - target_col:
-                    Column name in `df` that contains the target variable of
-                    the time series, i.e., the variable we wish to predict
-                    or analyze.
-                Additionally, you can pass multiple time series (stacked in
-                    the dataframe) considering an additional column:
-                - id_col:
-                    Column name in `df` that identifies unique time series.
-                    Each unique value in this column corresponds to a unique
-                    time series.
-            h (int): Forecast horizon.
-            freq (str, int or pandas offset, optional): Frequency of the
-                timestamps. If `None`, it will be inferred automatically.
-                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-                Defaults to None.
-            id_col (str): Column that identifies each series. Defaults to
-                'unique_id'.
-            time_col (str): Column that identifies each timestep, its values
-                can be timestamps or integers. Defaults to 'ds'.
-            target_col (str): Column that contains the target. Defaults to 'y'.
-            X_df (pandas or polars DataFrame, optional):
-                DataFrame with [`unique_id`, `ds`] columns and `df`'s future
-                exogenous. Defaults to None.
-            level (list[float], optional): Confidence levels between 0 and 100
-                for prediction intervals. Defaults to None.
-            quantiles (list[float], optional): Quantiles to forecast, list
-                between (0, 1). `level` and `quantiles` should not be
-                used simultaneously. The output dataframe will have
-                the quantile columns formatted as TimeGPT-q-(100 * q) for each
-                q. 100 * q represents percentiles but we choose this notation
-                to avoid having dots in column names. Defaults to None.
-            finetune_steps (int): Number of steps used to finetune learning
-                TimeGPT in the new data. Defaults to 0.
-            finetune_depth (int): The depth of the finetuning. Uses a scale
-                from 1 to 5, where 1 means little finetuning, and 5 means that
-                the entire model is finetuned. Defaults to 1.
-            finetune_loss (str): Loss function to use for finetuning. Options
-                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
-                Defaults to 'default'.
-            finetuned_model_id (str, optional): ID of previously fine-tuned model
-                to use. Defaults to None.
-            clean_ex_first (bool): Clean exogenous signal before making
-                forecasts using TimeGPT. Defaults to True.
-            hist_exog_list (list[str], optional): Column names of the
-                historical exogenous features. Defaults to None.
-            validate_api_key (bool):
-                If True, validates api_key before sending requests. Defaults
-                to False.
-            add_history (bool): Return fitted values of the model. Defaults
-                to False.
-            date_features (bool or list[str] or callable, optional): Features
-                computed from the dates. Can be pandas date attributes
-                or functions that will take the dates as input. If True
-                automatically adds most used date features for the
-                frequency of `df`. Defaults to False.
-            date_features_to_one_hot (bool or list[str]): Apply one-hot
-                encoding to these date features. If
-                `date_features=True`, then all date features are
-                one-hot encoded by default. Defaults to False.
-            model (str): Model to use as a string. Options are: `timegpt-1`,
-                and `timegpt-1-long-horizon`. We recommend using
-                `timegpt-1-long-horizon` for forecasting if you want to
-                predict more than one seasonal period given the frequency of
-                your data. Defaults to 'timegpt-1'.
-            num_partitions (int):
-                Number of partitions to use. If None, the number of partitions
-                will be equal to the available parallel resources in
-                distributed environments. Defaults to None.
-            feature_contributions (bool): Compute SHAP values.
-                Gives access to computed SHAP values to explain the impact
-                of features on the final predictions. Defaults to False.
-            model_parameters (dict): The dictionary settings that determine
-                the behavior of the model. Default is None
-            multivariate (bool): If True, enables multivariate predictions.
-                Defaults to False. Note: multivariate predictions are only
-                supported for a select set of TimeGPT models. 
-
-        Returns:
-            pandas, polars, dask or spark DataFrame or ray Dataset:
-                DataFrame with TimeGPT forecasts for point predictions and
-                probabilistic predictions (if level is not None).
-        """
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        X_df: Optional[AnyDFType],
+        level: Optional[list[Union[int, float]]],
+        quantiles: Optional[list[float]],
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        finetuned_model_id: Optional[str],
+        clean_ex_first: bool,
+        hist_exog_list: Optional[list[str]],
+        validate_api_key: bool,
+        add_history: bool,
+        date_features: Union[bool, list[Union[str, Callable]]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        num_partitions: Optional[_PositiveInt],
+        feature_contributions: bool,
+        model_parameters: _ExtraParamDataType,
+        multivariate: bool,
+        history_window: Optional[_PositiveInt] = None,
+    ) -> _Steps[AnyDFType]:
         extra_param_checker.validate_python(model_parameters)
-
-        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+        if history_window is not None and not add_history:
+            raise ValueError("`history_window` requires `add_history=True`.")
+
+        arrow_output = _is_arrow_data(df)
+        if arrow_output:
+            df = _arrow_to_polars(df, id_col)
+        if _is_arrow_data(X_df):
+            X_df = _arrow_to_polars(X_df, id_col)
+        if isinstance(df, pl_LazyFrame):
+            restrict_input = (
+                finetune_steps == 0
+                and X_df is None
+                and not add_history
+                and not date_features
+            )
+            df, freq = yield from self._collect_lazy_steps(
+                df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                model=model,
+                restrict_input=restrict_input,
+                level=level or quantiles,
+                h=h,
+            )
+        if isinstance(X_df, pl_LazyFrame):
+            X_df = X_df.collect()
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame, PreparedSeries)):
             return self._distributed_forecast(
                 df=df,
                 h=h,
@@ -1654,48 +5054,65 @@ class NixtlaClient:
                 feature_contributions=feature_contributions,
                 model_parameters=model_parameters,
                 multivariate=multivariate,
+                history_window=history_window,
             )
-        self.__dict__.pop("weights_x", None)
-        self.__dict__.pop("feature_contributions", None)
+        self._clear_outputs("weights_x", "feature_contributions")
+        self.used_fallback = False
         model = self._maybe_override_model(model)
-        logger.info("Validating inputs...")
-        df, X_df, drop_id, freq = self._run_validations(
-            df=df,
-            X_df=X_df,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            validate_api_key=validate_api_key,
-            model=model,
-            freq=freq,
-        )
-        df, X_df = _validate_exog(
-            df=df,
-            X_df=X_df,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            hist_exog=hist_exog_list,
-        )
+        if isinstance(df, PreparedSeries):
+            _check_prepared(df, freq, date_features, date_features_to_one_hot)
+            yield from self._validate_model(model, validate_api_key)
+            processed, X_future, x_cols, futr_cols = _prepared_forecast_inputs(
+                prepared=df, X_df=X_df, h=h, hist_exog_list=hist_exog_list
+            )
+            id_col, time_col, target_col = df.id_col, df.time_col, df.target_col
+            df, drop_id, freq = df.df, df.drop_id, df.freq
+        else:
+            logger.info("Validating inputs...")
+            df, X_df, drop_id, freq = yield from self._run_validations(
+                df=df,
+                X_df=X_df,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                validate_api_key=validate_api_key,
+                model=model,
+                freq=freq,
+            )
+            df, X_df = _validate_exog(
+                df=df,
+                X_df=X_df,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                hist_exog=hist_exog_list,
+            )
+            logger.info("Preprocessing dataframes...")
+            processed, X_future, x_cols, futr_cols = _preprocess(
+                df=df,
+                X_df=X_df,
+                h=h,
+                freq=freq,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+            )
         level, quantiles = _prepare_level_and_quantiles(level, quantiles)
-
-        logger.info("Preprocessing dataframes...")
-        processed, X_future, x_cols, futr_cols = _preprocess(
-            df=df,
-            X_df=X_df,
-            h=h,
-            freq=freq,
-            date_features=date_features,
-            date_features_to_one_hot=date_features_to_one_hot,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-        )
         standard_freq = _standardize_freq(freq, processed)
-        model_input_size, model_horizon = self._get_model_params(model, standard_freq)
+        fallback_error: Optional[CircuitOpenError] = None
+        try:
+            model_input_size, model_horizon = yield from self._model_params_steps(
+                model, standard_freq
+            )
+        except CircuitOpenError as e:
+            # the rest of the checks are about the model, so we skip them
+            fallback_error = e
+            model_input_size, model_horizon = 0, h
         if finetune_steps > 0:
             _validate_input_size(processed, 1, 1)
-        if add_history:
+        if add_history and fallback_error is None:
             _validate_input_size(processed, model_input_size, model_horizon)
         if h > model_horizon:
             logger.warning(
@@ -1703,7 +5120,14 @@ class NixtlaClient:
                 "this may lead to less accurate forecasts. "
                 "Please consider using a smaller horizon."
             )
-        restrict_input = finetune_steps == 0 and not x_cols and not add_history
+        # the fitted values use the whole history, or the last points that
+        # the model needs to compute the last `history_window` of them
+        full_processed = history = processed
+        if add_history and history_window is not None and fallback_error is None:
+            history = _tail(
+                processed, model_input_size + model_horizon + history_window
+            )
+        restrict_input = finetune_steps == 0 and not x_cols and fallback_error is None
         if restrict_input:
             logger.info("Restricting input...")
             new_input_size = _restrict_input_samples(
@@ -1745,33 +5169,55 @@ class NixtlaClient:
         if model_parameters is not None:
             payload.update({"model_parameters": model_parameters})
 
-        with self._make_client(**self._client_kwargs) as client:
-            insample_feat_contributions = None
-            if num_partitions is None:
-                resp = self._make_request_with_retries(client, "v2/forecast", payload)
-                if add_history:
-                    in_sample_payload = _forecast_payload_to_in_sample(payload)
-                    logger.info("Calling Historical Forecast Endpoint...")
-                    in_sample_resp = self._make_request_with_retries(
-                        client, "v2/historic_forecast", in_sample_payload
-                    )
-                    insample_feat_contributions = in_sample_resp.get(
-                        "feature_contributions", None
-                    )
-            else:
-                payloads = _partition_series(payload, num_partitions, h)
-                resp = self._make_partitioned_requests(client, "v2/forecast", payloads)
-                if add_history:
-                    in_sample_payloads = [
-                        _forecast_payload_to_in_sample(p) for p in payloads
-                    ]
-                    logger.info("Calling Historical Forecast Endpoint...")
-                    in_sample_resp = self._make_partitioned_requests(
-                        client, "v2/historic_forecast", in_sample_payloads
-                    )
-                    insample_feat_contributions = in_sample_resp.get(
-                        "feature_contributions", None
-                    )
+        auto_partition = not multivariate and not finetune_steps
+        calls = [
+            _ApiCall(
+                "v2/forecast",
+                payload,
+                num_partitions,
+                h,
+                auto_partition=auto_partition,
+            )
+        ]
+        if add_history:
+            in_sample_payload = _forecast_payload_to_in_sample(payload)
+            in_sample_payload["series"] = {
+                **in_sample_payload["series"],
+                "y": history.data[:, 0],
+                "sizes": np.diff(history.indptr),
+                "X": history.data[:, 1:].T if history.data.shape[1] > 1 else None,
+            }
+            logger.info("Calling Historical Forecast Endpoint...")
+            calls.append(
+                _ApiCall(
+                    "v2/historic_forecast",
+                    in_sample_payload,
+                    num_partitions,
+                    auto_partition=auto_partition,
+                )
+            )
+        if fallback_error is None:
+            try:
+                resp, *in_sample_resps = yield calls
+            except CircuitOpenError as e:
+                fallback_error = e
+        if fallback_error is not None:
+            resp, in_sample_resp = self._fallback_responses(
+                fallback_error,
+                processed=history if add_history else processed,
+                h=h,
+                freq=standard_freq,
+                level=level,
+            )
+            in_sample_resps = [in_sample_resp]
+        insample_feat_contributions = None
+        if add_history:
+            in_sample_resp = in_sample_resps[0]
+            if history_window is not None:
+                in_sample_resp = _in_sample_tails(in_sample_resp, history_window)
+            insample_feat_contributions = in_sample_resp.get(
+                "feature_contributions", None
+            )
 
         # assemble result
         out = ufp.make_future_dataframe(
@@ -1788,7 +5234,7 @@ class NixtlaClient:
             in_sample_df = _parse_in_sample_output(
                 in_sample_output=in_sample_resp,
                 df=df,
-                processed=processed,
+                processed=full_processed,
                 id_col=id_col,
                 time_col=time_col,
                 target_col=target_col,
@@ -1810,109 +5256,77 @@ class NixtlaClient:
             if sort_idxs is not None:
                 out = ufp.take_rows(out, sort_idxs)
                 out = ufp.drop_index_if_pandas(out)
-                if hasattr(self, "feature_contributions"):
-                    self.feature_contributions = ufp.take_rows(
-                        self.feature_contributions, sort_idxs
-                    )
-                    self.feature_contributions = ufp.drop_index_if_pandas(
-                        self.feature_contributions
+                contributions = self._get_output("feature_contributions")
+                if contributions is not None:
+                    contributions = ufp.take_rows(contributions, sort_idxs)
+                    self._set_output(
+                        "feature_contributions",
+                        ufp.drop_index_if_pandas(contributions),
                     )
+        out = self._drop_missing_series(out, processed.uids, id_col)
         out = _maybe_drop_id(df=out, id_col=id_col, drop=drop_id)
         self._maybe_assign_weights(weights=resp["weights_x"], df=df, x_cols=x_cols)
+        if arrow_output:
+            out = _polars_to_arrow(out, id_col)
         return out
 
-    def _distributed_detect_anomalies(
-        self,
-        df: DistributedDFType,
-        freq: Optional[_Freq],
-        id_col: str,
-        time_col: str,
-        target_col: str,
-        level: Union[int, float],
-        finetuned_model_id: Optional[str],
-        clean_ex_first: bool,
-        validate_api_key: bool,
-        date_features: Union[bool, list[str]],
-        date_features_to_one_hot: Union[bool, list[str]],
-        model: _Model,
-        num_partitions: Optional[int],
-        multivariate: bool,
-    ) -> DistributedDFType:
-        import fugue.api as fa
-
-        schema, partition_config = _distributed_setup(
-            df=df,
-            method="detect_anomalies",
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            level=level,
-            quantiles=None,
-            num_partitions=num_partitions,
-        )
-        result_df = fa.transform(
-            df,
-            using=_detect_anomalies_wrapper,
-            schema=schema,
-            params=dict(
-                client=self,
-                freq=freq,
-                id_col=id_col,
-                time_col=time_col,
-                target_col=target_col,
-                level=level,
-                finetuned_model_id=finetuned_model_id,
-                clean_ex_first=clean_ex_first,
-                validate_api_key=validate_api_key,
-                date_features=date_features,
-                date_features_to_one_hot=date_features_to_one_hot,
-                model=model,
-                num_partitions=None,
-                multivariate=multivariate,
-            ),
-            partition=partition_config,
-            as_fugue=True,
-        )
-        return fa.get_native_as_df(result_df)
-
-    def detect_anomalies(
+    def forecast(
         self,
         df: AnyDFType,
+        h: _PositiveInt,
         freq: Optional[_Freq] = None,
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
-        level: Union[int, float] = 99,
+        X_df: Optional[AnyDFType] = None,
+        level: Optional[list[Union[int, float]]] = None,
+        quantiles: Optional[list[float]] = None,
+        finetune_steps: _NonNegativeInt = 0,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
         finetuned_model_id: Optional[str] = None,
         clean_ex_first: bool = True,
+        hist_exog_list: Optional[list[str]] = None,
         validate_api_key: bool = False,
-        date_features: Union[bool, list[str]] = False,
+        add_history: bool = False,
+        date_features: Union[bool, list[Union[str, Callable]]] = False,
         date_features_to_one_hot: Union[bool, list[str]] = False,
         model: _Model = "timegpt-1",
         num_partitions: Optional[_PositiveInt] = None,
+        feature_contributions: bool = False,
+        model_parameters: _ExtraParamDataType = None,
         multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+        history_window: Optional[_PositiveInt] = None,
     ) -> AnyDFType:
-        """Detect anomalies in your time series using TimeGPT.
+        """Forecast your time series using TimeGPT.
 
         Args:
-            df (pandas or polars DataFrame): The DataFrame on which the
-                function will operate. Expected to contain at least the
-                following columns:
+            df (pandas or polars DataFrame, LazyFrame or pyarrow Table):
+                The DataFrame on which the function will operate. Expected
+                to contain at least the following columns:
                 - time_col:
-                    Column name in `df` that contains the time indices of the
-                    time series. This is typically a datetime column with
-                    regular intervals, e.g., hourly, daily, monthly data points.
+                    Column name in `df` that contains the time indices of
+                    the time series. This is typically a datetime column
+                    with regular intervals, e.g., hourly, daily, monthly
+                    data points.
                 - target_col:
                     Column name in `df` that contains the target variable of
                     the time series, i.e., the variable we wish to predict
                     or analyze.
                 Additionally, you can pass multiple time series (stacked in
-                the dataframe) considering an additional column:
+                    the dataframe) considering an additional column:
                 - id_col:
                     Column name in `df` that identifies unique time series.
-                    Each unique value in this column corresponds to a unique time series.
-            freq (str, int, pandas offset, optional): Frequency of the
-                timestamps.  If `None`, it will be inferred automatically.
+                    Each unique value in this column corresponds to a unique
+                    time series.
+                pyarrow Tables and RecordBatchReaders are processed with
+                polars, which shares their memory, and the output is a pyarrow
+                Table.
+            h (int): Forecast horizon.
+            freq (str, int or pandas offset, optional): Frequency of the
+                timestamps. If `None`, it will be inferred automatically.
                 See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
                 Defaults to None.
             id_col (str): Column that identifies each series. Defaults to
@@ -1920,160 +5334,138 @@ class NixtlaClient:
             time_col (str): Column that identifies each timestep, its values
                 can be timestamps or integers. Defaults to 'ds'.
             target_col (str): Column that contains the target. Defaults to 'y'.
-            level (float): Confidence level between 0 and 100 for detecting
-                the anomalies. Defaults to 99.
-            finetuned_model_id (str, optional): ID of previously fine-tuned
-                model to use. Defaults to None.
-            clean_ex_first (bool): Clean exogenous signal before making
-                forecasts using TimeGPT. Defaults to True.
-            validate_api_key (bool):
-                If True, validates api_key before sending requests. Defaults
-                to False.
-            date_features (bool or list[str] or callable, optional): Features
-                computed from the dates. Can be pandas date attributes or
-                functions that will take the dates as input. If True
-                automatically adds most used date features for the frequency
-                of `df`. Defaults to False.
-            date_features_to_one_hot (bool or list[str]): Apply one-hot
-                encoding to these date features. If
-                `date_features=True`, then all date features are
-                one-hot encoded by default. Defaults to False.
-            model (str): str (default='timegpt-1')
-                Model to use as a string. Options are: `timegpt-1`, and
-                `timegpt-1-long-horizon`. We recommend using
-                `timegpt-1-long-horizon` for forecasting if you want to predict
-                more than one seasonal period given the frequency of your data.
-                Defaults to 'timegpt-1'.
-            num_partitions (int): Number of partitions to use. If None, the
-                number of partitions will be equal to the available parallel
-                resources in distributed environments. Defaults to None.
+            X_df (pandas or polars DataFrame or pyarrow Table, optional):
+                DataFrame with [`unique_id`, `ds`] columns and `df`'s future
+                exogenous. Defaults to None.
+            level (list[float], optional): Confidence levels between 0 and 100
+                for prediction intervals. Defaults to None.
+            quantiles (list[float], optional): Quantiles to forecast, list
+                between (0, 1). `level` and `quantiles` should not be
+                used simultaneously. The output dataframe will have
+                the quantile columns formatted as TimeGPT-q-(100 * q) for each
+                q. 100 * q represents percentiles but we choose this notation
+                to avoid having dots in column names. Defaults to None.
+            finetune_steps (int): Number of steps used to finetune learning
+                TimeGPT in the new data. Defaults to 0.
+            finetune_depth (int): The depth of the finetuning. Uses a scale
+                from 1 to 5, where 1 means little finetuning, and 5 means that
+                the entire model is finetuned. Defaults to 1.
+            finetune_loss (str): Loss function to use for finetuning. Options
+                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
+                Defaults to 'default'.
+            finetuned_model_id (str, optional): ID of previously fine-tuned model
+                to use. Defaults to None.
+            clean_ex_first (bool): Clean exogenous signal before making
+                forecasts using TimeGPT. Defaults to True.
+            hist_exog_list (list[str], optional): Column names of the
+                historical exogenous features. Defaults to None.
+            validate_api_key (bool):
+                If True, validates api_key before sending requests. Defaults
+                to False.
+            add_history (bool): Return fitted values of the model. Defaults
+                to False.
+            date_features (bool or list[str] or callable, optional): Features
+                computed from the dates. Can be pandas date attributes
+                or functions that will take the dates as input. If True
+                automatically adds most used date features for the
+                frequency of `df`. Defaults to False.
+            date_features_to_one_hot (bool or list[str]): Apply one-hot
+                encoding to these date features. If
+                `date_features=True`, then all date features are
+                one-hot encoded by default. Defaults to False.
+            model (str): Model to use as a string. Options are: `timegpt-1`,
+                and `timegpt-1-long-horizon`. We recommend using
+                `timegpt-1-long-horizon` for forecasting if you want to
+                predict more than one seasonal period given the frequency of
+                your data. Defaults to 'timegpt-1'.
+            num_partitions (int):
+                Number of partitions to use. If None, the number of partitions
+                will be equal to the available parallel resources in
+                distributed environments. Defaults to None.
+            feature_contributions (bool): Compute SHAP values.
+                Gives access to computed SHAP values to explain the impact
+                of features on the final predictions. Defaults to False.
+            model_parameters (dict): The dictionary settings that determine
+                the behavior of the model. Default is None
             multivariate (bool): If True, enables multivariate predictions.
                 Defaults to False. Note: multivariate predictions are only
                 supported for a select set of TimeGPT models. 
+            timeout_total (float, optional): Maximum time in seconds for the
+                whole call, including the retries and all the partitions. The
+                requests in flight when it expires are abandoned and the
+                pending ones aren't sent. Only applies to pandas and polars
+                DataFrames. If None, there's no limit. Defaults to None.
+            on_timeout (str): What to do when `timeout_total` expires. 'raise'
+                raises a `TimeoutError`. 'partial' returns the results of the
+                partitions (see `num_partitions`) that completed and sets the
+                ids of the remaining series in the client's `missing_series`
+                attribute, or raises if none completed. Defaults to 'raise'.
+            history_window (int, optional): Number of fitted values to return
+                for each series when `add_history=True`. Only the last
+                observations that the model needs to compute them are sent.
+                If None, returns the fitted values of the whole history.
+                Defaults to None.
 
         Returns:
-            pandas, polars, dask or spark DataFrame or ray Dataset:
-                DataFrame with anomalies flagged by TimeGPT.
+            pandas, polars, dask or spark DataFrame, ray Dataset or pyarrow Table:
+                DataFrame with TimeGPT forecasts for point predictions and
+                probabilistic predictions (if level is not None).
         """
-        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
-            return self._distributed_detect_anomalies(
+        return self._run(
+            self._forecast(
                 df=df,
+                h=h,
                 freq=freq,
                 id_col=id_col,
                 time_col=time_col,
                 target_col=target_col,
+                X_df=X_df,
                 level=level,
+                quantiles=quantiles,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
                 finetuned_model_id=finetuned_model_id,
                 clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
                 validate_api_key=validate_api_key,
+                add_history=add_history,
                 date_features=date_features,
                 date_features_to_one_hot=date_features_to_one_hot,
                 model=model,
                 num_partitions=num_partitions,
+                feature_contributions=feature_contributions,
+                model_parameters=model_parameters,
                 multivariate=multivariate,
-            )
-        self.__dict__.pop("weights_x", None)
-        model = self._maybe_override_model(model)
-        logger.info("Validating inputs...")
-        df, _, drop_id, freq = self._run_validations(
-            df=df,
-            X_df=None,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            validate_api_key=validate_api_key,
-            model=model,
-            freq=freq,
-        )
-
-        logger.info("Preprocessing dataframes...")
-        processed, _, x_cols, _ = _preprocess(
-            df=df,
-            X_df=None,
-            h=0,
-            freq=freq,
-            date_features=date_features,
-            date_features_to_one_hot=date_features_to_one_hot,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-        )
-        standard_freq = _standardize_freq(freq, processed)
-        model_input_size, model_horizon = self._get_model_params(model, standard_freq)
-        if processed.data.shape[1] > 1:
-            X = processed.data[:, 1:].T
-            logger.info(f"Using the following exogenous features: {x_cols}")
-        else:
-            X = None
-
-        logger.info("Calling Anomaly Detector Endpoint...")
-        payload = {
-            "series": {
-                "y": processed.data[:, 0],
-                "sizes": np.diff(processed.indptr),
-                "X": X,
-            },
-            "model": model,
-            "freq": standard_freq,
-            "finetuned_model_id": finetuned_model_id,
-            "clean_ex_first": clean_ex_first,
-            "level": level,
-            "multivariate": multivariate,
-        }
-        with self._make_client(**self._client_kwargs) as client:
-            if num_partitions is None:
-                resp = self._make_request_with_retries(
-                    client, "v2/anomaly_detection", payload
-                )
-            else:
-                payloads = _partition_series(payload, num_partitions, h=0)
-                resp = self._make_partitioned_requests(
-                    client, "v2/anomaly_detection", payloads
-                )
-
-        # assemble result
-        out = _parse_in_sample_output(
-            in_sample_output=resp,
-            df=df,
-            processed=processed,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
+                history_window=history_window,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
         )
-        out = ufp.assign_columns(out, "anomaly", resp["anomaly"])
-        out = _maybe_drop_id(df=out, id_col=id_col, drop=drop_id)
-        self._maybe_assign_weights(weights=resp["weights_x"], df=df, x_cols=x_cols)
-        return out
 
-    def _distributed_detect_anomalies_online(
+    def _distributed_detect_anomalies(
         self,
         df: DistributedDFType,
-        h: _PositiveInt,
-        detection_size: _PositiveInt,
-        threshold_method: _ThresholdMethod,
         freq: Optional[_Freq],
         id_col: str,
         time_col: str,
         target_col: str,
         level: Union[int, float],
+        finetuned_model_id: Optional[str],
         clean_ex_first: bool,
-        step_size: Optional[_PositiveInt],
-        finetune_steps: _NonNegativeInt,
-        finetune_depth: _FinetuneDepth,
-        finetune_loss: _Loss,
-        hist_exog_list: Optional[list[str]],
+        validate_api_key: bool,
         date_features: Union[bool, list[str]],
         date_features_to_one_hot: Union[bool, list[str]],
         model: _Model,
-        refit: bool,
         num_partitions: Optional[int],
         multivariate: bool,
     ) -> DistributedDFType:
         import fugue.api as fa
 
+        self._prefetch_model_params(model, freq)
         schema, partition_config = _distributed_setup(
             df=df,
-            method="detect_anomalies_online",
+            method="detect_anomalies",
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
@@ -2083,28 +5475,21 @@ class NixtlaClient:
         )
         result_df = fa.transform(
             df,
-            using=_detect_anomalies_online_wrapper,
+            using=_detect_anomalies_wrapper,
             schema=schema,
             params=dict(
                 client=self,
-                h=h,
-                detection_size=detection_size,
-                threshold_method=threshold_method,
                 freq=freq,
                 id_col=id_col,
                 time_col=time_col,
                 target_col=target_col,
                 level=level,
+                finetuned_model_id=finetuned_model_id,
                 clean_ex_first=clean_ex_first,
-                step_size=step_size,
-                finetune_steps=finetune_steps,
-                finetune_loss=finetune_loss,
-                finetune_depth=finetune_depth,
-                hist_exog_list=hist_exog_list,
+                validate_api_key=validate_api_key,
                 date_features=date_features,
                 date_features_to_one_hot=date_features_to_one_hot,
                 model=model,
-                refit=refit,
                 num_partitions=None,
                 multivariate=multivariate,
             ),
@@ -2113,119 +5498,329 @@ class NixtlaClient:
         )
         return fa.get_native_as_df(result_df)
 
-    def detect_anomalies_online(
+    def _detect_anomalies(
+        self,
+        df: AnyDFType,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        level: Union[int, float],
+        finetuned_model_id: Optional[str],
+        clean_ex_first: bool,
+        validate_api_key: bool,
+        date_features: Union[bool, list[str]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        num_partitions: Optional[_PositiveInt],
+        multivariate: bool,
+    ) -> _Steps[AnyDFType]:
+        arrow_output = _is_arrow_data(df)
+        if arrow_output:
+            df = _arrow_to_polars(df, id_col)
+        if isinstance(df, pl_LazyFrame):
+            df, freq = yield from self._collect_lazy_steps(
+                df, freq=freq, id_col=id_col, time_col=time_col, target_col=target_col
+            )
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame, PreparedSeries)):
+            return self._distributed_detect_anomalies(
+                df=df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                finetuned_model_id=finetuned_model_id,
+                clean_ex_first=clean_ex_first,
+                validate_api_key=validate_api_key,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                multivariate=multivariate,
+            )
+        self._clear_outputs("weights_x")
+        model = self._maybe_override_model(model)
+        yield from self._validate_model(model, validate_api_key)
+        prepared = self._prepare_or_check(
+            df=df,
+            freq=freq,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            date_features=date_features,
+            date_features_to_one_hot=date_features_to_one_hot,
+        )
+        df, processed, freq = prepared.df, prepared.processed, prepared.freq
+        id_col, time_col, target_col = (
+            prepared.id_col,
+            prepared.time_col,
+            prepared.target_col,
+        )
+        x_cols, drop_id = prepared.x_cols, prepared.drop_id
+        standard_freq = _standardize_freq(freq, processed)
+        model_input_size, model_horizon = yield from self._model_params_steps(
+            model, standard_freq
+        )
+        if processed.data.shape[1] > 1:
+            X = processed.data[:, 1:].T
+            logger.info(f"Using the following exogenous features: {x_cols}")
+        else:
+            X = None
+
+        logger.info("Calling Anomaly Detector Endpoint...")
+        payload = {
+            "series": {
+                "y": processed.data[:, 0],
+                "sizes": np.diff(processed.indptr),
+                "X": X,
+            },
+            "model": model,
+            "freq": standard_freq,
+            "finetuned_model_id": finetuned_model_id,
+            "clean_ex_first": clean_ex_first,
+            "level": level,
+            "multivariate": multivariate,
+        }
+        [resp] = yield [
+            _ApiCall(
+                "v2/anomaly_detection",
+                payload,
+                num_partitions,
+                auto_partition=not multivariate,
+            )
+        ]
+
+        # assemble result
+        out = _parse_in_sample_output(
+            in_sample_output=resp,
+            df=df,
+            processed=processed,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+        )
+        out = ufp.assign_columns(out, "anomaly", resp["anomaly"])
+        out = self._drop_missing_series(out, processed.uids, id_col)
+        out = _maybe_drop_id(df=out, id_col=id_col, drop=drop_id)
+        self._maybe_assign_weights(weights=resp["weights_x"], df=df, x_cols=x_cols)
+        if arrow_output:
+            out = _polars_to_arrow(out, id_col)
+        return out
+
+    def detect_anomalies(
         self,
         df: AnyDFType,
-        h: _PositiveInt,
-        detection_size: _PositiveInt,
-        threshold_method: _ThresholdMethod = "univariate",
         freq: Optional[_Freq] = None,
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
         level: Union[int, float] = 99,
+        finetuned_model_id: Optional[str] = None,
         clean_ex_first: bool = True,
-        step_size: Optional[_PositiveInt] = None,
-        finetune_steps: _NonNegativeInt = 0,
-        finetune_depth: _FinetuneDepth = 1,
-        finetune_loss: _Loss = "default",
-        hist_exog_list: Optional[list[str]] = None,
+        validate_api_key: bool = False,
         date_features: Union[bool, list[str]] = False,
         date_features_to_one_hot: Union[bool, list[str]] = False,
         model: _Model = "timegpt-1",
-        refit: bool = False,
         num_partitions: Optional[_PositiveInt] = None,
         multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
     ) -> AnyDFType:
-        """
-        Online anomaly detection in your time series using TimeGPT.
+        """Detect anomalies in your time series using TimeGPT.
 
         Args:
-            df (pandas or polars DataFrame):
+            df (pandas or polars DataFrame, LazyFrame or pyarrow Table):
                 The DataFrame on which the function will operate. Expected
                 to contain at least the following columns:
                 - time_col:
                     Column name in `df` that contains the time indices of the
                     time series. This is typically a datetime column with
-                    regular intervals, e.g., hourly, daily, monthly data
-                    points.
+                    regular intervals, e.g., hourly, daily, monthly data points.
                 - target_col:
                     Column name in `df` that contains the target variable of
-                    the time series, i.e., the variable we wish to predict or
-                    analyze.
+                    the time series, i.e., the variable we wish to predict
+                    or analyze.
+                Additionally, you can pass multiple time series (stacked in
+                the dataframe) considering an additional column:
                 - id_col:
                     Column name in `df` that identifies unique time series.
-                    Each unique value in this column corresponds to a unique
-                    time series.
-
-            h (int): Forecast horizon.
-            detection_size (int): The length of the sequence where anomalies
-                will be detected starting from the end of the dataset.
-            threshold_method (str, optional): The method used to calculate the
-                intervals for anomaly detection. Use `univariate` to flag
-                anomalies independently for each series in the dataset.
-                Use `multivariate` to have a global threshold across all series
-                in the dataset. For this method, all series must have the same
-                length. Defaults to 'univariate'.
-            freq (str, optional): Frequency of the data. By default, the freq
-                will be inferred automatically. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-            id_col (str, optional): Column that identifies each series.
-                Defaults to 'unique_id'
-            time_col (str, optional): Column that identifies each timestep,
-                its values can be timestamps or integers. Defaults to 'ds'.
-            target_col (str, optional): Column that contains the target.
-                Defaults to 'y'.
-            level (float, optional):
-                Confidence level between 0 and 100 for detecting the anomalies.
-                Defaults to 99.
-            clean_ex_first (bool, optional): Clean exogenous signal before
-                making forecasts using TimeGPT. Defaults to True.
-            step_size (int, optional): Step size between each cross validation
-                window. If None it will be equal to `h`. Defaults to None.
-            finetune_steps (int): Number of steps used to finetune TimeGPT in
-                the new data. Defaults to 0.
-            finetune_depth (int): The depth of the finetuning. Uses a scale
-                from 1 to 5, where 1 means little finetuning, and 5 means that
-                the entire model is finetuned. Defaults to 1.
-            finetune_loss (str): Loss function to use for finetuning.
-                Options are: `default`, `mae`, `mse`, `rmse`, `mape`, and
-                `smape`. Defaults to 'default'.
-            hist_exog_list (list[str], optional): Column names of the historical
-                exogenous features. Defaults to None.
+                    Each unique value in this column corresponds to a unique time series.
+                pyarrow Tables and RecordBatchReaders are processed with
+                polars, which shares their memory, and the output is a pyarrow
+                Table.
+            freq (str, int, pandas offset, optional): Frequency of the
+                timestamps.  If `None`, it will be inferred automatically.
+                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+                Defaults to None.
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            level (float): Confidence level between 0 and 100 for detecting
+                the anomalies. Defaults to 99.
+            finetuned_model_id (str, optional): ID of previously fine-tuned
+                model to use. Defaults to None.
+            clean_ex_first (bool): Clean exogenous signal before making
+                forecasts using TimeGPT. Defaults to True.
+            validate_api_key (bool):
+                If True, validates api_key before sending requests. Defaults
+                to False.
             date_features (bool or list[str] or callable, optional): Features
-                computed from the dates. Can be pandas date attributes
-                or functions that will take the dates as input. If True
-                automatically adds most used date features for the
-                frequency of `df`. Defaults to False.
+                computed from the dates. Can be pandas date attributes or
+                functions that will take the dates as input. If True
+                automatically adds most used date features for the frequency
+                of `df`. Defaults to False.
             date_features_to_one_hot (bool or list[str]): Apply one-hot
                 encoding to these date features. If
                 `date_features=True`, then all date features are
                 one-hot encoded by default. Defaults to False.
-            model (str, optional): Model to use as a string. Options are:
-                `timegpt-1`, and `timegpt-1-long-horizon`. We recommend using
-                `timegpt-1-long-horizon` for forecasting if you want to
-                predict more than one seasonal period given the frequency of
-                your data. Defaults to 'timegpt-1'.
-            refit (bool, optional): Fine-tune the model in each window. If
-                False, only fine-tunes on the first window. Only used if
-                finetune_steps > 0. Defaults to False.
-            num_partitions (int):
-                Number of partitions to use. If None, the number of partitions
-                will be equal to the available parallel resources in
-                distributed environments. Defaults to None.
+            model (str): str (default='timegpt-1')
+                Model to use as a string. Options are: `timegpt-1`, and
+                `timegpt-1-long-horizon`. We recommend using
+                `timegpt-1-long-horizon` for forecasting if you want to predict
+                more than one seasonal period given the frequency of your data.
+                Defaults to 'timegpt-1'.
+            num_partitions (int): Number of partitions to use. If None, the
+                number of partitions will be equal to the available parallel
+                resources in distributed environments. Defaults to None.
             multivariate (bool): If True, enables multivariate predictions.
                 Defaults to False. Note: multivariate predictions are only
-                supported for a select set of TimeGPT models. This variable 
-                is different from the `threshold_method` parameter. The latter
-                controls the method used for anomaly detection (univariate vs
-                multivariate) whereas `multivariate` determines how the model 
-                creates the predictions.
+                supported for a select set of TimeGPT models. 
+            timeout_total (float, optional): Maximum time in seconds for the
+                whole call, including the retries and all the partitions. The
+                requests in flight when it expires are abandoned and the
+                pending ones aren't sent. Only applies to pandas and polars
+                DataFrames. If None, there's no limit. Defaults to None.
+            on_timeout (str): What to do when `timeout_total` expires. 'raise'
+                raises a `TimeoutError`. 'partial' returns the results of the
+                partitions (see `num_partitions`) that completed and sets the
+                ids of the remaining series in the client's `missing_series`
+                attribute, or raises if none completed. Defaults to 'raise'.
 
         Returns:
-            pandas, polars, dask or spark DataFrame or ray Dataset:
+            pandas, polars, dask or spark DataFrame, ray Dataset or pyarrow Table:
                 DataFrame with anomalies flagged by TimeGPT.
         """
-        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+        return self._run(
+            self._detect_anomalies(
+                df=df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                finetuned_model_id=finetuned_model_id,
+                clean_ex_first=clean_ex_first,
+                validate_api_key=validate_api_key,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                multivariate=multivariate,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
+        )
+
+    def _distributed_detect_anomalies_online(
+        self,
+        df: DistributedDFType,
+        h: _PositiveInt,
+        detection_size: _PositiveInt,
+        threshold_method: _ThresholdMethod,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        level: Union[int, float],
+        clean_ex_first: bool,
+        step_size: Optional[_PositiveInt],
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        hist_exog_list: Optional[list[str]],
+        date_features: Union[bool, list[str]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        refit: bool,
+        num_partitions: Optional[int],
+        multivariate: bool,
+    ) -> DistributedDFType:
+        import fugue.api as fa
+
+        schema, partition_config = _distributed_setup(
+            df=df,
+            method="detect_anomalies_online",
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            level=level,
+            quantiles=None,
+            num_partitions=num_partitions,
+        )
+        result_df = fa.transform(
+            df,
+            using=_detect_anomalies_online_wrapper,
+            schema=schema,
+            params=dict(
+                client=self,
+                h=h,
+                detection_size=detection_size,
+                threshold_method=threshold_method,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                clean_ex_first=clean_ex_first,
+                step_size=step_size,
+                finetune_steps=finetune_steps,
+                finetune_loss=finetune_loss,
+                finetune_depth=finetune_depth,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                refit=refit,
+                num_partitions=None,
+                multivariate=multivariate,
+            ),
+            partition=partition_config,
+            as_fugue=True,
+        )
+        return fa.get_native_as_df(result_df)
+
+    def _detect_anomalies_online(
+        self,
+        df: AnyDFType,
+        h: _PositiveInt,
+        detection_size: _PositiveInt,
+        threshold_method: _ThresholdMethod,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        level: Union[int, float],
+        clean_ex_first: bool,
+        step_size: Optional[_PositiveInt],
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        hist_exog_list: Optional[list[str]],
+        date_features: Union[bool, list[str]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        refit: bool,
+        num_partitions: Optional[_PositiveInt],
+        multivariate: bool,
+    ) -> _Steps[AnyDFType]:
+        if isinstance(df, pl_LazyFrame):
+            df, freq = yield from self._collect_lazy_steps(
+                df, freq=freq, id_col=id_col, time_col=time_col, target_col=target_col
+            )
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame, PreparedSeries)):
             return self._distributed_detect_anomalies_online(
                 df=df,
                 h=h,
@@ -2259,31 +5854,25 @@ class NixtlaClient:
                 "Either set threshold_method to univariate "
                 "or set num_partitions to None."
             )
-        self.__dict__.pop("weights_x", None)
+        self._clear_outputs("weights_x")
         model = self._maybe_override_model(model)
-        logger.info("Validating inputs...")
-        df, _, drop_id, freq = self._run_validations(
+        yield from self._validate_model(model, validate_api_key=False)
+        prepared = self._prepare_or_check(
             df=df,
-            X_df=None,
+            freq=freq,
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
-            validate_api_key=False,
-            model=model,
-            freq=freq,
-        )
-        logger.info("Preprocessing dataframes...")
-        processed, _, x_cols, _ = _preprocess(
-            df=df,
-            X_df=None,
-            h=0,
-            freq=freq,
             date_features=date_features,
             date_features_to_one_hot=date_features_to_one_hot,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
         )
+        df, processed, freq = prepared.df, prepared.processed, prepared.freq
+        id_col, time_col, target_col = (
+            prepared.id_col,
+            prepared.time_col,
+            prepared.target_col,
+        )
+        x_cols = prepared.x_cols
         standard_freq = _standardize_freq(freq, processed)
         targets = _extract_target_array(df, target_col)
         times = df[time_col].to_numpy()
@@ -2318,20 +5907,22 @@ class NixtlaClient:
             "hist_exog": hist_exog,
             "multivariate": multivariate,
         }
-        with self._make_client(**self._client_kwargs) as client:
-            if num_partitions is None:
-                resp = self._make_request_with_retries(
-                    client, "v2/online_anomaly_detection", payload
-                )
-            else:
-                payloads = _partition_series(payload, num_partitions, h=0)
-                resp = self._make_partitioned_requests(
-                    client, "v2/online_anomaly_detection", payloads
-                )
+        [resp] = yield [
+            _ApiCall(
+                "v2/online_anomaly_detection",
+                payload,
+                num_partitions,
+                auto_partition=(
+                    not multivariate
+                    and threshold_method != "multivariate"
+                    and not finetune_steps
+                ),
+            )
+        ]
 
         # assemble result
-        idxs = np.array(resp["idxs"], dtype=np.int64)
-        sizes = np.array(resp["sizes"], dtype=np.int64)
+        idxs = np.asarray(resp["idxs"], dtype=np.int64)
+        sizes = np.asarray(resp["sizes"], dtype=np.int64)
         out = type(df)(
             {
                 id_col: ufp.repeat(processed.uids, sizes),
@@ -2346,173 +5937,90 @@ class NixtlaClient:
             out = ufp.assign_columns(
                 out, "accumulated_anomaly_score", resp["accumulated_anomaly_score"]
             )
+        out = self._drop_missing_series(out, processed.uids, id_col)
         return _maybe_add_intervals(out, resp["intervals"])
 
-    def _distributed_cross_validation(
+    def detect_anomalies_online(
         self,
-        df: DistributedDFType,
-        h: _PositiveInt,
-        freq: Optional[_Freq],
-        id_col: str,
-        time_col: str,
-        target_col: str,
-        level: Optional[list[Union[int, float]]],
-        quantiles: Optional[list[float]],
-        validate_api_key: bool,
-        n_windows: _PositiveInt,
-        step_size: Optional[_PositiveInt],
-        finetune_steps: _NonNegativeInt,
-        finetune_depth: _FinetuneDepth,
-        finetune_loss: _Loss,
-        finetuned_model_id: Optional[str],
-        refit: bool,
-        clean_ex_first: bool,
-        hist_exog_list: Optional[list[str]],
-        date_features: Union[bool, Sequence[Union[str, Callable]]],
-        date_features_to_one_hot: Union[bool, list[str]],
-        model: _Model,
-        num_partitions: Optional[int],
-        model_parameters: _ExtraParamDataType,
-        multivariate: bool,
-    ) -> DistributedDFType:
-        import fugue.api as fa
-
-        schema, partition_config = _distributed_setup(
-            df=df,
-            method="cross_validation",
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            level=level,
-            quantiles=quantiles,
-            num_partitions=num_partitions,
-        )
-        result_df = fa.transform(
-            df,
-            using=_cross_validation_wrapper,
-            schema=schema,
-            params=dict(
-                client=self,
-                h=h,
-                freq=freq,
-                id_col=id_col,
-                time_col=time_col,
-                target_col=target_col,
-                level=level,
-                quantiles=quantiles,
-                validate_api_key=validate_api_key,
-                n_windows=n_windows,
-                step_size=step_size,
-                finetune_steps=finetune_steps,
-                finetune_depth=finetune_depth,
-                finetune_loss=finetune_loss,
-                finetuned_model_id=finetuned_model_id,
-                refit=refit,
-                clean_ex_first=clean_ex_first,
-                hist_exog_list=hist_exog_list,
-                date_features=date_features,
-                date_features_to_one_hot=date_features_to_one_hot,
-                model=model,
-                num_partitions=None,
-                model_parameters=model_parameters,
-                multivariate=multivariate,
-            ),
-            partition=partition_config,
-            as_fugue=True,
-        )
-        return fa.get_native_as_df(result_df)
-
-    def cross_validation(
-        self,
-        df: AnyDFType,
+        df: AnyDFType,
         h: _PositiveInt,
+        detection_size: _PositiveInt,
+        threshold_method: _ThresholdMethod = "univariate",
         freq: Optional[_Freq] = None,
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
-        level: Optional[list[Union[int, float]]] = None,
-        quantiles: Optional[list[float]] = None,
-        validate_api_key: bool = False,
-        n_windows: _PositiveInt = 1,
+        level: Union[int, float] = 99,
+        clean_ex_first: bool = True,
         step_size: Optional[_PositiveInt] = None,
         finetune_steps: _NonNegativeInt = 0,
         finetune_depth: _FinetuneDepth = 1,
         finetune_loss: _Loss = "default",
-        finetuned_model_id: Optional[str] = None,
-        refit: bool = True,
-        clean_ex_first: bool = True,
         hist_exog_list: Optional[list[str]] = None,
         date_features: Union[bool, list[str]] = False,
         date_features_to_one_hot: Union[bool, list[str]] = False,
         model: _Model = "timegpt-1",
+        refit: bool = False,
         num_partitions: Optional[_PositiveInt] = None,
-        model_parameters: _ExtraParamDataType = None,
         multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
     ) -> AnyDFType:
-        """Perform cross validation in your time series using TimeGPT.
+        """
+        Online anomaly detection in your time series using TimeGPT.
 
         Args:
-            df (pandas or polars DataFrame): The DataFrame on which the
-                function will operate. Expected to contain at least the
-                following columns:
+            df (pandas or polars DataFrame or LazyFrame):
+                The DataFrame on which the function will operate. Expected
+                to contain at least the following columns:
                 - time_col:
                     Column name in `df` that contains the time indices of the
                     time series. This is typically a datetime column with
-                    regular intervals, e.g., hourly, daily, monthly data points.
+                    regular intervals, e.g., hourly, daily, monthly data
+                    points.
                 - target_col:
-                    Column name in `df` that contains the target variable of the
-                    time series, i.e., the variable we wish to predict or analyze.
-                Additionally, you can pass multiple time series (stacked in the
-                dataframe) considering an additional column:
+                    Column name in `df` that contains the target variable of
+                    the time series, i.e., the variable we wish to predict or
+                    analyze.
                 - id_col:
                     Column name in `df` that identifies unique time series.
                     Each unique value in this column corresponds to a unique
                     time series.
+
             h (int): Forecast horizon.
-            freq (str, int or pandas offset, optional): Frequency of the
-                timestamps. If `None`, it will be inferred automatically.
-                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-                Defaults to None.
-            id_col (str): Column that identifies each series. Defaults to
-                'unique_id'.
-            time_col (str): Column that identifies each timestep, its values
-                can be timestamps or integers. Defaults to 'ds'.
-            target_col (str): Column that contains the target. Defaults to 'y'.
-            level (list[float], optional): Confidence levels between 0 and 100
-                for prediction intervals. Defaults to None.
-            quantiles (list[float], optional): Quantiles to forecast, list
-                between (0, 1). `level` and `quantiles` should not be
-                used simultaneously. The output dataframe will have
-                the quantile columns formatted as TimeGPT-q-(100 * q) for each
-                q. 100 * q represents percentiles but we choose this notation
-                to avoid having dots in column names. Defaults to None.
-            validate_api_key (bool): If True, validates api_key before sending
-                requests. Defaults to False.
-            n_windows (int): Number of windows to evaluate. Defaults to 1.
+            detection_size (int): The length of the sequence where anomalies
+                will be detected starting from the end of the dataset.
+            threshold_method (str, optional): The method used to calculate the
+                intervals for anomaly detection. Use `univariate` to flag
+                anomalies independently for each series in the dataset.
+                Use `multivariate` to have a global threshold across all series
+                in the dataset. For this method, all series must have the same
+                length. Defaults to 'univariate'.
+            freq (str, optional): Frequency of the data. By default, the freq
+                will be inferred automatically. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+            id_col (str, optional): Column that identifies each series.
+                Defaults to 'unique_id'
+            time_col (str, optional): Column that identifies each timestep,
+                its values can be timestamps or integers. Defaults to 'ds'.
+            target_col (str, optional): Column that contains the target.
+                Defaults to 'y'.
+            level (float, optional):
+                Confidence level between 0 and 100 for detecting the anomalies.
+                Defaults to 99.
+            clean_ex_first (bool, optional): Clean exogenous signal before
+                making forecasts using TimeGPT. Defaults to True.
             step_size (int, optional): Step size between each cross validation
                 window. If None it will be equal to `h`. Defaults to None.
-            finetune_steps (int): Number of steps used to finetune learning
-                TimeGPT in the new data. Defaults to 0.
+            finetune_steps (int): Number of steps used to finetune TimeGPT in
+                the new data. Defaults to 0.
             finetune_depth (int): The depth of the finetuning. Uses a scale
                 from 1 to 5, where 1 means little finetuning, and 5 means that
                 the entire model is finetuned. Defaults to 1.
-            finetune_loss (str): Loss function to use for finetuning. Options
-                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
-                Defaults to 'default'.
-            finetuned_model_id (str, optional): ID of previously fine-tuned
-                model to use. Defaults to None.
-            finetuned_model_id (str, optional): ID of previously fine-tuned
-                model to use. Defaults to None.
-            refit (bool):
-                Fine-tune the model in each window. If `False`, only
-                fine-tunes on the first window. Only used if `finetune_steps`
-                > 0. Defaults to True.
-            clean_ex_first (bool):
-                Clean exogenous signal before making forecasts using TimeGPT.
-                Defaults to True.
-            hist_exog_list (list[str], optional):
-                Column names of the historical exogenous features. Defaults
-                to None.
+            finetune_loss (str): Loss function to use for finetuning.
+                Options are: `default`, `mae`, `mse`, `rmse`, `mape`, and
+                `smape`. Defaults to 'default'.
+            hist_exog_list (list[str], optional): Column names of the historical
+                exogenous features. Defaults to None.
             date_features (bool or list[str] or callable, optional): Features
                 computed from the dates. Can be pandas date attributes
                 or functions that will take the dates as input. If True
@@ -2522,97 +6030,255 @@ class NixtlaClient:
                 encoding to these date features. If
                 `date_features=True`, then all date features are
                 one-hot encoded by default. Defaults to False.
-            model (str): Model to use as a string. Options are: `timegpt-1`,
-                and `timegpt-1-long-horizon`. We recommend using
+            model (str, optional): Model to use as a string. Options are:
+                `timegpt-1`, and `timegpt-1-long-horizon`. We recommend using
                 `timegpt-1-long-horizon` for forecasting if you want to
                 predict more than one seasonal period given the frequency of
                 your data. Defaults to 'timegpt-1'.
+            refit (bool, optional): Fine-tune the model in each window. If
+                False, only fine-tunes on the first window. Only used if
+                finetune_steps > 0. Defaults to False.
             num_partitions (int):
                 Number of partitions to use. If None, the number of partitions
                 will be equal to the available parallel resources in
                 distributed environments. Defaults to None.
-            model_parameters (dict): The dictionary settings that determine
-                the behavior of the model. Default is None.            
             multivariate (bool): If True, enables multivariate predictions.
                 Defaults to False. Note: multivariate predictions are only
-                supported for a select set of TimeGPT models. 
+                supported for a select set of TimeGPT models. This variable 
+                is different from the `threshold_method` parameter. The latter
+                controls the method used for anomaly detection (univariate vs
+                multivariate) whereas `multivariate` determines how the model 
+                creates the predictions.
+            timeout_total (float, optional): Maximum time in seconds for the
+                whole call, including the retries and all the partitions. The
+                requests in flight when it expires are abandoned and the
+                pending ones aren't sent. Only applies to pandas and polars
+                DataFrames. If None, there's no limit. Defaults to None.
+            on_timeout (str): What to do when `timeout_total` expires. 'raise'
+                raises a `TimeoutError`. 'partial' returns the results of the
+                partitions (see `num_partitions`) that completed and sets the
+                ids of the remaining series in the client's `missing_series`
+                attribute, or raises if none completed. Defaults to 'raise'.
 
         Returns:
             pandas, polars, dask or spark DataFrame or ray Dataset:
-                DataFrame with cross validation forecasts.
+                DataFrame with anomalies flagged by TimeGPT.
         """
-        extra_param_checker.validate_python(model_parameters)
-        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
-            return self._distributed_cross_validation(
+        return self._run(
+            self._detect_anomalies_online(
                 df=df,
                 h=h,
+                detection_size=detection_size,
+                threshold_method=threshold_method,
                 freq=freq,
                 id_col=id_col,
                 time_col=time_col,
                 target_col=target_col,
                 level=level,
-                quantiles=quantiles,
-                n_windows=n_windows,
+                clean_ex_first=clean_ex_first,
                 step_size=step_size,
-                validate_api_key=validate_api_key,
                 finetune_steps=finetune_steps,
                 finetune_depth=finetune_depth,
                 finetune_loss=finetune_loss,
-                finetuned_model_id=finetuned_model_id,
-                refit=refit,
-                clean_ex_first=clean_ex_first,
                 hist_exog_list=hist_exog_list,
                 date_features=date_features,
                 date_features_to_one_hot=date_features_to_one_hot,
                 model=model,
+                refit=refit,
                 num_partitions=num_partitions,
-                model_parameters=model_parameters,
                 multivariate=multivariate,
-            )
-        model = self._maybe_override_model(model)
-        logger.info("Validating inputs...")
-        df, _, drop_id, freq = self._run_validations(
-            df=df,
-            X_df=None,
-            id_col=id_col,
-            time_col=time_col,
-            target_col=target_col,
-            validate_api_key=validate_api_key,
-            model=model,
-            freq=freq,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
         )
-        level, quantiles = _prepare_level_and_quantiles(level, quantiles)
-        if step_size is None:
-            step_size = h
 
-        logger.info("Preprocessing dataframes...")
-        processed, _, x_cols, _ = _preprocess(
+    def _distributed_cross_validation(
+        self,
+        df: DistributedDFType,
+        h: _PositiveInt,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        level: Optional[list[Union[int, float]]],
+        quantiles: Optional[list[float]],
+        validate_api_key: bool,
+        n_windows: _PositiveInt,
+        step_size: Optional[_PositiveInt],
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        finetuned_model_id: Optional[str],
+        refit: bool,
+        clean_ex_first: bool,
+        hist_exog_list: Optional[list[str]],
+        date_features: Union[bool, Sequence[Union[str, Callable]]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        num_partitions: Optional[int],
+        model_parameters: _ExtraParamDataType,
+        multivariate: bool,
+    ) -> DistributedDFType:
+        import fugue.api as fa
+
+        self._prefetch_model_params(model, freq)
+        schema, partition_config = _distributed_setup(
             df=df,
-            X_df=None,
-            h=0,
-            freq=freq,
-            date_features=date_features,
-            date_features_to_one_hot=date_features_to_one_hot,
+            method="cross_validation",
             id_col=id_col,
             time_col=time_col,
             target_col=target_col,
+            level=level,
+            quantiles=quantiles,
+            num_partitions=num_partitions,
         )
-        standard_freq = _standardize_freq(freq, processed)
-        model_input_size, model_horizon = self._get_model_params(model, standard_freq)
-        targets = _extract_target_array(df, target_col)
-        times = df[time_col].to_numpy()
-        if processed.sort_idxs is not None:
-            targets = targets[processed.sort_idxs]
-            times = times[processed.sort_idxs]
-        restrict_input = finetune_steps == 0 and not x_cols
-        if restrict_input:
-            logger.info("Restricting input...")
-            new_input_size = _restrict_input_samples(
-                level=level,
-                input_size=model_input_size,
-                model_horizon=model_horizon,
+        result_df = fa.transform(
+            df,
+            using=_cross_validation_wrapper,
+            schema=schema,
+            params=dict(
+                client=self,
                 h=h,
-            )
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                quantiles=quantiles,
+                validate_api_key=validate_api_key,
+                n_windows=n_windows,
+                step_size=step_size,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                finetuned_model_id=finetuned_model_id,
+                refit=refit,
+                clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=None,
+                model_parameters=model_parameters,
+                multivariate=multivariate,
+            ),
+            partition=partition_config,
+            as_fugue=True,
+        )
+        return fa.get_native_as_df(result_df)
+
+    def _cross_validation(
+        self,
+        df: AnyDFType,
+        h: _PositiveInt,
+        freq: Optional[_Freq],
+        id_col: str,
+        time_col: str,
+        target_col: str,
+        level: Optional[list[Union[int, float]]],
+        quantiles: Optional[list[float]],
+        validate_api_key: bool,
+        n_windows: _PositiveInt,
+        step_size: Optional[_PositiveInt],
+        finetune_steps: _NonNegativeInt,
+        finetune_depth: _FinetuneDepth,
+        finetune_loss: _Loss,
+        finetuned_model_id: Optional[str],
+        refit: bool,
+        clean_ex_first: bool,
+        hist_exog_list: Optional[list[str]],
+        date_features: Union[bool, list[str]],
+        date_features_to_one_hot: Union[bool, list[str]],
+        model: _Model,
+        num_partitions: Optional[_PositiveInt],
+        model_parameters: _ExtraParamDataType,
+        multivariate: bool,
+    ) -> _Steps[AnyDFType]:
+        extra_param_checker.validate_python(model_parameters)
+        arrow_output = _is_arrow_data(df)
+        if arrow_output:
+            df = _arrow_to_polars(df, id_col)
+        if isinstance(df, pl_LazyFrame):
+            restrict_input = finetune_steps == 0 and not date_features
+            n_test = h + (step_size or h) * (n_windows - 1)
+            df, freq = yield from self._collect_lazy_steps(
+                df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                model=model,
+                restrict_input=restrict_input,
+                level=level or quantiles,
+                h=h,
+                n_test=n_test,
+            )
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame, PreparedSeries)):
+            return self._distributed_cross_validation(
+                df=df,
+                h=h,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                quantiles=quantiles,
+                n_windows=n_windows,
+                step_size=step_size,
+                validate_api_key=validate_api_key,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                finetuned_model_id=finetuned_model_id,
+                refit=refit,
+                clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                model_parameters=model_parameters,
+                multivariate=multivariate,
+            )
+        model = self._maybe_override_model(model)
+        yield from self._validate_model(model, validate_api_key)
+        prepared = self._prepare_or_check(
+            df=df,
+            freq=freq,
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            date_features=date_features,
+            date_features_to_one_hot=date_features_to_one_hot,
+        )
+        df, processed, freq = prepared.df, prepared.processed, prepared.freq
+        id_col, time_col, target_col = (
+            prepared.id_col,
+            prepared.time_col,
+            prepared.target_col,
+        )
+        x_cols, drop_id = prepared.x_cols, prepared.drop_id
+        level, quantiles = _prepare_level_and_quantiles(level, quantiles)
+        if step_size is None:
+            step_size = h
+        standard_freq = _standardize_freq(freq, processed)
+        model_input_size, model_horizon = yield from self._model_params_steps(
+            model, standard_freq
+        )
+        targets = _extract_target_array(df, target_col)
+        times = df[time_col].to_numpy()
+        if processed.sort_idxs is not None:
+            targets = targets[processed.sort_idxs]
+            times = times[processed.sort_idxs]
+        restrict_input = finetune_steps == 0 and not x_cols
+        if restrict_input:
+            logger.info("Restricting input...")
+            new_input_size = _restrict_input_samples(
+                level=level,
+                input_size=model_input_size,
+                model_horizon=model_horizon,
+                h=h,
+            )
             new_input_size += h + step_size * (n_windows - 1)
             orig_indptr = processed.indptr
             processed = _tail(processed, new_input_size)
@@ -2644,20 +6310,18 @@ class NixtlaClient:
         }
         if model_parameters is not None:
             payload.update({"model_parameters": model_parameters})
-        with self._make_client(**self._client_kwargs) as client:
-            if num_partitions is None:
-                resp = self._make_request_with_retries(
-                    client, "v2/cross_validation", payload
-                )
-            else:
-                payloads = _partition_series(payload, num_partitions, h=0)
-                resp = self._make_partitioned_requests(
-                    client, "v2/cross_validation", payloads
-                )
+        [resp] = yield [
+            _ApiCall(
+                "v2/cross_validation",
+                payload,
+                num_partitions,
+                auto_partition=not multivariate and not finetune_steps,
+            )
+        ]
 
         # assemble result
-        idxs = np.array(resp["idxs"], dtype=np.int64)
-        sizes = np.array(resp["sizes"], dtype=np.int64)
+        idxs = np.asarray(resp["idxs"], dtype=np.int64)
+        sizes = np.asarray(resp["sizes"], dtype=np.int64)
         window_starts = np.arange(0, sizes.sum(), h)
         cutoff_idxs = np.repeat(idxs[window_starts] - 1, h)
         out = type(df)(
@@ -2670,346 +6334,1839 @@ class NixtlaClient:
         )
         out = ufp.assign_columns(out, "TimeGPT", resp["mean"])
         out = _maybe_add_intervals(out, resp["intervals"])
+        out = self._drop_missing_series(out, processed.uids, id_col)
         out = _maybe_drop_id(df=out, id_col=id_col, drop=drop_id)
-        return _maybe_convert_level_to_quantiles(out, quantiles)
+        out = _maybe_convert_level_to_quantiles(out, quantiles)
+        if arrow_output:
+            out = _polars_to_arrow(out, id_col)
+        return out
 
-    def plot(
+    def cross_validation(
         self,
-        df: Optional[DataFrame] = None,
-        forecasts_df: Optional[DataFrame] = None,
+        df: AnyDFType,
+        h: _PositiveInt,
+        freq: Optional[_Freq] = None,
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
-        unique_ids: Union[Optional[list[str]], np.ndarray] = None,
-        plot_random: bool = True,
-        max_ids: int = 8,
-        models: Optional[list[str]] = None,
         level: Optional[list[Union[int, float]]] = None,
-        max_insample_length: Optional[int] = None,
-        plot_anomalies: bool = False,
-        engine: Literal["matplotlib", "plotly", "plotly-resampler"] = "matplotlib",
-        resampler_kwargs: Optional[dict] = None,
-        ax: Optional[
-            Union["plt.Axes", np.ndarray, "plotly.graph_objects.Figure"]
-        ] = None,
-    ):
-        """Plot forecasts and insample values.
+        quantiles: Optional[list[float]] = None,
+        validate_api_key: bool = False,
+        n_windows: _PositiveInt = 1,
+        step_size: Optional[_PositiveInt] = None,
+        finetune_steps: _NonNegativeInt = 0,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        finetuned_model_id: Optional[str] = None,
+        refit: bool = True,
+        clean_ex_first: bool = True,
+        hist_exog_list: Optional[list[str]] = None,
+        date_features: Union[bool, list[str]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+        model: _Model = "timegpt-1",
+        num_partitions: Optional[_PositiveInt] = None,
+        model_parameters: _ExtraParamDataType = None,
+        multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> AnyDFType:
+        """Perform cross validation in your time series using TimeGPT.
 
         Args:
-            df (pandas or polars DataFrame): The DataFrame on which the
-                function will operate. Expected to contain at least the
-                following columns:
+            df (pandas or polars DataFrame, LazyFrame or pyarrow Table):
+                The DataFrame on which the function will operate. Expected
+                to contain at least the following columns:
                 - time_col:
-                    Column name in `df` that contains the time indices of
-                    the time series. This is typically a datetime column
-                    with regular intervals, e.g., hourly, daily, monthly
-                    data points.
+                    Column name in `df` that contains the time indices of the
+                    time series. This is typically a datetime column with
+                    regular intervals, e.g., hourly, daily, monthly data points.
                 - target_col:
-                    Column name in `df` that contains the target variable of
-                    the time series, i.e., the variable we wish to predict
-                    or analyze.
-                Additionally, you can pass multiple time series (stacked in
-                    the dataframe) considering an additional column:
+                    Column name in `df` that contains the target variable of the
+                    time series, i.e., the variable we wish to predict or analyze.
+                Additionally, you can pass multiple time series (stacked in the
+                dataframe) considering an additional column:
                 - id_col:
                     Column name in `df` that identifies unique time series.
                     Each unique value in this column corresponds to a unique
                     time series.
-            forecasts_df (pandas or polars DataFrame, optional): DataFrame with
-                columns [`unique_id`, `ds`] and models. Defaults to None.
+                pyarrow Tables and RecordBatchReaders are processed with
+                polars, which shares their memory, and the output is a pyarrow
+                Table.
+            h (int): Forecast horizon.
+            freq (str, int or pandas offset, optional): Frequency of the
+                timestamps. If `None`, it will be inferred automatically.
+                See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+                Defaults to None.
             id_col (str): Column that identifies each series. Defaults to
                 'unique_id'.
             time_col (str): Column that identifies each timestep, its values
                 can be timestamps or integers. Defaults to 'ds'.
             target_col (str): Column that contains the target. Defaults to 'y'.
-            unique_ids (list[str], optional): Time Series to plot. If None,
-                time series are selected randomly. Defaults to None.
-            plot_random (bool):
-                Select time series to plot randomly. Defaults to True.
-            max_ids (int):
-                Maximum number of ids to plot. Defaults to 8.
-            models (list[str], optional): List of models to plot. Defaults to
-                None.
-            level (list[float], optional): List of prediction intervals to
-                plot if paseed. Defaults to None.
-            max_insample_length (int, optional): Max number of train/insample
-                observations to be plotted. Defaults to None.
-            plot_anomalies (bool): Plot anomalies for each prediction interval.
-                Defaults to False.
-            engine (str): Library used to plot. 'matplotlib', 'plotly' or
-                'plotly-resampler'. Defaults to 'matplotlib'.
-            resampler_kwargs (dict): Kwargs to be passed to plotly-resampler
-                constructor. For further custumization ("show_dash") call
-                the method, store the plotting object and add the extra
-                arguments to its `show_dash` method.
-            ax (matplotlib axes, array of matplotlib axes or plotly Figure,
-                optional): Object where plots will be added. Defaults to None.
-        """
-        try:
-            from utilsforecast.plotting import plot_series
-        except ModuleNotFoundError:
-            raise Exception(
-                "You have to install additional dependencies to use this method, "
-                'please install them using `pip install "nixtla[plotting]"`'
-            )
-        if df is not None and id_col not in df.columns:
-            df = ufp.copy_if_pandas(df, deep=False)
-            df = ufp.assign_columns(df, id_col, "ts_0")
-        df = ensure_time_dtype(df, time_col=time_col)
-        if forecasts_df is not None:
-            if id_col not in forecasts_df.columns:
-                forecasts_df = ufp.copy_if_pandas(forecasts_df, deep=False)
-                forecasts_df = ufp.assign_columns(forecasts_df, id_col, "ts_0")
-            forecasts_df = ensure_time_dtype(forecasts_df, time_col=time_col)
-            if "anomaly" in forecasts_df.columns:
-                # special case to plot outputs
-                # from detect_anomalies
-                df = None
-                forecasts_df = ufp.drop_columns(forecasts_df, "anomaly")
-                cols = [
-                    c.replace("TimeGPT-lo-", "")
-                    for c in forecasts_df.columns
-                    if "TimeGPT-lo-" in c
-                ]
-                level = [float(c) if "." in c else int(c) for c in cols]
-                plot_anomalies = True
-                models = ["TimeGPT"]
-        return plot_series(
-            df=df,
-            forecasts_df=forecasts_df,
-            ids=unique_ids,
-            plot_random=plot_random,
-            max_ids=max_ids,
-            models=models,
-            level=level,
-            max_insample_length=max_insample_length,
-            plot_anomalies=plot_anomalies,
-            engine=engine,
-            resampler_kwargs=resampler_kwargs,
-            palette="tab20b",
-            id_col=id_col,
+            level (list[float], optional): Confidence levels between 0 and 100
+                for prediction intervals. Defaults to None.
+            quantiles (list[float], optional): Quantiles to forecast, list
+                between (0, 1). `level` and `quantiles` should not be
+                used simultaneously. The output dataframe will have
+                the quantile columns formatted as TimeGPT-q-(100 * q) for each
+                q. 100 * q represents percentiles but we choose this notation
+                to avoid having dots in column names. Defaults to None.
+            validate_api_key (bool): If True, validates api_key before sending
+                requests. Defaults to False.
+            n_windows (int): Number of windows to evaluate. Defaults to 1.
+            step_size (int, optional): Step size between each cross validation
+                window. If None it will be equal to `h`. Defaults to None.
+            finetune_steps (int): Number of steps used to finetune learning
+                TimeGPT in the new data. Defaults to 0.
+            finetune_depth (int): The depth of the finetuning. Uses a scale
+                from 1 to 5, where 1 means little finetuning, and 5 means that
+                the entire model is finetuned. Defaults to 1.
+            finetune_loss (str): Loss function to use for finetuning. Options
+                are: `default`, `mae`, `mse`, `rmse`, `mape`, and `smape`.
+                Defaults to 'default'.
+            finetuned_model_id (str, optional): ID of previously fine-tuned
+                model to use. Defaults to None.
+            finetuned_model_id (str, optional): ID of previously fine-tuned
+                model to use. Defaults to None.
+            refit (bool):
+                Fine-tune the model in each window. If `False`, only
+                fine-tunes on the first window. Only used if `finetune_steps`
+                > 0. Defaults to True.
+            clean_ex_first (bool):
+                Clean exogenous signal before making forecasts using TimeGPT.
+                Defaults to True.
+            hist_exog_list (list[str], optional):
+                Column names of the historical exogenous features. Defaults
+                to None.
+            date_features (bool or list[str] or callable, optional): Features
+                computed from the dates. Can be pandas date attributes
+                or functions that will take the dates as input. If True
+                automatically adds most used date features for the
+                frequency of `df`. Defaults to False.
+            date_features_to_one_hot (bool or list[str]): Apply one-hot
+                encoding to these date features. If
+                `date_features=True`, then all date features are
+                one-hot encoded by default. Defaults to False.
+            model (str): Model to use as a string. Options are: `timegpt-1`,
+                and `timegpt-1-long-horizon`. We recommend using
+                `timegpt-1-long-horizon` for forecasting if you want to
+                predict more than one seasonal period given the frequency of
+                your data. Defaults to 'timegpt-1'.
+            num_partitions (int):
+                Number of partitions to use. If None, the number of partitions
+                will be equal to the available parallel resources in
+                distributed environments. Defaults to None.
+            model_parameters (dict): The dictionary settings that determine
+                the behavior of the model. Default is None.            
+            multivariate (bool): If True, enables multivariate predictions.
+                Defaults to False. Note: multivariate predictions are only
+                supported for a select set of TimeGPT models. 
+            timeout_total (float, optional): Maximum time in seconds for the
+                whole call, including the retries and all the partitions. The
+                requests in flight when it expires are abandoned and the
+                pending ones aren't sent. Only applies to pandas and polars
+                DataFrames. If None, there's no limit. Defaults to None.
+            on_timeout (str): What to do when `timeout_total` expires. 'raise'
+                raises a `TimeoutError`. 'partial' returns the results of the
+                partitions (see `num_partitions`) that completed and sets the
+                ids of the remaining series in the client's `missing_series`
+                attribute, or raises if none completed. Defaults to 'raise'.
+
+        Returns:
+            pandas, polars, dask or spark DataFrame, ray Dataset or pyarrow Table:
+                DataFrame with cross validation forecasts.
+        """
+        return self._run(
+            self._cross_validation(
+                df=df,
+                h=h,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                quantiles=quantiles,
+                validate_api_key=validate_api_key,
+                n_windows=n_windows,
+                step_size=step_size,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                finetuned_model_id=finetuned_model_id,
+                refit=refit,
+                clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                model_parameters=model_parameters,
+                multivariate=multivariate,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
+        )
+
+    def forecast_iter(
+        self,
+        df: AnyDFType,
+        X_df: Optional[AnyDFType] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        num_partitions: Optional[_PositiveInt] = None,
+        **kwargs: Any,
+    ) -> Iterator[PartitionResult]:
+        """Forecast your time series using TimeGPT, one partition at a time.
+
+        Splits the series in partitions and yields the forecasts of each one as
+        soon as it completes, so that the results of large jobs can be written
+        out without holding all of them in memory.
+
+        Args:
+            df (pandas or polars DataFrame): The DataFrame on which the
+                function will operate. See `forecast`.
+            X_df (pandas or polars DataFrame, optional): DataFrame with the
+                future exogenous features. See `forecast`.
+            id_col (str): Column that identifies each series.
+                Defaults to 'unique_id'.
+            time_col (str): Column that identifies each timestep.
+                Defaults to 'ds'.
+            num_partitions (int, optional): Number of partitions to split the
+                series in. If None, the partitions have around
+                `partition_size_mb` of data. Defaults to None.
+            **kwargs: Other arguments of `forecast`, except `multivariate`
+                and `finetune_steps`, which need all the series at once.
+
+        Yields:
+            PartitionResult: Forecasts of the series of a partition, with
+                their weights of the exogenous features and feature
+                contributions, in the order the partitions complete.
+        """
+        yield from self._iter_partitions(
+            self.forecast,
+            df=df,
+            X_df=X_df,
+            id_col=id_col,
             time_col=time_col,
-            target_col=target_col,
-            ax=ax,
+            num_partitions=num_partitions,
+            kwargs=kwargs,
+        )
+
+    def detect_anomalies_iter(
+        self,
+        df: AnyDFType,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        num_partitions: Optional[_PositiveInt] = None,
+        **kwargs: Any,
+    ) -> Iterator[PartitionResult]:
+        """Detect anomalies in your time series using TimeGPT, one partition at
+        a time.
+
+        Args:
+            df (pandas or polars DataFrame): The DataFrame on which the
+                function will operate. See `detect_anomalies`.
+            id_col (str): Column that identifies each series.
+                Defaults to 'unique_id'.
+            time_col (str): Column that identifies each timestep.
+                Defaults to 'ds'.
+            num_partitions (int, optional): Number of partitions to split the
+                series in. If None, the partitions have around
+                `partition_size_mb` of data. Defaults to None.
+            **kwargs: Other arguments of `detect_anomalies`, except
+                `multivariate`.
+
+        Yields:
+            PartitionResult: Anomalies of the series of a partition, with
+                their weights of the exogenous features, in the order the
+                partitions complete.
+        """
+        yield from self._iter_partitions(
+            self.detect_anomalies,
+            df=df,
+            X_df=None,
+            id_col=id_col,
+            time_col=time_col,
+            num_partitions=num_partitions,
+            kwargs=kwargs,
+        )
+
+    def cross_validation_iter(
+        self,
+        df: AnyDFType,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        num_partitions: Optional[_PositiveInt] = None,
+        **kwargs: Any,
+    ) -> Iterator[PartitionResult]:
+        """Perform cross validation in your time series using TimeGPT, one
+        partition at a time.
+
+        Args:
+            df (pandas or polars DataFrame): The DataFrame on which the
+                function will operate. See `cross_validation`.
+            id_col (str): Column that identifies each series.
+                Defaults to 'unique_id'.
+            time_col (str): Column that identifies each timestep.
+                Defaults to 'ds'.
+            num_partitions (int, optional): Number of partitions to split the
+                series in. If None, the partitions have around
+                `partition_size_mb` of data. Defaults to None.
+            **kwargs: Other arguments of `cross_validation`, except
+                `multivariate` and `finetune_steps`, which need all the
+                series at once.
+
+        Yields:
+            PartitionResult: Cross validation forecasts of the series of a
+                partition, with their weights of the exogenous features, in
+                the order the partitions complete.
+        """
+        yield from self._iter_partitions(
+            self.cross_validation,
+            df=df,
+            X_df=None,
+            id_col=id_col,
+            time_col=time_col,
+            num_partitions=num_partitions,
+            kwargs=kwargs,
+        )
+
+    def _iter_partitions(
+        self,
+        method: Callable[..., DFType],
+        df: DFType,
+        X_df: Optional[DFType],
+        id_col: str,
+        time_col: str,
+        num_partitions: Optional[int],
+        kwargs: dict[str, Any],
+    ) -> Iterator[PartitionResult]:
+        name = f"{method.__name__}_iter"
+        if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+            raise ValueError(
+                f"{name} only supports pandas and polars DataFrames, got "
+                f"{type(df).__name__}. Distributed dataframes are already "
+                f"processed by partition with `{method.__name__}`."
+            )
+        for arg in ("multivariate", "finetune_steps"):
+            if kwargs.get(arg):
+                raise ValueError(
+                    f"{name} doesn't support `{arg}`, since it requires all the "
+                    f"series at once. Please use `{method.__name__}` instead."
+                )
+        if X_df is not None:
+            kwargs["X_df"] = X_df
+
+        def run(part_df: DFType, part_kwargs: dict[str, Any]) -> PartitionResult:
+            # the outputs of the call are collected instead of being set in
+            # the client, which is shared by the partitions
+            outputs: dict[str, Any] = {}
+            _current_call_outputs.set(outputs)
+            res = method(df=part_df, id_col=id_col, time_col=time_col, **part_kwargs)
+            return PartitionResult(
+                df=res,
+                weights_x=outputs.get("weights_x"),
+                feature_contributions=outputs.get("feature_contributions"),
+            )
+
+        if id_col not in df.columns:
+            # single series
+            yield contextvars.copy_context().run(run, df, kwargs)
+            return
+        # the frequency is inferred once, instead of in every partition
+        kwargs["freq"] = _maybe_infer_freq(df, kwargs.get("freq"), id_col, time_col)
+        df = ensure_sorted(df, id_col=id_col, time_col=time_col)
+        sizes = ufp.counts_by_id(df, id_col)["counts"].to_numpy().astype(np.int64)
+        h = kwargs.get("h", 0)
+        if num_partitions is None:
+            num_partitions = self._iter_num_partitions(df, X_df, sizes, h)
+        bounds = _partition_bounds(sizes + h, min(num_partitions, sizes.size))
+        indptr = np.append(0, sizes.cumsum())
+
+        def run_partition(start: int, end: int) -> PartitionResult:
+            part_kwargs = kwargs.copy()
+            part_df = ufp.take_rows(df, np.arange(indptr[start], indptr[end]))
+            if X_df is not None:
+                mask = ufp.is_in(X_df[id_col], part_df[id_col].unique())
+                part_kwargs["X_df"] = ufp.filter_with_mask(X_df, mask)
+            return run(part_df, part_kwargs)
+
+        # at most `max_concurrency` partitions are in flight, so the memory
+        # is bounded by them instead of by the whole job
+        to_submit = deque(zip(bounds[:-1], bounds[1:]))
+        pending: set[Future] = set()
+        executor = ThreadPoolExecutor(self._concurrency.max_concurrency)
+        try:
+            while to_submit or pending:
+                while to_submit and len(pending) < self._concurrency.max_concurrency:
+                    pending.add(
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            run_partition,
+                            *to_submit.popleft(),
+                        )
+                    )
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # e.g. the consumer stopped early or a partition failed
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def forecast_dataset(
+        self,
+        path: Union[str, Path, list[str]],
+        output_path: Union[str, Path],
+        h: _PositiveInt,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        level: Optional[list[Union[int, float]]] = None,
+        quantiles: Optional[list[float]] = None,
+        model: _Model = "timegpt-1",
+        batch_size: _PositiveInt = 100_000,
+        **kwargs: Any,
+    ) -> list[Path]:
+        """Forecast the time series of a parquet dataset using TimeGPT.
+
+        Streams the dataset, keeping only the last observations of each series
+        that the model needs, and forecasts the series in batches, which makes
+        it possible to process datasets larger than the memory. Requires
+        `pyarrow`.
+
+        Args:
+            path (str, Path or list of str): Path to the parquet dataset (a
+                file or a directory) or list of files. The rows must be sorted
+                by `id_col`. The order within a series doesn't matter.
+            output_path (str or Path): Directory where the forecasts are
+                written, as one parquet file per batch.
+            h (int): Forecast horizon.
+            freq (str, int or pandas offset, optional): Frequency of the
+                timestamps. If None, it's inferred from the first rows.
+                Defaults to None.
+            id_col (str): Column that identifies each series.
+                Defaults to 'unique_id'.
+            time_col (str): Column that identifies each timestep.
+                Defaults to 'ds'.
+            target_col (str): Column that contains the target.
+                Defaults to 'y'.
+            level (list[float], optional): Confidence levels between 0 and
+                100 for prediction intervals. Defaults to None.
+            quantiles (list[float], optional): Quantiles to forecast, list
+                between (0, 1). Defaults to None.
+            model (str): Model to use as a string. Defaults to 'timegpt-1'.
+            batch_size (int): Number of series forecasted together, which
+                bounds the memory used. Defaults to 100,000.
+            **kwargs: Other arguments of `forecast`. Exogenous features,
+                `add_history`, `finetune_steps` and `multivariate` aren't
+                supported, since they need the full history.
+
+        Returns:
+            list[Path]: Parquet files with the forecasts.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as pds
+        import pyarrow.parquet as pq
+
+        for arg in (
+            "X_df",
+            "hist_exog_list",
+            "add_history",
+            "finetune_steps",
+            "multivariate",
+            "date_features",
+        ):
+            if kwargs.get(arg):
+                raise ValueError(
+                    f"forecast_dataset doesn't support `{arg}`, since it only "
+                    "reads the last observations of the series."
+                )
+        dataset = pds.dataset(path, format="parquet")
+        batches = iter(dataset.to_batches(columns=[id_col, time_col, target_col]))
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return []
+        if freq is None:
+            freq = _maybe_infer_freq(first_batch.to_pandas(), None, id_col, time_col)
+        input_size, model_horizon = self._get_model_params(
+            self._maybe_override_model(model), _standardize_freq(freq)
+        )
+        n_tail = _restrict_input_samples(
+            level=level if quantiles is None else quantiles,
+            input_size=input_size,
+            model_horizon=model_horizon,
+            h=h,
+        )
+        output_path = Path(output_path)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        def forecast_batch(i: int, df: pd.DataFrame) -> Path:
+            fcst_df = self.forecast(
+                df=df,
+                h=h,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                quantiles=quantiles,
+                model=model,
+                **kwargs,
+            )
+            file = output_path / f"part-{i:05d}.parquet"
+            pq.write_table(pa.Table.from_pandas(fcst_df, preserve_index=False), file)
+            return file
+
+        # the next batch is read while the current one is forecasted, so at
+        # most two batches are in memory
+        files: list[Path] = []
+        executor = ThreadPoolExecutor(1)
+        in_flight: Optional[Future] = None
+        try:
+            for i, df in enumerate(
+                _series_complete_batches(
+                    itertools.chain([first_batch], batches),
+                    id_col=id_col,
+                    time_col=time_col,
+                    n_tail=n_tail,
+                    batch_size=batch_size,
+                )
+            ):
+                if in_flight is not None:
+                    files.append(in_flight.result())
+                in_flight = executor.submit(forecast_batch, i, df)
+            if in_flight is not None:
+                files.append(in_flight.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return files
+
+    def _iter_num_partitions(
+        self, df: DFType, X_df: Optional[DFType], sizes: np.ndarray, h: int
+    ) -> int:
+        min_partitions = min(self._concurrency.max_concurrency, sizes.size)
+        if self._partition_size_mb is None:
+            return min_partitions
+        # the columns other than the id, time and target are features
+        n_x = len(df.columns) - 3
+        n_x_future = 0 if X_df is None else len(X_df.columns) - 2
+        series = {
+            "sizes": sizes,
+            "X": [None] * n_x if n_x > 0 else None,
+            "X_future": [None] * n_x_future if n_x_future > 0 else None,
+        }
+        size_mb = _estimate_payload_size(series, h, self._payload_codec) / 2**20
+        return max(math.ceil(size_mb / self._partition_size_mb), min_partitions)
+
+    def plot(
+        self,
+        df: Optional[DataFrame] = None,
+        forecasts_df: Optional[DataFrame] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        unique_ids: Union[Optional[list[str]], np.ndarray] = None,
+        plot_random: bool = True,
+        max_ids: int = 8,
+        models: Optional[list[str]] = None,
+        level: Optional[list[Union[int, float]]] = None,
+        max_insample_length: Optional[int] = None,
+        plot_anomalies: bool = False,
+        engine: Literal["matplotlib", "plotly", "plotly-resampler"] = "matplotlib",
+        resampler_kwargs: Optional[dict] = None,
+        ax: Optional[
+            Union["plt.Axes", np.ndarray, "plotly.graph_objects.Figure"]
+        ] = None,
+    ):
+        """Plot forecasts and insample values.
+
+        Args:
+            df (pandas or polars DataFrame): The DataFrame on which the
+                function will operate. Expected to contain at least the
+                following columns:
+                - time_col:
+                    Column name in `df` that contains the time indices of
+                    the time series. This is typically a datetime column
+                    with regular intervals, e.g., hourly, daily, monthly
+                    data points.
+                - target_col:
+                    Column name in `df` that contains the target variable of
+                    the time series, i.e., the variable we wish to predict
+                    or analyze.
+                Additionally, you can pass multiple time series (stacked in
+                    the dataframe) considering an additional column:
+                - id_col:
+                    Column name in `df` that identifies unique time series.
+                    Each unique value in this column corresponds to a unique
+                    time series.
+            forecasts_df (pandas or polars DataFrame, optional): DataFrame with
+                columns [`unique_id`, `ds`] and models. Defaults to None.
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            unique_ids (list[str], optional): Time Series to plot. If None,
+                time series are selected randomly. Defaults to None.
+            plot_random (bool):
+                Select time series to plot randomly. Defaults to True.
+            max_ids (int):
+                Maximum number of ids to plot. Defaults to 8.
+            models (list[str], optional): List of models to plot. Defaults to
+                None.
+            level (list[float], optional): List of prediction intervals to
+                plot if paseed. Defaults to None.
+            max_insample_length (int, optional): Max number of train/insample
+                observations to be plotted. Defaults to None.
+            plot_anomalies (bool): Plot anomalies for each prediction interval.
+                Defaults to False.
+            engine (str): Library used to plot. 'matplotlib', 'plotly' or
+                'plotly-resampler'. Defaults to 'matplotlib'.
+            resampler_kwargs (dict): Kwargs to be passed to plotly-resampler
+                constructor. For further custumization ("show_dash") call
+                the method, store the plotting object and add the extra
+                arguments to its `show_dash` method.
+            ax (matplotlib axes, array of matplotlib axes or plotly Figure,
+                optional): Object where plots will be added. Defaults to None.
+        """
+        try:
+            from utilsforecast.plotting import plot_series
+        except ModuleNotFoundError:
+            raise Exception(
+                "You have to install additional dependencies to use this method, "
+                'please install them using `pip install "nixtla[plotting]"`'
+            )
+        if df is not None and id_col not in df.columns:
+            df = ufp.copy_if_pandas(df, deep=False)
+            df = ufp.assign_columns(df, id_col, "ts_0")
+        df = ensure_time_dtype(df, time_col=time_col)
+        if forecasts_df is not None:
+            if id_col not in forecasts_df.columns:
+                forecasts_df = ufp.copy_if_pandas(forecasts_df, deep=False)
+                forecasts_df = ufp.assign_columns(forecasts_df, id_col, "ts_0")
+            forecasts_df = ensure_time_dtype(forecasts_df, time_col=time_col)
+            if "anomaly" in forecasts_df.columns:
+                # special case to plot outputs
+                # from detect_anomalies
+                df = None
+                forecasts_df = ufp.drop_columns(forecasts_df, "anomaly")
+                cols = [
+                    c.replace("TimeGPT-lo-", "")
+                    for c in forecasts_df.columns
+                    if "TimeGPT-lo-" in c
+                ]
+                level = [float(c) if "." in c else int(c) for c in cols]
+                plot_anomalies = True
+                models = ["TimeGPT"]
+        return plot_series(
+            df=df,
+            forecasts_df=forecasts_df,
+            ids=unique_ids,
+            plot_random=plot_random,
+            max_ids=max_ids,
+            models=models,
+            level=level,
+            max_insample_length=max_insample_length,
+            plot_anomalies=plot_anomalies,
+            engine=engine,
+            resampler_kwargs=resampler_kwargs,
+            palette="tab20b",
+            id_col=id_col,
+            time_col=time_col,
+            target_col=target_col,
+            ax=ax,
+        )
+
+    @staticmethod
+    def audit_data(
+        df: AnyDFType,
+        freq: _Freq,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        start: Union[str, int, datetime.date, datetime.datetime] = "per_serie",
+        end: Union[str, int, datetime.date, datetime.datetime] = "global",
+    ) -> tuple[bool, dict[str, DataFrame], dict[str, DataFrame]]:
+        """Audit data quality.
+
+        Args:
+            df (pandas or polars DataFrame): The dataframe to be audited.
+            freq (str, int or pandas offset): Frequency of the timestamps.
+                Must be specified. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            start (Union[str, int, datetime.date, datetime.datetime], optional):
+                Initial timestamp for the series.
+                    * 'per_serie' uses each series first timestamp
+                    * 'global' uses the first timestamp seen in the data
+                    * Can also be a specific timestamp or integer,
+                    e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
+                , by default "per_serie"
+            end (Union[str, int, datetime.date, datetime.datetime], optional):
+                Final timestamp for the series.
+                    * 'per_serie' uses each series last timestamp
+                    * 'global' uses the last timestamp seen in the data
+                    * Can also be a specific timestamp or integer,
+                    e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
+                , by default "global"
+
+        Returns:
+            tuple[bool, dict[str, DataFrame], dict[str, DataFrame]]:
+                Tuple containing:
+                - bool: True if all tests pass, False otherwise
+                - dict: Dictionary mapping test IDs to error DataFrames for failed
+                        tests or None if the test could not be performed.
+                - dict: Dictionary mapping test IDs to error DataFrames for
+                        case-specific tests.
+
+                Test IDs:
+                - D001: Test for duplicate rows
+                - D002: Test for missing dates
+                - F001: Test for presence of categorical feature columns
+                - V001: Test for negative values
+                - V002: Test for leading zeros
+        """
+        df = ensure_time_dtype(df, time_col=time_col)
+
+        logger.info("Running data quality tests...")
+        pass_D001, error_df_D001 = _audit_duplicate_rows(df, id_col, time_col)
+        pass_D002, error_df_D002 = AuditDataSeverity.FAIL, None
+        if pass_D001 != AuditDataSeverity.FAIL:
+            # If data has duplicate rows, missing dates can not be added by fill_gaps.
+            # Duplicate rows issue needs to be resolved first.
+            pass_D002, error_df_D002 = _audit_missing_dates(
+                df, freq, id_col, time_col, start, end
+            )
+        pass_F001, error_df_F001 = _audit_categorical_variables(df, id_col, time_col)
+        pass_V001, error_df_V001 = _audit_negative_values(df, target_col)
+        pass_V002, error_df_V002 = _audit_leading_zeros(
+            df, id_col, time_col, target_col
+        )
+
+        fail_dict, case_specific_dict = {}, {}
+        test_ids = ["D001", "D002", "F001", "V001", "V002"]
+        pass_vals = [pass_D001, pass_D002, pass_F001, pass_V001, pass_V002]
+        error_dfs = [
+            error_df_D001,
+            error_df_D002,
+            error_df_F001,
+            error_df_V001,
+            error_df_V002,
+        ]
+        all_pass = True
+
+        for test_id, pass_val, error_df in zip(test_ids, pass_vals, error_dfs):
+            # Only include errors for failed or case specific tests
+            if pass_val == AuditDataSeverity.FAIL:
+                all_pass = False
+                if error_df is not None:
+                    logger.warning(
+                        f"Failure {test_id} detected with critical severity."
+                    )
+                else:
+                    logger.warning(f"Test {test_id} could not be performed.")
+                fail_dict[test_id] = error_df
+
+            if pass_val == AuditDataSeverity.CASE_SPECIFIC:
+                all_pass = False
+                logger.warning(
+                    f"Failure {test_id} detected which could cause issue depending on the use case."
+                )
+                case_specific_dict[test_id] = error_df
+
+        if all_pass:
+            logger.info("All checks passed...")
+        return all_pass, fail_dict, case_specific_dict
+
+    def clean_data(
+        self,
+        df: AnyDFType,
+        fail_dict: dict[str, DataFrame],
+        case_specific_dict: dict[str, DataFrame],
+        freq: _Freq,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        clean_case_specific: bool = False,
+        agg_dict: Optional[dict[str, Union[str, Callable]]] = None,
+    ) -> tuple[AnyDFType, bool, dict[str, DataFrame], dict[str, DataFrame]]:
+        """Clean the data. This should be run after running `audit_data`.
+
+        Args:
+            df (AnyDFType): The dataframe to be cleaned
+            fail_dict (dict[str, DataFrame]): The failure dictionary from the
+                audit_data method.
+            case_specific_dict (dict[str, DataFrame]): The case specific
+                dictionary from the audit_data method.
+            freq (str, int or pandas offset): Frequency of the timestamps.
+                Must be specified. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
+            id_col (str): Column that identifies each series. Defaults to
+                'unique_id'.
+            time_col (str): Column that identifies each timestep, its values
+                can be timestamps or integers. Defaults to 'ds'.
+            target_col (str): Column that contains the target. Defaults to 'y'.
+            clean_case_specific (bool, optional): If True, clean case
+                specific issues. Defaults to False.
+            agg_dict (Optional[dict[str, Union[str, Callable]]], optional):
+                The aggregation methods to use when there are duplicate rows (D001),
+                by default None
+
+        Returns:
+            tuple[AnyDFType, bool, dict[str, DataFrame], dict[str, DataFrame]]:
+                Tuple containing:
+                - AnyDFType: The cleaned dataframe
+                - The three outputs from audit_data that are run at the end of cleansing.
+
+        Raises:
+            ValueError: Any exceptions during the cleaning process.
+        """
+        df = ensure_time_dtype(df, time_col=time_col)
+        logger.info("Running data cleansing...")
+
+        if fail_dict:
+            if "D001" in fail_dict:
+                try:
+                    logger.info("Fixing D001: Cleaning duplicate rows...")
+
+                    if agg_dict is None:
+                        raise ValueError(
+                            "agg_dict must be provided to resolve D001 failure."
+                        )
+
+                    # Get all columns except id_col and time_col
+                    other_cols = [
+                        col for col in df.columns if col not in [id_col, time_col]
+                    ]
+
+                    # Verify all columns have aggregation rules
+                    missing_cols = [col for col in other_cols if col not in agg_dict]
+                    if missing_cols:
+                        raise ValueError(
+                            f"D001: Missing aggregation rules for columns: {missing_cols}. "
+                            "Please provide aggregation rules for all columns in agg_dict."
+                        )
+                    if isinstance(df, pl_DataFrame):
+                        df = _polars_agg_duplicates(df, id_col, time_col, agg_dict)
+                    else:
+                        df = df.groupby([id_col, time_col], as_index=False).agg(
+                            agg_dict
+                        )
+                except Exception as e:
+                    raise ValueError(f"Error cleaning duplicate rows D001: {e}")
+            if "D002" in fail_dict:
+                try:
+                    missing = fail_dict.get("D002")
+                    if missing is None:
+                        logger.warning(
+                            "D002: Missing dates could not be checked by audit_data. "
+                            "Hence not filling missing dates..."
+                        )
+                    else:
+                        logger.info("Fixing D002: Filling missing dates...")
+                        if isinstance(df, pl_DataFrame):
+                            import polars as pl
+
+                            df = pl.concat([df, missing], how="diagonal_relaxed")
+                        else:
+                            df = pd.concat([df, missing])
+                except Exception as e:
+                    raise ValueError(f"Error filling missing dates D002: {e}")
+
+        if case_specific_dict and clean_case_specific:
+            if "V001" in case_specific_dict:
+                try:
+                    logger.info("Fixing V001: Removing negative values...")
+                    if isinstance(df, pl_DataFrame):
+                        import polars as pl
+
+                        y = pl.col(target_col)
+                        df = df.with_columns(
+                            pl.when(y < 0).then(0).otherwise(y).alias(target_col)
+                        )
+                    else:
+                        df.loc[df[target_col] < 0, target_col] = 0
+                except Exception as e:
+                    raise ValueError(f"Error removing negative values V001: {e}")
+
+            if "V002" in case_specific_dict:
+                try:
+                    logger.info("Fixing V002: Removing leading zeros...")
+                    leading_zeros_df = case_specific_dict["V002"]
+                    if isinstance(df, pl_DataFrame):
+                        df = _polars_drop_leading_zeros(
+                            df, leading_zeros_df[id_col], id_col, time_col, target_col
+                        )
+                    else:
+                        leading_zeros_dict = leading_zeros_df.set_index(id_col)[
+                            "first_nonzero_index"
+                        ].to_dict()
+                        df = df.groupby(id_col, group_keys=False).apply(
+                            lambda group: group.loc[
+                                group.index
+                                >= leading_zeros_dict.get(group.name, group.index[0])
+                            ]
+                        )
+                except Exception as e:
+                    raise ValueError(f"Error removing leading zeros V002: {e}")
+
+        # Run data quality checks on the cleaned data
+        all_pass, error_dfs, case_specific_dfs = self.audit_data(
+            df=df, freq=freq, id_col=id_col, time_col=time_col
+        )
+
+        return df, all_pass, error_dfs, case_specific_dfs
+
+
+class AsyncNixtlaClient(NixtlaClient):
+    def __init__(self, **kwargs: Any):
+        """
+        Asynchronous client to interact with the Nixtla API.
+
+        Provides coroutine versions of the forecasting methods (prefixed
+        with `a`, e.g. `aforecast`), which share the validations,
+        preprocessing and outputs of the `NixtlaClient` methods but don't
+        block the event loop while waiting for the API. Only pandas and
+        polars DataFrames are supported.
+
+        Args:
+            **kwargs: Arguments used to build the client, see `NixtlaClient`.
+        """
+        super().__init__(**kwargs)
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    def _make_async_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        return httpx.AsyncClient(**kwargs)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = self._make_async_client(**self._client_kwargs)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pools."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    async def __aenter__(self) -> "AsyncNixtlaClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["_async_client"] = None
+        return state
+
+    async def _amake_request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+        encoded: Optional[_EncodedPayload] = None,
+    ) -> dict[str, Any]:
+        if encoded is None or encoded.codec != self._codec_for(endpoint):
+            # serialization and compression are CPU bound, so we run them in
+            # a thread to keep the event loop responsive
+            encoded = await asyncio.to_thread(
+                self._encode, endpoint, payload, multithreaded_compress
+            )
+        codec, content, headers = encoded
+        await self._await_rate_limiter(client)
+        with _circuit_breaker_guard(self._circuit_breaker):
+            resp = await client.post(
+                url=endpoint,
+                content=content,
+                headers=headers,
+                timeout=self._request_timeout(),
+            )
+            try:
+                return _decode_response(resp)
+            except ApiError as e:
+                self._maybe_drain_rate_limiter(e)
+                if not self._maybe_fallback_to_json(endpoint, codec, e):
+                    raise
+        return await self._amake_request(
+            client, endpoint, payload, multithreaded_compress
+        )
+
+    async def _await_rate_limiter(self, client: httpx.AsyncClient) -> None:
+        limiter = self._rate_limiter
+        if limiter is None:
+            return
+        if not limiter._seeded:
+            await _single_flight.arun(
+                ("usage", id(limiter)), lambda: self._aseed_rate_limiter(client)
+            )
+        # the file and redis limiters do blocking IO
+        delay = await asyncio.to_thread(limiter.acquire)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _aseed_rate_limiter(self, client: httpx.AsyncClient) -> None:
+        assert self._rate_limiter is not None
+        if self._rate_limiter._seeded:
+            return
+        try:
+            usage = await self._aget_request(client, "/usage")
+        except (ApiError, httpx.HTTPError, ValueError) as e:
+            logger.warning(
+                f"Could not get the usage limits, requests won't be paced: {e}"
+            )
+            usage = {}
+        await asyncio.to_thread(self._rate_limiter._seed, usage)
+
+    async def _amake_request_with_retries(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool = True,
+    ) -> dict[str, Any]:
+        make_request = self._amake_request
+        if self._hedging is not None and endpoint in _CACHEABLE_ENDPOINTS:
+            make_request = self._amake_hedged_request
+        return await self._retry_strategy(make_request)(
+            client=client,
+            endpoint=endpoint,
+            payload=payload,
+            multithreaded_compress=multithreaded_compress,
+        )
+
+    async def _amake_hedged_request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+    ) -> dict[str, Any]:
+        assert self._hedging is not None
+        delay = self._hedging.start()
+        if delay is None:
+            return await self._amake_timed_request(
+                client, endpoint, payload, multithreaded_compress
+            )
+
+        def submit() -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._amake_timed_request(
+                    client, endpoint, payload, multithreaded_compress
+                )
+            )
+
+        attempts = {submit(): False}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            hedged = not done and self._hedging.try_hedge()
+            if hedged:
+                attempts[submit()] = True
+            error: Optional[Exception] = None
+            while attempts:
+                done, _ = await asyncio.wait(attempts, return_when=FIRST_COMPLETED)
+                for task in done:
+                    is_hedge = attempts.pop(task)
+                    try:
+                        resp = task.result()
+                    except Exception as e:
+                        error = error or e
+                        continue
+                    if hedged:
+                        self._hedging.on_hedge_result(hedge_won=is_hedge)
+                    return resp
+            assert error is not None
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _amake_timed_request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+    ) -> dict[str, Any]:
+        assert self._hedging is not None
+        start = time.perf_counter()
+        resp = await self._amake_request(
+            client, endpoint, payload, multithreaded_compress
+        )
+        self._hedging.on_success(time.perf_counter() - start)
+        return resp
+
+    async def _aget_request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        with _circuit_breaker_guard(self._circuit_breaker):
+            resp = await client.get(
+                endpoint, params=params, timeout=self._request_timeout()
+            )
+            resp_body = resp.json()
+            if resp.status_code != 200:
+                raise ApiError._from_response(resp, resp_body)
+        return resp_body
+
+    async def _amake_partitioned_requests(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payloads: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        results, checkpoint = await asyncio.to_thread(
+            self._load_checkpoint, endpoint, payloads
+        )
+        make_request = self._retry_strategy(self._amake_controlled_request)
+        to_submit = deque(i for i in range(len(payloads)) if not results[i])
+        task2pos: dict[asyncio.Task, int] = {}
+        error: Optional[Exception] = None
+        deadline = _current_deadline.get()
+        timed_out: list[int] = []
+        # encodes the partitions ahead of the requests, as in the sync client
+        encoder = ThreadPoolExecutor(1)
+        encoding: dict[int, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        slots = _current_step_slots.get()
+        if not isinstance(slots, _AsyncStepSlots):
+            slots = _AsyncStepSlots(self._concurrency)
+        try:
+            while (to_submit and error is None) or task2pos:
+                n_encode = self._concurrency.limit - len(task2pos) + _ENCODE_AHEAD
+                for pos in itertools.islice(to_submit, max(n_encode, 0)):
+                    if error is None and pos not in encoding:
+                        encoding[pos] = loop.run_in_executor(
+                            encoder, self._encode, endpoint, payloads[pos], True
+                        )
+                timeout = None
+                if deadline is not None and deadline.expires_at is not None:
+                    timeout = deadline.remaining()
+                # the slots are shared with the other calls of the step, as in
+                # the sync client
+                while (
+                    error is None
+                    and to_submit
+                    and await slots.acquire(timeout if not task2pos else 0)
+                ):
+                    pos = to_submit.popleft()
+                    task = asyncio.ensure_future(
+                        self._asend_partition(
+                            make_request,
+                            client,
+                            endpoint,
+                            payloads[pos],
+                            encoding.pop(pos),
+                        )
+                    )
+                    task.add_done_callback(lambda _: slots.release())
+                    task2pos[task] = pos
+                if not task2pos:
+                    # the deadline expired while waiting for a slot
+                    break
+                done, _ = await asyncio.wait(
+                    task2pos, timeout=timeout, return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    # the deadline expired
+                    for task in task2pos:
+                        task.cancel()
+                    break
+                for task in done:
+                    pos = task2pos.pop(task)
+                    try:
+                        results[pos] = task.result()
+                    except Exception as e:
+                        if deadline is not None and (
+                            deadline.remaining() == 0 or isinstance(e, TimeoutError)
+                        ):
+                            timed_out.append(pos)
+                        else:
+                            error = error or e
+                        continue
+                    if checkpoint is not None:
+                        checkpoint.save(pos, results[pos])
+        except BaseException:
+            for task in task2pos:
+                task.cancel()
+            raise
+        finally:
+            for fut in encoding.values():
+                # retrieves the errors of the partitions that weren't sent
+                if not fut.cancel() and not fut.cancelled():
+                    fut.exception()
+            encoder.shutdown(wait=False, cancel_futures=True)
+        if error is not None:
+            raise error
+        missing = [*to_submit, *task2pos.values(), *timed_out]
+        if missing:
+            assert deadline is not None
+            self._fill_missing_partitions(results, payloads, missing, deadline)
+        resp = _merge_partitioned_results(results, payloads)
+        if checkpoint is not None and not missing:
+            checkpoint.clear()
+        return resp
+
+    @staticmethod
+    async def _asend_partition(
+        make_request: Callable[..., Awaitable[dict[str, Any]]],
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        encoding: "asyncio.Future[_EncodedPayload]",
+    ) -> dict[str, Any]:
+        resp = await make_request(
+            client=client,
+            endpoint=endpoint,
+            payload=payload,
+            multithreaded_compress=False,
+            encoded=await encoding,
+        )
+        return await asyncio.to_thread(_compact_partition_result, resp)
+
+    async def _amake_controlled_request(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: dict[str, Any],
+        multithreaded_compress: bool,
+        encoded: Optional[_EncodedPayload] = None,
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            resp = await self._amake_request(
+                client, endpoint, payload, multithreaded_compress, encoded
+            )
+        except Exception as e:
+            self._concurrency.on_error(e)
+            raise
+        self._concurrency.on_success(time.perf_counter() - start)
+        return resp
+
+    async def _acall_api(
+        self, client: httpx.AsyncClient, call: _ApiCall
+    ) -> dict[str, Any]:
+        if call.single_flight_key is not None:
+            return await _single_flight.arun(
+                call.single_flight_key,
+                lambda: self._acall_api(client, call._replace(single_flight_key=None)),
+            )
+        if call.method == "get":
+            return await self._retry_strategy(self._aget_request)(
+                client, call.endpoint, call.payload
+            )
+        cache_key = await asyncio.to_thread(self._cache_key, call)
+        if cache_key is not None:
+            resp = await asyncio.to_thread(self._cache.get, cache_key)
+            if resp is not None:
+                return resp
+        resp = await self._apost(client, call)
+        if cache_key is not None and not _is_partial():
+            await asyncio.to_thread(self._cache.set, cache_key, resp)
+        return resp
+
+    async def _apost(self, client: httpx.AsyncClient, call: _ApiCall) -> dict[str, Any]:
+        num_partitions = self._num_partitions(call)
+        if num_partitions is None:
+            slots = _current_step_slots.get()
+            if not isinstance(slots, _AsyncStepSlots):
+                return await self._apost_request(client, call)
+            # a request that isn't partitioned takes one of the slots of the step
+            deadline = _current_deadline.get()
+            timeout = None
+            if deadline is not None and deadline.expires_at is not None:
+                timeout = deadline.remaining()
+            if not await slots.acquire(timeout):
+                assert deadline is not None
+                raise deadline.error()
+            try:
+                return await self._apost_request(client, call)
+            finally:
+                slots.release()
+        payloads = _partition_series(call.payload, num_partitions, call.h)
+        return await self._amake_partitioned_requests(client, call.endpoint, payloads)
+
+    async def _apost_request(
+        self, client: httpx.AsyncClient, call: _ApiCall
+    ) -> dict[str, Any]:
+        request = self._amake_request_with_retries(client, call.endpoint, call.payload)
+        deadline = _current_deadline.get()
+        if deadline is None or deadline.expires_at is None:
+            return await request
+        # the request timeouts don't account for slow coroutines
+        try:
+            return await asyncio.wait_for(request, deadline.remaining())
+        except asyncio.TimeoutError:
+            raise deadline.error() from None
+
+    async def _acall_apis(
+        self, client: httpx.AsyncClient, calls: list[_ApiCall]
+    ) -> list[dict[str, Any]]:
+        # the calls of a step share the concurrency limit, as in `_call_apis`.
+        # The tasks start with a copy of the context, which holds the slots.
+        token = _current_step_slots.set(_AsyncStepSlots(self._concurrency))
+        try:
+            return await _gather(*[self._acall_api(client, c) for c in calls])
+        finally:
+            _current_step_slots.reset(token)
+
+    async def _arun(
+        self,
+        steps: _Steps[_T],
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> _T:
+        with self._collect_retry_stats(), self._deadline(timeout_total, on_timeout):
+            try:
+                calls = next(steps)
+                while True:
+                    client = self._get_async_client()
+                    try:
+                        resps = await self._acall_apis(client, calls)
+                    except Exception as e:
+                        calls = steps.throw(e)
+                    else:
+                        calls = steps.send(resps)
+            except StopIteration as stop:
+                return stop.value
+
+    async def aforecast(
+        self,
+        df: AnyDFType,
+        h: _PositiveInt,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        X_df: Optional[AnyDFType] = None,
+        level: Optional[list[Union[int, float]]] = None,
+        quantiles: Optional[list[float]] = None,
+        finetune_steps: _NonNegativeInt = 0,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        finetuned_model_id: Optional[str] = None,
+        clean_ex_first: bool = True,
+        hist_exog_list: Optional[list[str]] = None,
+        validate_api_key: bool = False,
+        add_history: bool = False,
+        date_features: Union[bool, list[Union[str, Callable]]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+        model: _Model = "timegpt-1",
+        num_partitions: Optional[_PositiveInt] = None,
+        feature_contributions: bool = False,
+        model_parameters: _ExtraParamDataType = None,
+        multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+        history_window: Optional[_PositiveInt] = None,
+    ) -> DataFrame:
+        """Asynchronous version of `NixtlaClient.forecast`.
+
+        See `NixtlaClient.forecast` for a description of the arguments
+        and the output."""
+        _ensure_local_df(df, method="aforecast")
+        return await self._arun(
+            self._forecast(
+                df=df,
+                h=h,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                X_df=X_df,
+                level=level,
+                quantiles=quantiles,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                finetuned_model_id=finetuned_model_id,
+                clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
+                validate_api_key=validate_api_key,
+                add_history=add_history,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                feature_contributions=feature_contributions,
+                model_parameters=model_parameters,
+                multivariate=multivariate,
+                history_window=history_window,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
+        )
+
+    async def adetect_anomalies(
+        self,
+        df: AnyDFType,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        level: Union[int, float] = 99,
+        finetuned_model_id: Optional[str] = None,
+        clean_ex_first: bool = True,
+        validate_api_key: bool = False,
+        date_features: Union[bool, list[str]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+        model: _Model = "timegpt-1",
+        num_partitions: Optional[_PositiveInt] = None,
+        multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> DataFrame:
+        """Asynchronous version of `NixtlaClient.detect_anomalies`.
+
+        See `NixtlaClient.detect_anomalies` for a description of the arguments
+        and the output."""
+        _ensure_local_df(df, method="adetect_anomalies")
+        return await self._arun(
+            self._detect_anomalies(
+                df=df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                finetuned_model_id=finetuned_model_id,
+                clean_ex_first=clean_ex_first,
+                validate_api_key=validate_api_key,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                multivariate=multivariate,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
+        )
+
+    async def adetect_anomalies_online(
+        self,
+        df: AnyDFType,
+        h: _PositiveInt,
+        detection_size: _PositiveInt,
+        threshold_method: _ThresholdMethod = "univariate",
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        level: Union[int, float] = 99,
+        clean_ex_first: bool = True,
+        step_size: Optional[_PositiveInt] = None,
+        finetune_steps: _NonNegativeInt = 0,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        hist_exog_list: Optional[list[str]] = None,
+        date_features: Union[bool, list[str]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+        model: _Model = "timegpt-1",
+        refit: bool = False,
+        num_partitions: Optional[_PositiveInt] = None,
+        multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> DataFrame:
+        """Asynchronous version of `NixtlaClient.detect_anomalies_online`.
+
+        See `NixtlaClient.detect_anomalies_online` for a description of the arguments
+        and the output."""
+        _ensure_local_df(df, method="adetect_anomalies_online")
+        return await self._arun(
+            self._detect_anomalies_online(
+                df=df,
+                h=h,
+                detection_size=detection_size,
+                threshold_method=threshold_method,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                clean_ex_first=clean_ex_first,
+                step_size=step_size,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                refit=refit,
+                num_partitions=num_partitions,
+                multivariate=multivariate,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
+        )
+
+    async def across_validation(
+        self,
+        df: AnyDFType,
+        h: _PositiveInt,
+        freq: Optional[_Freq] = None,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        target_col: str = "y",
+        level: Optional[list[Union[int, float]]] = None,
+        quantiles: Optional[list[float]] = None,
+        validate_api_key: bool = False,
+        n_windows: _PositiveInt = 1,
+        step_size: Optional[_PositiveInt] = None,
+        finetune_steps: _NonNegativeInt = 0,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        finetuned_model_id: Optional[str] = None,
+        refit: bool = True,
+        clean_ex_first: bool = True,
+        hist_exog_list: Optional[list[str]] = None,
+        date_features: Union[bool, list[str]] = False,
+        date_features_to_one_hot: Union[bool, list[str]] = False,
+        model: _Model = "timegpt-1",
+        num_partitions: Optional[_PositiveInt] = None,
+        model_parameters: _ExtraParamDataType = None,
+        multivariate: bool = False,
+        timeout_total: Optional[float] = None,
+        on_timeout: _OnTimeout = "raise",
+    ) -> DataFrame:
+        """Asynchronous version of `NixtlaClient.cross_validation`.
+
+        See `NixtlaClient.cross_validation` for a description of the arguments
+        and the output."""
+        _ensure_local_df(df, method="across_validation")
+        return await self._arun(
+            self._cross_validation(
+                df=df,
+                h=h,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                level=level,
+                quantiles=quantiles,
+                validate_api_key=validate_api_key,
+                n_windows=n_windows,
+                step_size=step_size,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                finetuned_model_id=finetuned_model_id,
+                refit=refit,
+                clean_ex_first=clean_ex_first,
+                hist_exog_list=hist_exog_list,
+                date_features=date_features,
+                date_features_to_one_hot=date_features_to_one_hot,
+                model=model,
+                num_partitions=num_partitions,
+                model_parameters=model_parameters,
+                multivariate=multivariate,
+            ),
+            timeout_total=timeout_total,
+            on_timeout=on_timeout,
         )
 
-    @staticmethod
-    def audit_data(
-        df: AnyDFType,
-        freq: _Freq,
+    async def afinetune(
+        self,
+        df: DataFrame,
+        freq: Optional[_Freq] = None,
         id_col: str = "unique_id",
         time_col: str = "ds",
         target_col: str = "y",
-        start: Union[str, int, datetime.date, datetime.datetime] = "per_serie",
-        end: Union[str, int, datetime.date, datetime.datetime] = "global",
-    ) -> tuple[bool, dict[str, DataFrame], dict[str, DataFrame]]:
-        """Audit data quality.
-
-        Args:
-            df (pandas or polars DataFrame): The dataframe to be audited.
-            freq (str, int or pandas offset): Frequency of the timestamps.
-                Must be specified. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-            id_col (str): Column that identifies each series. Defaults to
-                'unique_id'.
-            time_col (str): Column that identifies each timestep, its values
-                can be timestamps or integers. Defaults to 'ds'.
-            target_col (str): Column that contains the target. Defaults to 'y'.
-            start (Union[str, int, datetime.date, datetime.datetime], optional):
-                Initial timestamp for the series.
-                    * 'per_serie' uses each series first timestamp
-                    * 'global' uses the first timestamp seen in the data
-                    * Can also be a specific timestamp or integer,
-                    e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
-                , by default "per_serie"
-            end (Union[str, int, datetime.date, datetime.datetime], optional):
-                Final timestamp for the series.
-                    * 'per_serie' uses each series last timestamp
-                    * 'global' uses the last timestamp seen in the data
-                    * Can also be a specific timestamp or integer,
-                    e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
-                , by default "global"
-
-        Returns:
-            tuple[bool, dict[str, DataFrame], dict[str, DataFrame]]:
-                Tuple containing:
-                - bool: True if all tests pass, False otherwise
-                - dict: Dictionary mapping test IDs to error DataFrames for failed
-                        tests or None if the test could not be performed.
-                - dict: Dictionary mapping test IDs to error DataFrames for
-                        case-specific tests.
-
-                Test IDs:
-                - D001: Test for duplicate rows
-                - D002: Test for missing dates
-                - F001: Test for presence of categorical feature columns
-                - V001: Test for negative values
-                - V002: Test for leading zeros
-        """
-        df = ensure_time_dtype(df, time_col=time_col)
+        finetune_steps: _NonNegativeInt = 10,
+        finetune_depth: _FinetuneDepth = 1,
+        finetune_loss: _Loss = "default",
+        output_model_id: Optional[str] = None,
+        finetuned_model_id: Optional[str] = None,
+        model: _Model = "timegpt-1",
+    ) -> str:
+        """Asynchronous version of `NixtlaClient.finetune`.
 
-        logger.info("Running data quality tests...")
-        pass_D001, error_df_D001 = _audit_duplicate_rows(df, id_col, time_col)
-        pass_D002, error_df_D002 = AuditDataSeverity.FAIL, None
-        if pass_D001 != AuditDataSeverity.FAIL:
-            # If data has duplicate rows, missing dates can not be added by fill_gaps.
-            # Duplicate rows issue needs to be resolved first.
-            pass_D002, error_df_D002 = _audit_missing_dates(
-                df, freq, id_col, time_col, start, end
+        See `NixtlaClient.finetune` for a description of the arguments
+        and the output."""
+        return await self._arun(
+            self._finetune(
+                df=df,
+                freq=freq,
+                id_col=id_col,
+                time_col=time_col,
+                target_col=target_col,
+                finetune_steps=finetune_steps,
+                finetune_depth=finetune_depth,
+                finetune_loss=finetune_loss,
+                output_model_id=output_model_id,
+                finetuned_model_id=finetuned_model_id,
+                model=model,
             )
-        pass_F001, error_df_F001 = _audit_categorical_variables(df, id_col, time_col)
-        pass_V001, error_df_V001 = _audit_negative_values(df, target_col)
-        pass_V002, error_df_V002 = _audit_leading_zeros(
-            df, id_col, time_col, target_col
         )
 
-        fail_dict, case_specific_dict = {}, {}
-        test_ids = ["D001", "D002", "F001", "V001", "V002"]
-        pass_vals = [pass_D001, pass_D002, pass_F001, pass_V001, pass_V002]
-        error_dfs = [
-            error_df_D001,
-            error_df_D002,
-            error_df_F001,
-            error_df_V001,
-            error_df_V002,
-        ]
-        all_pass = True
 
-        for test_id, pass_val, error_df in zip(test_ids, pass_vals, error_dfs):
-            # Only include errors for failed or case specific tests
-            if pass_val == AuditDataSeverity.FAIL:
-                all_pass = False
-                if error_df is not None:
-                    logger.warning(
-                        f"Failure {test_id} detected with critical severity."
-                    )
-                else:
-                    logger.warning(f"Test {test_id} could not be performed.")
-                fail_dict[test_id] = error_df
+class _BatchRequest(NamedTuple):
+    df: pd.DataFrame
+    X_df: Optional[pd.DataFrame]
+    future: "Future[pd.DataFrame]"
 
-            if pass_val == AuditDataSeverity.CASE_SPECIFIC:
-                all_pass = False
-                logger.warning(
-                    f"Failure {test_id} detected which could cause issue depending on the use case."
-                )
-                case_specific_dict[test_id] = error_df
 
-        if all_pass:
-            logger.info("All checks passed...")
-        return all_pass, fail_dict, case_specific_dict
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
 
-    def clean_data(
-        self,
-        df: AnyDFType,
-        fail_dict: dict[str, DataFrame],
-        case_specific_dict: dict[str, DataFrame],
-        freq: _Freq,
-        id_col: str = "unique_id",
-        time_col: str = "ds",
-        target_col: str = "y",
-        clean_case_specific: bool = False,
-        agg_dict: Optional[dict[str, Union[str, Callable]]] = None,
-    ) -> tuple[AnyDFType, bool, dict[str, DataFrame], dict[str, DataFrame]]:
-        """Clean the data. This should be run after running `audit_data`.
 
-        Args:
-            df (AnyDFType): The dataframe to be cleaned
-            fail_dict (dict[str, DataFrame]): The failure dictionary from the
-                audit_data method.
-            case_specific_dict (dict[str, DataFrame]): The case specific
-                dictionary from the audit_data method.
-            freq (str, int or pandas offset): Frequency of the timestamps.
-                Must be specified. See [pandas' available frequencies](https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#offset-aliases).
-            id_col (str): Column that identifies each series. Defaults to
-                'unique_id'.
-            time_col (str): Column that identifies each timestep, its values
-                can be timestamps or integers. Defaults to 'ds'.
-            target_col (str): Column that contains the target. Defaults to 'y'.
-            clean_case_specific (bool, optional): If True, clean case
-                specific issues. Defaults to False.
-            agg_dict (Optional[dict[str, Union[str, Callable]]], optional):
-                The aggregation methods to use when there are duplicate rows (D001),
-                by default None
+def _is_input_error(error: Exception) -> bool:
+    # errors caused by the data or the arguments, instead of by the API
+    # being unavailable
+    if isinstance(error, ApiError):
+        status = error.status_code
+        return status is not None and 400 <= status < 500 and status not in (408, 429)
+    return isinstance(error, ValueError)
 
-        Returns:
-            tuple[AnyDFType, bool, dict[str, DataFrame], dict[str, DataFrame]]:
-                Tuple containing:
-                - AnyDFType: The cleaned dataframe
-                - The three outputs from audit_data that are run at the end of cleansing.
 
-        Raises:
-            ValueError: Any exceptions during the cleaning process.
+class BatchingForecaster:
+    def __init__(
+        self,
+        client: NixtlaClient,
+        max_batch_size: _PositiveInt = 100,
+        max_wait_time: float = 0.05,
+        max_concurrent_batches: _PositiveInt = 4,
+    ):
         """
-        df = ensure_time_dtype(df, time_col=time_col)
-        logger.info("Running data cleansing...")
+        Coalesces concurrent forecast requests into batched API calls.
+
+        Requests made with `forecast` from several threads (or coroutines
+        with `aforecast`) that share the same arguments (e.g. `h`, `freq`,
+        `level` and `model`) are collected for up to `max_wait_time` seconds
+        and sent to the API as a single `NixtlaClient.forecast` call, whose
+        output is split back into the forecasts of each request. Requests
+        that fine-tune the model or use multivariate forecasting are never
+        combined, since their results depend on the other series. When a
+        batch fails because of the data or the arguments (e.g. duplicated
+        timestamps), its requests are sent one by one, so that the error
+        only reaches the requests that caused it. Only pandas DataFrames
+        are supported.
 
-        if fail_dict:
-            if "D001" in fail_dict:
-                try:
-                    logger.info("Fixing D001: Cleaning duplicate rows...")
+        Args:
+            client (NixtlaClient): Client used to make the forecasts.
+            max_batch_size (int): Maximum number of requests sent in a single
+                call. A batch is sent as soon as it reaches this size.
+                Defaults to 100.
+            max_wait_time (float): Maximum time in seconds that a request
+                waits for others to be combined with. Defaults to 0.05.
+            max_concurrent_batches (int): Maximum number of batches sent to
+                the API at the same time. Defaults to 4.
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self._executor = ThreadPoolExecutor(max_concurrent_batches)
+        self._cond = threading.Condition()
+        self._pending: dict[Hashable, list[_BatchRequest]] = {}
+        self._batch_kwargs: dict[Hashable, dict[str, Any]] = {}
+        self._deadlines: dict[Hashable, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> "BatchingForecaster":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _batch_key(
+        self, df: pd.DataFrame, X_df: Optional[pd.DataFrame], kwargs: dict[str, Any]
+    ) -> Hashable:
+        if kwargs.get("finetune_steps") or kwargs.get("multivariate"):
+            return object()
+        key = (
+            _freeze(kwargs),
+            tuple(df.columns),
+            tuple(df.dtypes.astype(str)),
+            None if X_df is None else tuple(X_df.columns),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return object()
+        return key
 
-                    if agg_dict is None:
-                        raise ValueError(
-                            "agg_dict must be provided to resolve D001 failure."
-                        )
+    def submit(
+        self,
+        df: pd.DataFrame,
+        h: _PositiveInt,
+        X_df: Optional[pd.DataFrame] = None,
+        **kwargs: Any,
+    ) -> "Future[pd.DataFrame]":
+        """Schedule a forecast to be sent with the next batch.
 
-                    # Get all columns except id_col and time_col
-                    other_cols = [
-                        col for col in df.columns if col not in [id_col, time_col]
-                    ]
+        Args:
+            df (pandas DataFrame): The DataFrame with the series to forecast.
+            h (int): Forecast horizon.
+            X_df (pandas DataFrame, optional): DataFrame with the future
+                values of the exogenous features. Defaults to None.
+            **kwargs: Other arguments of `NixtlaClient.forecast`.
 
-                    # Verify all columns have aggregation rules
-                    missing_cols = [col for col in other_cols if col not in agg_dict]
-                    if missing_cols:
-                        raise ValueError(
-                            f"D001: Missing aggregation rules for columns: {missing_cols}. "
-                            "Please provide aggregation rules for all columns in agg_dict."
-                        )
-                    df = df.groupby([id_col, time_col], as_index=False).agg(agg_dict)
-                except Exception as e:
-                    raise ValueError(f"Error cleaning duplicate rows D001: {e}")
-            if "D002" in fail_dict:
-                try:
-                    missing = fail_dict.get("D002")
-                    if missing is None:
-                        logger.warning(
-                            "D002: Missing dates could not be checked by audit_data. "
-                            "Hence not filling missing dates..."
-                        )
-                    else:
-                        logger.info("Fixing D002: Filling missing dates...")
-                        df = pd.concat([df, fail_dict.get("D002")])
-                except Exception as e:
-                    raise ValueError(f"Error filling missing dates D002: {e}")
+        Returns:
+            Future: Future with the forecasts of the series in `df`.
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise ValueError(
+                "BatchingForecaster only supports pandas DataFrames, "
+                f"got {type(df).__name__}."
+            )
+        kwargs = {"h": h, **kwargs}
+        if kwargs.get("freq") is None:
+            # requests with different frequencies can't be combined
+            kwargs["freq"] = _maybe_infer_freq(
+                df,
+                freq=None,
+                id_col=kwargs.get("id_col", "unique_id"),
+                time_col=kwargs.get("time_col", "ds"),
+            )
+        key = self._batch_key(df, X_df, kwargs)
+        future: Future[pd.DataFrame] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot submit requests to a closed forecaster.")
+            batch = self._pending.setdefault(key, [])
+            if not batch:
+                self._batch_kwargs[key] = kwargs
+                self._deadlines[key] = time.monotonic() + self.max_wait_time
+            batch.append(_BatchRequest(df=df, X_df=X_df, future=future))
+            if len(batch) >= self.max_batch_size:
+                self._dispatch(key)
+            else:
+                self._ensure_thread()
+                self._cond.notify()
+        return future
 
-        if case_specific_dict and clean_case_specific:
-            if "V001" in case_specific_dict:
-                try:
-                    logger.info("Fixing V001: Removing negative values...")
-                    df.loc[df[target_col] < 0, target_col] = 0
-                except Exception as e:
-                    raise ValueError(f"Error removing negative values V001: {e}")
+    def forecast(
+        self,
+        df: pd.DataFrame,
+        h: _PositiveInt,
+        X_df: Optional[pd.DataFrame] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Forecast the series, possibly combined with other requests.
 
-            if "V002" in case_specific_dict:
-                try:
-                    logger.info("Fixing V002: Removing leading zeros...")
-                    leading_zeros_df = case_specific_dict["V002"]
-                    leading_zeros_dict = leading_zeros_df.set_index(id_col)[
-                        "first_nonzero_index"
-                    ].to_dict()
-                    df = df.groupby(id_col, group_keys=False).apply(
-                        lambda group: group.loc[
-                            group.index
-                            >= leading_zeros_dict.get(group.name, group.index[0])
-                        ]
-                    )
-                except Exception as e:
-                    raise ValueError(f"Error removing leading zeros V002: {e}")
+        See `NixtlaClient.forecast` for a description of the arguments
+        and the output."""
+        return self.submit(df=df, h=h, X_df=X_df, **kwargs).result()
 
-        # Run data quality checks on the cleaned data
-        all_pass, error_dfs, case_specific_dfs = self.audit_data(
-            df=df, freq=freq, id_col=id_col, time_col=time_col
+    async def aforecast(
+        self,
+        df: pd.DataFrame,
+        h: _PositiveInt,
+        X_df: Optional[pd.DataFrame] = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Asynchronous version of `forecast`."""
+        return await asyncio.wrap_future(self.submit(df=df, h=h, X_df=X_df, **kwargs))
+
+    def flush(self) -> None:
+        """Send all the pending requests without waiting for more."""
+        with self._cond:
+            for key in list(self._pending):
+                self._dispatch(key)
+
+    def close(self) -> None:
+        """Send the pending requests and wait for all of them to complete."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch_expired, daemon=True)
+            self._thread.start()
+
+    def _dispatch_expired(self) -> None:
+        # sends the batches whose requests have waited for `max_wait_time`
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                for key, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        self._dispatch(key)
+                timeout = None
+                if self._deadlines:
+                    timeout = max(min(self._deadlines.values()) - now, 0)
+                self._cond.wait(timeout)
+
+    def _dispatch(self, key: Hashable) -> None:
+        batch = self._pending.pop(key)
+        kwargs = self._batch_kwargs.pop(key)
+        del self._deadlines[key]
+        self._executor.submit(self._run_batch, batch, kwargs)
+
+    def _run_batch(self, batch: list[_BatchRequest], kwargs: dict[str, Any]) -> None:
+        try:
+            results = self._forecast_batch(batch, kwargs)
+        except Exception as e:
+            if len(batch) > 1 and _is_input_error(e):
+                # the error can come from the data of a single request, so
+                # they're sent separately to only fail the ones that cause it
+                for request in batch:
+                    self._run_batch([request], kwargs)
+                return
+            for request in batch:
+                if not request.future.cancelled():
+                    request.future.set_exception(e)
+            return
+        for request, result in zip(batch, results):
+            if not request.future.cancelled():
+                request.future.set_result(result)
+
+    def _forecast_batch(
+        self, batch: list[_BatchRequest], kwargs: dict[str, Any]
+    ) -> list[pd.DataFrame]:
+        if len(batch) == 1:
+            [request] = batch
+            return [self.client.forecast(df=request.df, X_df=request.X_df, **kwargs)]
+        # the ids are prefixed with the position of their request, since
+        # different requests can use the same ids
+        id_col = kwargs.get("id_col", "unique_id")
+        owners: dict[str, int] = {}
+        original_ids: dict[str, Any] = {}
+        dfs = []
+        X_dfs = []
+        for i, request in enumerate(batch):
+            mapping = {}
+            for uid in request.df[id_col].unique():
+                batch_id = f"{i}:{uid}"
+                mapping[uid] = batch_id
+                owners[batch_id] = i
+                original_ids[batch_id] = uid
+            dfs.append(request.df.assign(**{id_col: request.df[id_col].map(mapping)}))
+            if request.X_df is not None:
+                X_dfs.append(
+                    request.X_df.assign(**{id_col: request.X_df[id_col].map(mapping)})
+                )
+        out = self.client.forecast(
+            df=pd.concat(dfs, ignore_index=True),
+            X_df=pd.concat(X_dfs, ignore_index=True) if X_dfs else None,
+            **kwargs,
         )
-
-        return df, all_pass, error_dfs, case_specific_dfs
+        out_owners = out[id_col].map(owners)
+        out_ids = out[id_col].map(original_ids)
+        results = []
+        for i, request in enumerate(batch):
+            mask = (out_owners == i).to_numpy()
+            res = out.loc[mask].reset_index(drop=True)
+            res[id_col] = out_ids[mask].astype(request.df[id_col].dtype).to_numpy()
+            results.append(res)
+        return results
 
 
 def _forecast_wrapper(
@@ -3037,6 +8194,7 @@ def _forecast_wrapper(
     feature_contributions: bool,
     model_parameters:_ExtraParamDataType,
     multivariate: bool,
+    history_window: Optional[_PositiveInt],
 ) -> pd.DataFrame:
     if "_in_sample" in df:
         in_sample_mask = df["_in_sample"]
@@ -3069,6 +8227,7 @@ def _forecast_wrapper(
         feature_contributions=feature_contributions,
         model_parameters=model_parameters,
         multivariate=multivariate,
+        history_window=history_window,
     )
 
 
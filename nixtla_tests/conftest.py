@@ -397,6 +397,13 @@ def two_short_series():
     return generate_series(n_series=2, min_length=5, max_length=20)
 
 
+@pytest.fixture
+def daily_series():
+    series = generate_series(5, min_length=50, max_length=120, freq="D")
+    series["unique_id"] = series["unique_id"].astype(str)
+    return series
+
+
 @pytest.fixture
 def two_short_series_with_time_features_train_future(two_short_series):
     train, future = time_features(
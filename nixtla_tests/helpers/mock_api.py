@@ -0,0 +1,203 @@
+import itertools
+
+import httpx
+import numpy as np
+import orjson
+import zstandard as zstd
+
+from nixtla.nixtla_client import (
+    _BINARY_CONTENT_TYPE,
+    NixtlaClient,
+    _pack_arrays,
+    _unpack_arrays,
+)
+
+INPUT_SIZE = 28
+HORIZON = 7
+
+
+def _intervals(mean, level):
+    if level is None:
+        return None
+    if not isinstance(level, list):
+        level = [level]
+    intervals = {}
+    for lv in level:
+        intervals[f"lo-{lv}"] = (mean - lv / 100).tolist()
+        intervals[f"hi-{lv}"] = (mean + lv / 100).tolist()
+    return intervals
+
+
+def _to_arrays(resp):
+    # numeric lists are sent as buffers in binary responses
+    if isinstance(resp, dict):
+        return {k: _to_arrays(v) for k, v in resp.items()}
+    if isinstance(resp, list) and resp and not isinstance(resp[0], list):
+        return np.asarray(resp)
+    return resp
+
+
+class MockNixtlaApi:
+    """Local stand-in for the TimeGPT API that produces naive forecasts.
+
+    The endpoints return the same fields as the real ones, which makes it
+    possible to test the client's requests and outputs without network
+    access. Set `binary=False` to emulate a server that only accepts and
+    returns JSON payloads."""
+
+    _ids = itertools.count()
+
+    def __init__(self, binary=True):
+        self.requests = []
+        self.binary = binary
+        # every instance has its own url, so that they don't share the
+        # process-wide cache of the models' metadata
+        self.base_url = f"http://mock-{next(self._ids)}.nixtla"
+
+    def client(self, cls=NixtlaClient, **kwargs):
+        client = cls(api_key="dummy", base_url=self.base_url, **kwargs)
+        transport = httpx.MockTransport(self)
+        client._make_client = lambda **kw: httpx.Client(transport=transport, **kw)
+        if hasattr(client, "_make_async_client"):
+            client._make_async_client = lambda **kw: httpx.AsyncClient(
+                transport=transport, **kw
+            )
+        return client
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.strip("/")
+        content = request.read()
+        if request.headers.get("content-encoding") == "zstd":
+            content = zstd.ZstdDecompressor().decompress(content)
+        self.requests.append((endpoint, request))
+        if request.method == "GET":
+            return self._get(endpoint, request)
+        if request.headers.get("content-type") == _BINARY_CONTENT_TYPE:
+            if not self.binary:
+                return httpx.Response(415, json={"detail": "Unsupported Media Type"})
+            payload = _unpack_arrays(content)
+        else:
+            payload = orjson.loads(content)
+        handler = getattr(self, endpoint.replace("v2/", "_"), None)
+        if handler is None:
+            return httpx.Response(404, json={"detail": "Not Found"})
+        resp = handler(payload)
+        if self.binary and _BINARY_CONTENT_TYPE in request.headers.get("accept", ""):
+            return httpx.Response(
+                200,
+                content=_pack_arrays(_to_arrays(resp)),
+                headers={"content-type": _BINARY_CONTENT_TYPE},
+            )
+        return httpx.Response(200, content=orjson.dumps(resp))
+
+    def endpoint_calls(self, endpoint):
+        return [req for ep, req in self.requests if ep == endpoint]
+
+    def _get(self, endpoint, request):
+        if endpoint == "model_params":
+            detail = {"input_size": INPUT_SIZE, "horizon": HORIZON}
+            return httpx.Response(200, json={"detail": detail})
+        if endpoint == "validate_api_key":
+            return httpx.Response(200, json={"detail": "API key is valid"})
+        if endpoint == "usage":
+            return httpx.Response(
+                200,
+                json={
+                    "minute": {"limit": 100, "used": 0},
+                    "month": {"limit": 10_000, "used": 0},
+                },
+            )
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+    @staticmethod
+    def _series(payload):
+        y = np.asarray(payload["series"]["y"], dtype=np.float64)
+        sizes = np.asarray(payload["series"]["sizes"], dtype=np.int64)
+        indptr = np.append(0, sizes.cumsum())
+        return y, sizes, indptr
+
+    def _forecast(self, payload):
+        y, sizes, indptr = self._series(payload)
+        h = payload["h"]
+        mean = np.repeat(y[indptr[1:] - 1], h)
+        X = payload["series"]["X"]
+        n_x = 0 if X is None else len(X)
+        contributions = None
+        if payload.get("feature_contributions") and n_x:
+            contributions = [[0.0] * mean.size for _ in range(n_x + 1)]
+        return {
+            "mean": mean.tolist(),
+            "intervals": _intervals(mean, payload["level"]),
+            "weights_x": [1.0] * n_x if n_x else None,
+            "feature_contributions": contributions,
+        }
+
+    def _in_sample(self, payload):
+        y, sizes, indptr = self._series(payload)
+        out_sizes = np.maximum(sizes - INPUT_SIZE, 0)
+        idxs = np.hstack(
+            [np.arange(end - size, end) for end, size in zip(indptr[1:], out_sizes)]
+        ).astype(np.int64)
+        mean = y[idxs - 1]
+        return y, idxs, mean, out_sizes
+
+    def _historic_forecast(self, payload):
+        _, _, mean, sizes = self._in_sample(payload)
+        return {
+            "mean": mean.tolist(),
+            "sizes": sizes.tolist(),
+            "intervals": _intervals(mean, payload["level"]),
+        }
+
+    def _anomaly_detection(self, payload):
+        y, idxs, mean, sizes = self._in_sample(payload)
+        n_x = 0 if payload["series"]["X"] is None else len(payload["series"]["X"])
+        return {
+            "mean": mean.tolist(),
+            "sizes": sizes.tolist(),
+            "anomaly": (np.abs(y[idxs] - mean) > 10).tolist(),
+            "intervals": _intervals(mean, payload["level"]),
+            "weights_x": [1.0] * n_x if n_x else None,
+        }
+
+    def _online_anomaly_detection(self, payload):
+        y, sizes, indptr = self._series(payload)
+        detection_size = payload["detection_size"]
+        idxs = np.hstack(
+            [np.arange(end - detection_size, end) for end in indptr[1:]]
+        ).astype(np.int64)
+        mean = y[idxs - 1]
+        score = y[idxs] - mean
+        resp = {
+            "idxs": idxs.tolist(),
+            "sizes": [detection_size] * sizes.size,
+            "mean": mean.tolist(),
+            "anomaly": (np.abs(score) > 10).tolist(),
+            "anomaly_score": score.tolist(),
+            "intervals": _intervals(mean, payload["level"]),
+        }
+        if payload["threshold_method"] == "multivariate":
+            resp["accumulated_anomaly_score"] = np.abs(score).tolist()
+        return resp
+
+    def _cross_validation(self, payload):
+        y, sizes, indptr = self._series(payload)
+        h = payload["h"]
+        n_windows = payload["n_windows"]
+        step_size = payload["step_size"]
+        idxs = []
+        for end in indptr[1:]:
+            for w in range(n_windows):
+                cutoff = end - h - step_size * (n_windows - 1 - w)
+                idxs.append(np.arange(cutoff, cutoff + h))
+        idxs = np.hstack(idxs).astype(np.int64)
+        mean = y[np.repeat(idxs[::h] - 1, h)]
+        return {
+            "idxs": idxs.tolist(),
+            "sizes": [n_windows * h] * sizes.size,
+            "mean": mean.tolist(),
+            "intervals": _intervals(mean, payload["level"]),
+        }
+
+    def _finetune(self, payload):
+        return {"finetuned_model_id": payload["output_model_id"] or "mock-model"}
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import AsyncNixtlaClient, _arrow_to_polars
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80, 90])),
+        ("forecast", dict(h=7, add_history=True)),
+        ("detect_anomalies", dict(level=99)),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+def test_arrow_matches_polars(daily_series, method, kwargs):
+    client = MockNixtlaApi().client()
+    table = pa.Table.from_pandas(daily_series, preserve_index=False)
+    res = getattr(client, method)(df=table, **kwargs)
+    assert isinstance(res, pa.Table)
+    assert pa.types.is_dictionary(res.schema.field("unique_id").type)
+    assert pa.types.is_timestamp(res.schema.field("ds").type)
+    expected = getattr(client, method)(df=pl.from_arrow(table), **kwargs)
+    assert (
+        pl.from_arrow(res)
+        .with_columns(pl.col("unique_id").cast(pl.String))
+        .equals(expected)
+    )
+
+
+def test_record_batch_reader_and_exogenous(daily_series):
+    daily_series["x"] = np.arange(daily_series.shape[0], dtype=np.float64)
+    future = generate_series(5, min_length=7, max_length=7, freq="D")
+    last_ds = daily_series.groupby("unique_id", observed=True)["ds"].max()
+    future["unique_id"] = future["unique_id"].astype(str)
+    future["ds"] = future["unique_id"].map(last_ds) + pd.to_timedelta(
+        future.groupby("unique_id").cumcount() + 1, unit="D"
+    )
+    future = future.rename(columns={"y": "x"})
+    table = pa.Table.from_pandas(daily_series, preserve_index=False)
+    # dictionary encoded ids split in several batches
+    table = table.set_column(0, "unique_id", table["unique_id"].dictionary_encode())
+    reader = pa.RecordBatchReader.from_batches(
+        table.schema, table.to_batches(max_chunksize=100)
+    )
+    client = MockNixtlaApi().client()
+    res = client.forecast(
+        df=reader, X_df=pa.Table.from_pandas(future, preserve_index=False), h=7
+    )
+    expected = client.forecast(df=daily_series, X_df=future, h=7)
+    pd.testing.assert_frame_equal(
+        res.to_pandas().astype({"unique_id": str}), expected, check_dtype=False
+    )
+
+
+def test_numeric_columns_share_memory(daily_series):
+    table = pa.Table.from_pandas(daily_series, preserve_index=False)
+    df = _arrow_to_polars(table, "unique_id")
+    y = df["y"].to_numpy()
+    buf = table["y"].chunk(0).buffers()[1]
+    assert y.__array_interface__["data"][0] == buf.address
+
+
+def test_async_arrow(daily_series):
+    client = MockNixtlaApi().client(AsyncNixtlaClient)
+    table = pa.Table.from_pandas(daily_series, preserve_index=False)
+    res = asyncio.run(client.aforecast(df=table, h=7))
+    assert isinstance(res, pa.Table)
+    assert res.num_rows == 5 * 7
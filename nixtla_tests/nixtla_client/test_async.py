@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pandas as pd
+import pytest
+
+from nixtla.nixtla_client import AsyncNixtlaClient
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80, 90])),
+        ("forecast", dict(h=7, add_history=True)),
+        ("detect_anomalies", dict(level=99)),
+        ("detect_anomalies_online", dict(h=7, detection_size=5)),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+@pytest.mark.parametrize("num_partitions", [None, 3])
+def test_async_matches_sync(daily_series, method, kwargs, num_partitions):
+    api = MockNixtlaApi()
+    client = api.client(AsyncNixtlaClient, max_concurrency=2)
+
+    async def run():
+        async with client:
+            return await getattr(client, f"a{method}")(
+                df=daily_series, num_partitions=num_partitions, **kwargs
+            )
+
+    async_res = asyncio.run(run())
+    sync_res = getattr(client, method)(
+        df=daily_series, num_partitions=num_partitions, **kwargs
+    )
+    pd.testing.assert_frame_equal(async_res, sync_res)
+    # partitioning doesn't change the results
+    pd.testing.assert_frame_equal(
+        async_res, getattr(client, method)(df=daily_series, **kwargs)
+    )
+    assert client._async_client is None
+
+
+def test_async_finetune(daily_series):
+    client = MockNixtlaApi().client(AsyncNixtlaClient)
+    model_id = asyncio.run(client.afinetune(daily_series, output_model_id="my-model"))
+    assert model_id == "my-model"
+
+
+def test_async_distributed_error(daily_series):
+    client = MockNixtlaApi().client(AsyncNixtlaClient)
+    with pytest.raises(ValueError, match="only supports pandas and polars"):
+        asyncio.run(client.aforecast(df=daily_series.to_dict(), h=7))
+
+
+class InvalidKeyApi(MockNixtlaApi):
+    def _get(self, endpoint, request):
+        if endpoint == "validate_api_key":
+            return httpx.Response(401, json={"detail": "Invalid API key"})
+        return super()._get(endpoint, request)
+
+
+def _async_only(client):
+    def make_client(**kwargs):
+        raise AssertionError("the sync client was used")
+
+    client._make_client = make_client
+    return client
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("aforecast", dict(h=7)),
+        ("adetect_anomalies", dict()),
+        ("across_validation", dict(h=7, n_windows=2)),
+    ],
+)
+def test_async_validates_api_key(daily_series, method, kwargs):
+    api = MockNixtlaApi()
+    client = _async_only(api.client(AsyncNixtlaClient))
+    asyncio.run(
+        getattr(client, method)(df=daily_series, validate_api_key=True, **kwargs)
+    )
+    assert len(api.endpoint_calls("validate_api_key")) == 1
+
+
+def test_async_invalid_api_key(daily_series):
+    client = _async_only(InvalidKeyApi().client(AsyncNixtlaClient))
+    with pytest.raises(Exception, match="API Key not valid"):
+        asyncio.run(client.aforecast(df=daily_series, h=7, validate_api_key=True))
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import BatchingForecaster
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.fixture
+def series():
+    # every request uses the same ids, which must not be mixed in the batch
+    dfs = []
+    for seed in range(4):
+        df = generate_series(3, min_length=40, max_length=60, freq="D", seed=seed)
+        df["unique_id"] = df["unique_id"].astype(str)
+        dfs.append(df)
+    return dfs
+
+
+def _forecast_all(forecaster, dfs, **kwargs):
+    barrier = threading.Barrier(len(dfs))
+
+    def forecast(df):
+        barrier.wait()
+        return forecaster.forecast(df, **kwargs)
+
+    with ThreadPoolExecutor(len(dfs)) as executor:
+        return list(executor.map(forecast, dfs))
+
+
+def test_requests_are_combined(series):
+    api = MockNixtlaApi()
+    client = api.client()
+    with BatchingForecaster(client, max_wait_time=0.5) as forecaster:
+        results = _forecast_all(forecaster, series, h=7, level=[80])
+    assert len(api.endpoint_calls("v2/forecast")) == 1
+    for df, res in zip(series, results):
+        expected = client.forecast(df=df, h=7, level=[80])
+        pd.testing.assert_frame_equal(res, expected)
+
+
+def test_different_arguments_arent_combined(series):
+    api = MockNixtlaApi()
+    client = api.client()
+    with BatchingForecaster(client, max_wait_time=0.01) as forecaster:
+        futures = [forecaster.submit(df, h=h) for df, h in zip(series, [7, 7, 14, 14])]
+        results = [f.result() for f in futures]
+    assert len(api.endpoint_calls("v2/forecast")) == 2
+    assert [res.shape[0] for res in results] == [21, 21, 42, 42]
+
+
+def test_max_batch_size(series):
+    api = MockNixtlaApi()
+    client = api.client()
+    with BatchingForecaster(client, max_batch_size=2, max_wait_time=10) as forecaster:
+        futures = [forecaster.submit(df, h=7) for df in series]
+        # full batches are sent without waiting
+        for f in futures:
+            f.result(timeout=5)
+    assert len(api.endpoint_calls("v2/forecast")) == 2
+
+
+def test_close_sends_pending(series):
+    api = MockNixtlaApi()
+    forecaster = BatchingForecaster(api.client(), max_wait_time=60)
+    futures = [forecaster.submit(df, h=7) for df in series]
+    forecaster.close()
+    assert all(f.done() for f in futures)
+    assert len(api.endpoint_calls("v2/forecast")) == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        forecaster.submit(series[0], h=7)
+
+
+def test_errors_are_propagated(series):
+    client = MockNixtlaApi().client()
+    with BatchingForecaster(client, max_wait_time=0.01) as forecaster:
+        futures = [forecaster.submit(df, h=7, model="unknown") for df in series]
+        for f in futures:
+            with pytest.raises(ValueError, match="unsupported model"):
+                f.result()
+
+
+def test_bad_request_only_fails_itself(series):
+    api = MockNixtlaApi()
+    client = api.client()
+    # a missing timestamp
+    series[1] = series[1].drop(index=5)
+    with BatchingForecaster(client, max_wait_time=0.5) as forecaster:
+        futures = [forecaster.submit(df, h=7) for df in series]
+        with pytest.raises(ValueError, match="missing or duplicate timestamps"):
+            futures[1].result()
+        results = [f.result() for i, f in enumerate(futures) if i != 1]
+    for df, res in zip(series[:1] + series[2:], results):
+        pd.testing.assert_frame_equal(res, client.forecast(df=df, h=7))
+
+
+def test_aforecast(series):
+    api = MockNixtlaApi()
+    client = api.client()
+
+    async def run(forecaster):
+        return await asyncio.gather(*[forecaster.aforecast(df, h=7) for df in series])
+
+    with BatchingForecaster(client, max_wait_time=0.1) as forecaster:
+        results = asyncio.run(run(forecaster))
+    assert len(api.endpoint_calls("v2/forecast")) == 1
+    pd.testing.assert_frame_equal(results[1], client.forecast(df=series[1], h=7))
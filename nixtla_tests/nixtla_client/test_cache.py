@@ -0,0 +1,130 @@
+import asyncio
+import copy
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nixtla.nixtla_client import (
+    AsyncNixtlaClient,
+    MemoryCache,
+    SqliteCache,
+    _pack_arrays,
+    _payload_fingerprint,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return MemoryCache(**kwargs)
+        return SqliteCache(tmp_path / "cache.db", **kwargs)
+
+    return make
+
+
+def _resp(n):
+    return {"mean": np.arange(n, dtype=np.float64), "intervals": None}
+
+
+def test_cache_get_set(make_cache):
+    cache = make_cache()
+    assert cache.get("a") is None
+    cache.set("a", _resp(3))
+    res = cache.get("a")
+    np.testing.assert_array_equal(res["mean"], np.arange(3))
+    assert res["intervals"] is None
+    # the returned arrays are copies
+    res["mean"][:] = 0
+    np.testing.assert_array_equal(cache.get("a")["mean"], np.arange(3))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_cache_lru_eviction(make_cache):
+    # each entry is a bit larger than 8KB
+    cache = make_cache(max_size_mb=20 / 1024)
+    for key in ("a", "b"):
+        cache.set(key, _resp(1000))
+    assert cache.get("a") is not None
+    cache.set("c", _resp(1000))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["size_mb"] <= 20 / 1024
+    # responses larger than the cache aren't stored
+    cache.set("d", _resp(10_000))
+    assert cache.get("d") is None
+
+
+def test_cache_ttl(make_cache):
+    cache = make_cache(ttl=0.05)
+    cache.set("a", _resp(3))
+    assert cache.get("a") is not None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_is_copied(make_cache):
+    cache = make_cache()
+    cache.set("a", _resp(3))
+    assert copy.deepcopy(cache).get("a") is not None
+
+
+@pytest.mark.parametrize("num_partitions", [None, 2])
+def test_client_cache(daily_series, make_cache, num_partitions):
+    api = MockNixtlaApi()
+    cache = make_cache()
+    client = api.client(cache=cache)
+    kwargs = dict(df=daily_series, h=7, level=[80], num_partitions=num_partitions)
+    expected = client.forecast(**kwargs)
+    n_requests = len(api.endpoint_calls("v2/forecast"))
+    pd.testing.assert_frame_equal(client.forecast(**kwargs), expected)
+    assert len(api.endpoint_calls("v2/forecast")) == n_requests
+    assert cache.stats()["hits"] == 1
+    # different arguments or data are requested again
+    client.forecast(**{**kwargs, "level": [90]})
+    client.forecast(**{**kwargs, "df": daily_series.assign(y=daily_series["y"] + 1)})
+    assert len(api.endpoint_calls("v2/forecast")) == 3 * n_requests
+    # the cache can be shared by clients
+    other = api.client(cache=cache)
+    pd.testing.assert_frame_equal(other.forecast(**kwargs), expected)
+    assert len(api.endpoint_calls("v2/forecast")) == 3 * n_requests
+
+
+def test_async_client_cache(daily_series):
+    api = MockNixtlaApi()
+    client = api.client(AsyncNixtlaClient, cache=MemoryCache())
+    expected = client.detect_anomalies(df=daily_series)
+    res = asyncio.run(client.adetect_anomalies(df=daily_series))
+    pd.testing.assert_frame_equal(res, expected)
+    assert len(api.endpoint_calls("v2/anomaly_detection")) == 1
+
+
+def test_finetune_not_cached(daily_series):
+    api = MockNixtlaApi()
+    client = api.client(cache=MemoryCache())
+    client.finetune(daily_series)
+    client.finetune(daily_series)
+    assert len(api.endpoint_calls("v2/finetune")) == 2
+
+
+def test_fingerprint_hashes_the_encoded_payload():
+    payload = {
+        "series": {"y": np.arange(10, dtype=np.float32), "sizes": [4, 6]},
+        "x": np.arange(6, dtype=np.float64).reshape(3, 2)[:, ::-1],
+        "h": 7,
+    }
+    # the parts are hashed without building the payload, with the same result
+    expected = hashlib.sha256(_pack_arrays(payload)).hexdigest()
+    assert _payload_fingerprint(payload) == expected
@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import ApiError, AsyncNixtlaClient
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+class FailingPartitionApi(MockNixtlaApi):
+    """Fails the first cross validation request."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def __call__(self, request):
+        resp = super().__call__(request)
+        if request.url.path.endswith("cross_validation") and not self.failed:
+            self.failed = True
+            return httpx.Response(400, json={"detail": "Bad partition"})
+        return resp
+
+
+@pytest.fixture
+def series():
+    df = generate_series(10, min_length=50, max_length=100, freq="D", seed=1)
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_resume_from_checkpoint(series, tmp_path, use_async):
+    kwargs = dict(df=series, h=7, n_windows=2, num_partitions=5)
+    expected = MockNixtlaApi().client().cross_validation(**kwargs)
+
+    def run(api):
+        if not use_async:
+            return api.client(checkpoint_dir=tmp_path).cross_validation(**kwargs)
+        client = api.client(AsyncNixtlaClient, checkpoint_dir=tmp_path)
+        return asyncio.run(client.across_validation(**kwargs))
+
+    failing_api = FailingPartitionApi()
+    with pytest.raises(ApiError, match="Bad partition"):
+        run(failing_api)
+    assert len(failing_api.endpoint_calls("v2/cross_validation")) == 5
+    [job_dir] = tmp_path.iterdir()
+    assert len(list(job_dir.glob("*.json"))) == 4
+
+    api = MockNixtlaApi()
+    res = run(api)
+    pd.testing.assert_frame_equal(res, expected)
+    # only the failed partition is requested again
+    assert len(api.endpoint_calls("v2/cross_validation")) == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_checkpoint_depends_on_payload(series, tmp_path):
+    api = MockNixtlaApi()
+    client = api.client(checkpoint_dir=tmp_path)
+    # a stale checkpoint of a different request isn't used
+    (tmp_path / "abc").mkdir()
+    (tmp_path / "abc" / "0.json").write_text("{}")
+    client.cross_validation(df=series, h=7, n_windows=2, num_partitions=2)
+    assert len(api.endpoint_calls("v2/cross_validation")) == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["abc"]
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import (
+    AsyncNixtlaClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    _baseline_responses,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+class DownApi(MockNixtlaApi):
+    # returns 503 for the forecasting endpoints while `down` is set
+    def __init__(self):
+        super().__init__()
+        self.down = True
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.down and request.method == "POST":
+            self.requests.append((request.url.path.strip("/"), request))
+            return httpx.Response(503, json={"detail": "Service Unavailable"})
+        return super().__call__(request)
+
+
+@pytest.fixture
+def series():
+    df = generate_series(3, min_length=30, max_length=50, freq="D", seed=1)
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+def _client(api, **kwargs):
+    return api.client(
+        retry_policy=RetryPolicy(initial_interval=0, max_retries=10, budget_ratio=None),
+        circuit_breaker=CircuitBreaker(**kwargs),
+    )
+
+
+def test_opens_and_fails_fast(series):
+    api = DownApi()
+    client = _client(api, failure_threshold=3, recovery_time=60)
+    with pytest.raises(CircuitOpenError):
+        client.forecast(df=series, h=7)
+    # the retries stop once the breaker opens
+    assert len(api.endpoint_calls("v2/forecast")) == 3
+    assert client._circuit_breaker.state == "open"
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError) as exc:
+        client.forecast(df=series, h=7)
+    assert time.perf_counter() - start < 1
+    assert exc.value.retry_after > 0
+    assert len(api.endpoint_calls("v2/forecast")) == 3
+
+
+def test_recovers(series):
+    api = DownApi()
+    client = _client(api, failure_threshold=1, recovery_time=0.1)
+    with pytest.raises(CircuitOpenError):
+        client.forecast(df=series, h=7)
+    api.down = False
+    time.sleep(0.1)
+    assert client._circuit_breaker.state == "half_open"
+    client.forecast(df=series, h=7)
+    assert client._circuit_breaker.state == "closed"
+
+
+def test_client_errors_dont_open(series):
+    api = MockNixtlaApi()
+    client = _client(api, failure_threshold=1)
+    with pytest.raises(ValueError):
+        client.forecast(df=series, h=7, model="unknown")
+    assert client._circuit_breaker.state == "closed"
+
+
+@pytest.mark.parametrize("add_history", [False, True])
+@pytest.mark.parametrize("method", ["seasonal_naive", "historic_average"])
+def test_fallback(series, method, add_history):
+    api = DownApi()
+    client = _client(api, failure_threshold=1, fallback=method)
+    fcst = client.forecast(df=series, h=10, level=[80, 95], add_history=add_history)
+    assert client.used_fallback
+    api.down = False
+    client._circuit_breaker._after_request(ok=True)
+    expected = client.forecast(df=series, h=10, level=[80, 95], add_history=add_history)
+    assert not client.used_fallback
+    assert fcst.columns.tolist() == expected.columns.tolist()
+    # the fitted values cover different periods than TimeGPT's
+    cols = ["unique_id", "ds"]
+    pd.testing.assert_frame_equal(
+        fcst.groupby("unique_id").tail(10)[cols].reset_index(drop=True),
+        expected.groupby("unique_id").tail(10)[cols].reset_index(drop=True),
+    )
+    assert (fcst["TimeGPT-lo-95"] <= fcst["TimeGPT-lo-80"]).all()
+    assert (fcst["TimeGPT-lo-80"] <= fcst["TimeGPT"]).all()
+    assert (fcst["TimeGPT"] <= fcst["TimeGPT-hi-80"]).all()
+
+
+def test_baseline_values(series):
+    from utilsforecast.processing import process_df
+
+    processed = process_df(series, "unique_id", "ds", "y")
+    h = 10
+    fcst, in_sample = _baseline_responses(
+        processed, h=h, level=None, method="seasonal_naive", season_length=7
+    )
+    for i, (_, grp) in enumerate(series.groupby("unique_id", observed=True)):
+        y = grp["y"].to_numpy()
+        expected = np.tile(y[-7:], 2)[:h]
+        np.testing.assert_allclose(fcst["mean"][i * h : (i + 1) * h], expected)
+    assert in_sample["sizes"].tolist() == (np.diff(processed.indptr) - 7).tolist()
+    fcst, in_sample = _baseline_responses(
+        processed, h=h, level=[90], method="historic_average", season_length=7
+    )
+    means = series.groupby("unique_id", observed=True)["y"].mean().to_numpy()
+    np.testing.assert_allclose(fcst["mean"], np.repeat(means, h))
+    assert in_sample["sizes"].tolist() == np.diff(processed.indptr).tolist()
+
+
+def test_fallback_per_call(series):
+    api = DownApi()
+    api.down = False
+    client = _client(api, failure_threshold=1, fallback="seasonal_naive")
+    client.forecast(df=series, h=7)
+    api.down = True
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(
+            (client.forecast(df=series, h=7), client.used_fallback)
+        )
+    )
+    thread.start()
+    thread.join()
+    assert results[0][1]
+    # the call made by this thread didn't fall back
+    assert not client.used_fallback
+
+
+def test_async_fallback(series):
+    api = DownApi()
+    client = api.client(
+        AsyncNixtlaClient,
+        retry_policy=RetryPolicy(initial_interval=0, budget_ratio=None),
+        circuit_breaker=CircuitBreaker(failure_threshold=2, fallback="seasonal_naive"),
+    )
+
+    async def main():
+        fcst = await client.aforecast(df=series, h=7)
+        return fcst, client.used_fallback
+
+    fcst, used_fallback = asyncio.run(main())
+    assert used_fallback
+    assert fcst.shape[0] == 21
@@ -1,3 +1,4 @@
+import copy
 import os
 import pytest
 import pandas as pd
@@ -44,6 +45,28 @@ def test_api_key_fail():
         assert "NIXTLA_API_KEY" in str(excinfo.value)
 
 
+def test_connection_pool_reuse():
+    nixtla_client = NixtlaClient(api_key="dummy")
+    client = nixtla_client._get_client()
+    assert nixtla_client._get_client() is client
+    assert client._transport._pool._max_connections == 100
+
+    # the pool isn't copied when serializing the client
+    restored = copy.deepcopy(nixtla_client)
+    assert restored._client is None
+    assert restored._get_client() is not client
+    restored.close()
+
+    nixtla_client.close()
+    assert client.is_closed
+    assert nixtla_client._client is None
+
+    with NixtlaClient(api_key="dummy", max_connections=5) as nixtla_client:
+        client = nixtla_client._get_client()
+        assert client._transport._pool._max_connections == 5
+    assert client.is_closed
+
+
 def test_api_key_success():
     nixtla_client = NixtlaClient()
     assert nixtla_client.validate_api_key()
@@ -0,0 +1,147 @@
+import httpx
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import (
+    _BINARY_CONTENT_TYPE,
+    _concat_partitions,
+    _decode_response,
+    _encode_payload,
+    _pack_arrays,
+    _unpack_arrays,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.fixture
+def series():
+    df = generate_series(
+        5, min_length=50, max_length=120, freq="D", n_static_features=2
+    )
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+def test_pack_arrays_roundtrip():
+    payload = {
+        "series": {
+            "y": np.arange(11, dtype=np.float32),
+            "sizes": np.array([5, 6]),
+            "X": [np.ones(11, dtype=np.float32), np.zeros(3, dtype=">f8")],
+            "flags": np.array([[True, False], [False, True]]),
+        },
+        "h": 7,
+        "level": [80, 90],
+        "model": "timegpt-1",
+        "clean_ex_first": None,
+    }
+    content = _pack_arrays(payload)
+    assert content[:4] == b"NXTA"
+    res = _unpack_arrays(content)
+    assert {k: v for k, v in res.items() if k != "series"} == {
+        k: v for k, v in payload.items() if k != "series"
+    }
+    for k in ("y", "sizes", "flags"):
+        np.testing.assert_array_equal(res["series"][k], payload["series"][k])
+        assert res["series"][k].dtype == payload["series"][k].dtype
+    for res_x, x in zip(res["series"]["X"], payload["series"]["X"]):
+        np.testing.assert_array_equal(res_x, x)
+        assert res_x.dtype.byteorder in ("<", "=")
+    # buffers are aligned views of the content
+    assert all(arr.ctypes.data % 8 == 0 for arr in res["series"]["X"])
+    assert not res["series"]["y"].flags.writeable
+
+
+def test_binary_payload_is_smaller():
+    payload = {"series": {"y": np.random.rand(10_000).astype(np.float32)}}
+    binary, headers = _encode_payload(payload, False, "binary")
+    json, _ = _encode_payload(payload, False, "json")
+    assert headers["content-type"] == _BINARY_CONTENT_TYPE
+    assert len(binary) < len(json) / 2
+    np.testing.assert_array_equal(
+        _unpack_arrays(binary)["series"]["y"], payload["series"]["y"]
+    )
+    np.testing.assert_allclose(
+        orjson.loads(json)["series"]["y"], payload["series"]["y"]
+    )
+
+
+def test_invalid_binary_payload():
+    with pytest.raises(ValueError, match="Invalid binary payload"):
+        _unpack_arrays(b"{}")
+
+
+def test_decode_binary_response():
+    body = {
+        "mean": np.arange(4, dtype=np.float32),
+        "intervals": {"lo-80": np.zeros(4), "hi-80": np.ones(4)},
+        "weights_x": None,
+    }
+    resp = httpx.Response(
+        200,
+        content=_pack_arrays(body),
+        headers={"content-type": _BINARY_CONTENT_TYPE},
+    )
+    decoded = _decode_response(resp)
+    np.testing.assert_array_equal(decoded["mean"], body["mean"])
+    np.testing.assert_array_equal(decoded["intervals"]["hi-80"], np.ones(4))
+    assert decoded["weights_x"] is None
+    # the arrays can be modified by the users after they're assigned to the output
+    assert decoded["mean"].flags.writeable
+    json_resp = httpx.Response(200, content=orjson.dumps({"data": {"mean": [1.0]}}))
+    assert _decode_response(json_resp) == {"mean": [1.0]}
+
+
+def test_concat_partitions():
+    res = _concat_partitions([[1.0, 2.0], np.array([3.0], dtype=np.float32), []])
+    np.testing.assert_array_equal(res, [1.0, 2.0, 3.0])
+    assert res.dtype == np.float64
+    res = _concat_partitions([[], [True], np.array([False, True])])
+    np.testing.assert_array_equal(res, [True, False, True])
+    res = _concat_partitions(
+        [[0, 1], np.array([0, 2])], offsets=np.array([0, 10]), dtype=np.int64
+    )
+    np.testing.assert_array_equal(res, [0, 1, 10, 12])
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80], hist_exog_list=["static_0"])),
+        ("forecast", dict(h=7, add_history=True)),
+        ("detect_anomalies", dict(level=99)),
+        ("detect_anomalies_online", dict(h=7, detection_size=5, level=[90])),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+@pytest.mark.parametrize("num_partitions", [None, 2])
+def test_binary_codec_matches_json(series, method, kwargs, num_partitions):
+    api = MockNixtlaApi()
+    binary_client = api.client(payload_codec="binary")
+    json_client = api.client()
+    kwargs = dict(df=series, num_partitions=num_partitions, **kwargs)
+    binary_res = getattr(binary_client, method)(**kwargs)
+    assert api.requests[-1][1].headers["content-type"] == _BINARY_CONTENT_TYPE
+    json_res = getattr(json_client, method)(**kwargs)
+    assert api.requests[-1][1].headers["content-type"] != _BINARY_CONTENT_TYPE
+    pd.testing.assert_frame_equal(binary_res, json_res)
+
+
+def test_binary_codec_falls_back_to_json(series, caplog):
+    api = MockNixtlaApi(binary=False)
+    client = api.client(payload_codec="binary")
+    json_res = api.client().forecast(df=series, h=7)
+    with caplog.at_level("WARNING"):
+        res = client.forecast(df=series, h=7)
+    assert "using JSON instead" in caplog.text
+    pd.testing.assert_frame_equal(res, json_res)
+    client.forecast(df=series, h=7)
+    content_types = [
+        req.headers.get("content-type") for req in api.endpoint_calls("v2/forecast")
+    ]
+    # one rejected request and then JSON for the rest
+    assert content_types.count(_BINARY_CONTENT_TYPE) == 1
+    assert client._json_endpoints == {"v2/forecast"}
@@ -0,0 +1,131 @@
+import asyncio
+import copy
+import threading
+import time
+
+import httpx
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import (
+    ApiError,
+    AsyncNixtlaClient,
+    RetryPolicy,
+    _ConcurrencyController,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+def test_controller_additive_increase():
+    controller = _ConcurrencyController(max_concurrency=6, adaptive=True)
+    assert controller.limit == 4
+    for _ in range(4):
+        controller.on_success(0.1)
+    assert controller.limit == 5
+    # slow requests don't increase the limit
+    for _ in range(50):
+        controller.on_success(1.0)
+    assert controller.limit == 5
+    controller = _ConcurrencyController(max_concurrency=6, adaptive=True)
+    for _ in range(100):
+        controller.on_success(0.1)
+    assert controller.limit == 6
+
+
+def test_controller_multiplicative_decrease():
+    controller = _ConcurrencyController(max_concurrency=32, adaptive=True)
+    controller.limit = 16
+    overload = ApiError(status_code=429, body="Too many requests")
+    # failures of the same window only halve the limit once
+    for _ in range(8):
+        controller.on_error(overload)
+    assert controller.limit == 8
+    # the next window starts after the limit's number of requests
+    for _ in range(4):
+        controller.on_error(httpx.ReadTimeout("timeout"))
+    assert controller.limit == 4
+    # other errors don't reduce it
+    for _ in range(10):
+        controller.on_error(ApiError(status_code=400, body="Bad request"))
+    assert controller.limit == 4
+    metrics = controller.metrics()
+    assert metrics["concurrency"] == 4
+    assert metrics["backoffs"] == 2
+    assert metrics["errors"] == metrics["requests"] == 22
+    assert metrics["error_rate"] == 1.0
+
+
+def test_controller_static():
+    controller = _ConcurrencyController(max_concurrency=10, adaptive=False)
+    controller.on_error(ApiError(status_code=429, body=""))
+    for _ in range(50):
+        controller.on_success(0.1)
+    assert controller.limit == 10
+    assert copy.deepcopy(controller).metrics()["requests"] == 51
+
+
+class ThrottledApi(MockNixtlaApi):
+    """Returns 429 when there are more than `capacity` requests in flight."""
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.capacity = capacity
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            throttled = self.in_flight > self.capacity
+        try:
+            time.sleep(0.01)
+            if throttled:
+                return httpx.Response(429, json={"detail": "Too many requests"})
+            return super().__call__(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def series():
+    df = generate_series(40, min_length=50, max_length=100, freq="D")
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+def test_partitioned_requests_respect_limit(series):
+    api = ThrottledApi(capacity=100)
+    client = api.client(max_concurrency=3)
+    client.forecast(df=series, h=7, num_partitions=20)
+    assert api.max_in_flight <= 3
+    metrics = client.concurrency_metrics
+    assert metrics["concurrency"] == 3
+    assert metrics["requests"] == 20
+    assert metrics["throughput"] > 0
+
+
+def test_adaptive_concurrency_backs_off(series):
+    api = ThrottledApi(capacity=2)
+    policy = RetryPolicy(initial_interval=0.01, max_retries=20, budget_ratio=None)
+    client = api.client(
+        max_concurrency=16, adaptive_concurrency=True, retry_policy=policy
+    )
+    expected = MockNixtlaApi().client().forecast(df=series, h=7)
+    res = client.forecast(df=series, h=7, num_partitions=40)
+    pd.testing.assert_frame_equal(res, expected)
+    metrics = client.concurrency_metrics
+    assert metrics["backoffs"] >= 1
+    assert metrics["concurrency"] <= 4
+
+
+def test_async_adaptive_concurrency(series):
+    api = ThrottledApi(capacity=100)
+    client = api.client(AsyncNixtlaClient, max_concurrency=8, adaptive_concurrency=True)
+    asyncio.run(client.aforecast(df=series, h=7, num_partitions=40))
+    metrics = client.concurrency_metrics
+    assert metrics["requests"] == 40
+    assert 4 < metrics["concurrency"] <= 8
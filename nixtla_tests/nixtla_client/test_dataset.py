@@ -0,0 +1,75 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import _series_complete_batches
+from nixtla_tests.helpers.mock_api import INPUT_SIZE, MockNixtlaApi
+
+
+@pytest.fixture
+def series():
+    df = generate_series(30, min_length=50, max_length=120, freq="D")
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df.sort_values(["unique_id", "ds"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def dataset(series, tmp_path):
+    # several files with small row groups, so that the series are split
+    # across record batches
+    path = tmp_path / "input"
+    path.mkdir()
+    for i, part in enumerate([series.iloc[:1000], series.iloc[1000:]]):
+        table = pa.Table.from_pandas(part, preserve_index=False)
+        pq.write_table(table, path / f"{i}.parquet", row_group_size=37)
+    return path
+
+
+@pytest.mark.parametrize("level", [None, [80]])
+def test_forecast_dataset(series, dataset, tmp_path, level):
+    client = MockNixtlaApi().client()
+    files = client.forecast_dataset(
+        dataset, tmp_path / "output", h=7, level=level, batch_size=8
+    )
+    assert len(files) > 1
+    res = pd.read_parquet(tmp_path / "output")
+    res = res.sort_values(["unique_id", "ds"]).reset_index(drop=True)
+    expected = client.forecast(df=series, h=7, level=level)
+    pd.testing.assert_frame_equal(res, expected)
+
+
+def test_series_complete_batches(series):
+    table = pa.Table.from_pandas(series, preserve_index=False)
+    batches = table.to_batches(max_chunksize=45)
+    out = list(
+        _series_complete_batches(
+            batches, "unique_id", "ds", n_tail=INPUT_SIZE, batch_size=4
+        )
+    )
+    ids = [set(df["unique_id"]) for df in out]
+    # every series is in a single batch
+    assert sum(len(i) for i in ids) == series["unique_id"].nunique()
+    for df in out:
+        assert (df.groupby("unique_id").size() <= INPUT_SIZE).all()
+    res = pd.concat(out, ignore_index=True)
+    expected = series.groupby("unique_id").tail(INPUT_SIZE).reset_index(drop=True)
+    pd.testing.assert_frame_equal(res, expected)
+
+
+def test_forecast_dataset_unsorted(series, tmp_path):
+    path = tmp_path / "input.parquet"
+    shuffled = series.sample(frac=1.0, random_state=0)
+    pq.write_table(
+        pa.Table.from_pandas(shuffled, preserve_index=False), path, row_group_size=50
+    )
+    client = MockNixtlaApi().client()
+    with pytest.raises(ValueError, match="must be sorted by `unique_id`"):
+        client.forecast_dataset(path, tmp_path / "output", h=7, freq="D")
+
+
+def test_forecast_dataset_unsupported_args(dataset, tmp_path):
+    client = MockNixtlaApi().client()
+    with pytest.raises(ValueError, match="doesn't support `add_history`"):
+        client.forecast_dataset(dataset, tmp_path / "output", h=7, add_history=True)
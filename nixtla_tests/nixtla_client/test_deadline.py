@@ -0,0 +1,213 @@
+import asyncio
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+import orjson
+import pytest
+import zstandard as zstd
+
+from nixtla.nixtla_client import (
+    _BINARY_CONTENT_TYPE,
+    AsyncNixtlaClient,
+    MemoryCache,
+    RetryPolicy,
+    _unpack_arrays,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+SIZES = {"a": 40, "b": 60, "c": 50}
+# last value of the slow series, which is sent in every request
+SLOW_VALUE = 99.0
+
+
+class SlowApi(MockNixtlaApi):
+    # delays the partitions that include the series "b"
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def is_slow(self, request):
+        if request.method != "POST":
+            return False
+        content = request.read()
+        if request.headers.get("content-encoding") == "zstd":
+            content = zstd.ZstdDecompressor().decompress(content)
+        if request.headers.get("content-type") == _BINARY_CONTENT_TYPE:
+            payload = _unpack_arrays(content)
+        else:
+            payload = orjson.loads(content)
+        return SLOW_VALUE in payload["series"]["y"]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.is_slow(request):
+            # honors the timeout like the network transports do
+            timeout = request.extensions["timeout"]["read"]
+            if timeout is not None and timeout < self.delay:
+                time.sleep(timeout)
+                raise httpx.ReadTimeout("timed out", request=request)
+            time.sleep(self.delay)
+        return super().__call__(request)
+
+
+class DownApi(MockNixtlaApi):
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            self.requests.append((request.url.path.strip("/"), request))
+            return httpx.Response(503, json={"detail": "Service Unavailable"})
+        return super().__call__(request)
+
+
+@pytest.fixture
+def series():
+    return pd.DataFrame(
+        {
+            "unique_id": np.repeat(list(SIZES), list(SIZES.values())),
+            "ds": np.hstack(
+                [
+                    pd.date_range("2020-01-01", periods=n, freq="D")
+                    for n in SIZES.values()
+                ]
+            ),
+            "y": np.arange(sum(SIZES.values()), dtype=np.float64),
+        }
+    )
+
+
+def test_raise_on_timeout(series):
+    client = SlowApi(delay=2).client(max_concurrency=3)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError, match="within 0.5s"):
+        client.forecast(df=series, h=7, num_partitions=3, timeout_total=0.5)
+    # the slow request isn't waited for
+    assert time.perf_counter() - start < 1.5
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7)),
+        ("detect_anomalies", dict()),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+def test_partial_results(series, method, kwargs):
+    client = SlowApi(delay=2).client(max_concurrency=3)
+    res = getattr(client, method)(
+        df=series, num_partitions=3, timeout_total=0.5, on_timeout="partial", **kwargs
+    )
+    # the partitions are balanced by size, so "b" can share one
+    assert "b" in client.missing_series
+    assert set(res["unique_id"]) == set(SIZES) - set(client.missing_series)
+    assert res["TimeGPT"].notnull().all()
+    full = getattr(MockNixtlaApi().client(), method)(df=series, **kwargs)
+    full = full[~full["unique_id"].isin(client.missing_series)]
+    full = full.reset_index(drop=True)
+    pd.testing.assert_frame_equal(res.reset_index(drop=True), full)
+
+
+def test_partial_results_arent_cached(series):
+    client = SlowApi(delay=1).client(max_concurrency=3, cache=MemoryCache())
+    client.forecast(
+        df=series, h=7, num_partitions=3, timeout_total=0.5, on_timeout="partial"
+    )
+    assert "b" in client.missing_series
+    res = client.forecast(df=series, h=7, num_partitions=3)
+    assert set(res["unique_id"]) == set(SIZES)
+    assert res["TimeGPT"].notnull().all()
+
+
+def test_no_timeout(series):
+    client = SlowApi(delay=0.1).client(max_concurrency=3)
+    res = client.forecast(df=series, h=7, num_partitions=3, timeout_total=10)
+    assert client.missing_series == []
+    assert set(res["unique_id"]) == {"a", "b", "c"}
+
+
+def test_partial_without_completed_partitions_raises(series):
+    client = SlowApi(delay=2).client()
+    with pytest.raises(TimeoutError):
+        client.forecast(df=series, h=7, timeout_total=0.5, on_timeout="partial")
+
+
+def test_retries_stop_at_deadline(series):
+    api = DownApi()
+    client = api.client(
+        retry_policy=RetryPolicy(initial_interval=0.2, jitter=False, budget_ratio=None)
+    )
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        client.forecast(df=series, h=7, timeout_total=0.5)
+    assert time.perf_counter() - start < 1
+    # the retry that would go past the deadline isn't attempted
+    assert len(api.endpoint_calls("v2/forecast")) < 6
+
+
+def _async_client():
+    api = SlowApi(delay=0)
+    client = api.client(AsyncNixtlaClient, max_concurrency=3)
+
+    async def handler(request):
+        if api.is_slow(request):
+            await asyncio.sleep(2)
+        return api(request)
+
+    transport = httpx.MockTransport(handler)
+    client._make_async_client = lambda **kw: httpx.AsyncClient(
+        transport=transport, **kw
+    )
+    return client
+
+
+def test_async_partial_results(series):
+    client = _async_client()
+
+    async def run(**kwargs):
+        res = await client.aforecast(
+            df=series, h=7, num_partitions=3, timeout_total=0.5, **kwargs
+        )
+        return res, client.missing_series
+
+    start = time.perf_counter()
+    res, missing_series = asyncio.run(run(on_timeout="partial"))
+    assert time.perf_counter() - start < 1.5
+    assert missing_series == ["b"]
+    assert set(res["unique_id"]) == {"a", "c"}
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_missing_series_per_call(series):
+    client = _async_client()
+
+    async def main():
+        partial_done = asyncio.Event()
+
+        async def partial():
+            await client.aforecast(
+                df=series,
+                h=7,
+                num_partitions=3,
+                timeout_total=0.5,
+                on_timeout="partial",
+            )
+            partial_done.set()
+            return client.missing_series
+
+        async def complete():
+            await client.aforecast(
+                df=series[series["unique_id"] != "b"],
+                h=7,
+                timeout_total=0.5,
+                on_timeout="partial",
+            )
+            # the other call finished after this one
+            await partial_done.wait()
+            return client.missing_series
+
+        return await asyncio.gather(partial(), complete())
+
+    partial_missing, complete_missing = asyncio.run(main())
+    assert partial_missing == ["b"]
+    assert complete_missing == []
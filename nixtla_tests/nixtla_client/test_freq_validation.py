@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import _irregular_series
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+def _series(freq, n_series=8):
+    df = generate_series(
+        n_series,
+        min_length=30,
+        max_length=60,
+        freq="D" if isinstance(freq, int) else freq,
+    )
+    df["unique_id"] = df["unique_id"].astype(str)
+    if isinstance(freq, int):
+        df["ds"] = df.groupby("unique_id").cumcount() * freq
+    return df
+
+
+def _break(df):
+    # drops a timestamp from one serie and duplicates one from another
+    first = df.index[df["unique_id"] == "1"][5]
+    dup = df[df["unique_id"] == "4"].iloc[[3]]
+    return pd.concat([df.drop(index=first), dup], ignore_index=True)
+
+
+@pytest.mark.parametrize(
+    "freq,pl_freq",
+    [
+        ("D", "1d"),
+        ("h", "1h"),
+        ("W-SUN", "1w"),
+        ("MS", "1mo"),
+        ("ME", "1mo"),
+        ("QS", "3mo"),
+        ("YE", "1y"),
+        ("B", None),
+        (1, 1),
+    ],
+)
+def test_matches_grid(freq, pl_freq):
+    df = _series(freq)
+    shuffled = df.sample(frac=1.0, random_state=0)
+    for data in (df, shuffled):
+        assert _irregular_series(data, freq, "unique_id", "ds") == []
+    bad = _break(shuffled)
+    assert _irregular_series(bad, freq, "unique_id", "ds") == ["1", "4"]
+    if pl_freq is not None:
+        assert _irregular_series(pl.from_pandas(df), pl_freq, "unique_id", "ds") == []
+        pl_bad = pl.from_pandas(bad)
+        assert _irregular_series(pl_bad, pl_freq, "unique_id", "ds") == ["1", "4"]
+
+
+def test_calendar_offsets():
+    # month ends aren't spaced by a fixed number of days
+    df = pd.DataFrame(
+        {
+            "unique_id": ["a"] * 3 + ["b"] * 3,
+            "ds": pd.to_datetime(
+                [
+                    "2020-01-31",
+                    "2020-02-29",
+                    "2020-03-31",
+                    "2020-01-31",
+                    "2020-02-29",
+                    "2020-03-29",
+                ]
+            ),
+        }
+    )
+    assert _irregular_series(df, "ME", "unique_id", "ds") == ["b"]
+    assert _irregular_series(df, pd.offsets.MonthEnd(), "unique_id", "ds") == ["b"]
+    assert _irregular_series(pl.from_pandas(df), "1mo", "unique_id", "ds") == ["b"]
+    # the aliases start at the anchored dates
+    unanchored = df.assign(ds=df["ds"].where(df.index != 0, pd.Timestamp("2020-01-15")))
+    assert _irregular_series(unanchored.head(3), "ME", "unique_id", "ds") == ["a"]
+    # business days skip the weekends
+    days = pd.bdate_range("2024-01-01", periods=10)
+    bdays = pd.DataFrame({"unique_id": "a", "ds": days})
+    assert _irregular_series(bdays, "B", "unique_id", "ds") == []
+    assert _irregular_series(bdays, "D", "unique_id", "ds") == ["a"]
+
+
+def test_categorical_ids():
+    df = _break(_series("D"))
+    df["unique_id"] = df["unique_id"].astype("category")
+    assert _irregular_series(df, "D", "unique_id", "ds") == ["1", "4"]
+
+
+@pytest.mark.parametrize("to_polars", [False, True])
+def test_error_reports_ids(to_polars):
+    df = _break(_series("D"))
+    if to_polars:
+        df = pl.from_pandas(df)
+    client = MockNixtlaApi().client(freq_validation="vectorized")
+    with pytest.raises(ValueError, match="irregular timestamps: 1, 4"):
+        client.forecast(df=df, h=7)
+
+
+def test_vectorized_forecast():
+    df = _series("D")
+    vectorized = MockNixtlaApi().client(freq_validation="vectorized")
+    grid = MockNixtlaApi().client()
+    pd.testing.assert_frame_equal(
+        vectorized.forecast(df=df, h=7), grid.forecast(df=df, h=7)
+    )
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import httpx
+import pytest
+
+from nixtla.nixtla_client import AsyncNixtlaClient, HedgePolicy, NixtlaClient
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+class SlowFirstApi(MockNixtlaApi):
+    # the first forecast request is slow, the following ones are fast
+    def __init__(self, slow_requests=(0,), delay=1.0):
+        super().__init__()
+        self.slow_requests = set(slow_requests)
+        self.delay = delay
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("v2/forecast"):
+            with self._lock:
+                n = next(self._counter)
+            if n in self.slow_requests:
+                time.sleep(self.delay)
+        return super().__call__(request)
+
+
+class AsyncSlowFirstApi(SlowFirstApi):
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("v2/forecast"):
+            with self._lock:
+                n = next(self._counter)
+            if n in self.slow_requests:
+                await asyncio.sleep(self.delay)
+        return MockNixtlaApi.__call__(self, request)
+
+
+def test_hedge_wins(daily_series):
+    api = SlowFirstApi()
+    client = api.client(hedge_policy=HedgePolicy(delay=0.05, max_hedge_ratio=1))
+    start = time.perf_counter()
+    fcst = client.forecast(df=daily_series, h=7)
+    assert time.perf_counter() - start < 0.8
+    metrics = client.hedge_metrics
+    assert metrics["hedges"] == 1
+    assert metrics["wins"] == 1
+    assert metrics["losses"] == 0
+    no_hedge = MockNixtlaApi().client().forecast(df=daily_series, h=7)
+    assert fcst.equals(no_hedge)
+
+
+def test_hedge_loses(daily_series):
+    # the duplicate is slower than the original request
+    api = SlowFirstApi(slow_requests=(1,), delay=0.3)
+    client = api.client(hedge_policy=HedgePolicy(delay=0.0, max_hedge_ratio=1))
+    client.forecast(df=daily_series, h=7)
+    metrics = client.hedge_metrics
+    assert metrics["hedges"] == 1
+    assert metrics["wins"] + metrics["losses"] == 1
+
+
+class SlowHedgeClient(NixtlaClient):
+    # the payload of the hedge takes a while to be encoded
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encoded = itertools.count()
+
+    def _encode(self, *args, **kwargs):
+        if next(self._encoded) == 1:
+            time.sleep(0.3)
+        return super()._encode(*args, **kwargs)
+
+
+def test_loser_isnt_sent(daily_series):
+    api = SlowFirstApi(delay=0.1)
+    client = api.client(
+        SlowHedgeClient, hedge_policy=HedgePolicy(delay=0.0, max_hedge_ratio=1)
+    )
+    client.forecast(df=daily_series, h=7)
+    assert client.hedge_metrics["losses"] == 1
+    # the hedge is dropped once the original request has returned
+    time.sleep(0.4)
+    assert len(api.endpoint_calls("v2/forecast")) == 1
+
+
+def test_executor_is_reused(daily_series):
+    api = SlowFirstApi(slow_requests=())
+    client = api.client(hedge_policy=HedgePolicy(delay=0.0, max_hedge_ratio=1))
+    client.forecast(df=daily_series, h=7)
+    executor = client._hedge_executor
+    client.forecast(df=daily_series, h=7)
+    assert client._hedge_executor is executor
+    client.close()
+    assert client._hedge_executor is None
+    client.forecast(df=daily_series, h=7)
+    assert client._hedge_executor is not None
+
+
+def test_hedge_rate_is_capped(daily_series):
+    api = SlowFirstApi(slow_requests=range(100), delay=0.02)
+    policy = HedgePolicy(delay=0.0, max_hedge_ratio=0.25)
+    client = api.client(hedge_policy=policy)
+    for _ in range(8):
+        client.forecast(df=daily_series, h=7)
+    metrics = client.hedge_metrics
+    assert metrics["requests"] == 8
+    assert metrics["hedges"] == 2
+    assert metrics["hedge_rate"] == 0.25
+
+
+def test_adaptive_delay(daily_series):
+    api = SlowFirstApi(slow_requests=())
+    client = api.client(hedge_policy=HedgePolicy(min_samples=3, min_delay=0.01))
+    assert client.hedge_metrics["delay"] is None
+    for _ in range(3):
+        client.forecast(df=daily_series, h=7)
+    # no hedges while there's no data to compute the delay
+    assert client.hedge_metrics["hedges"] == 0
+    assert client.hedge_metrics["delay"] >= 0.01
+    assert len(api.endpoint_calls("v2/forecast")) == 3
+
+
+def test_finetune_isnt_hedged(daily_series):
+    api = SlowFirstApi(slow_requests=())
+    client = api.client(hedge_policy=HedgePolicy(delay=0.0, max_hedge_ratio=1))
+    client.finetune(df=daily_series)
+    assert len(api.endpoint_calls("v2/finetune")) == 1
+    assert MockNixtlaApi().client().hedge_metrics is None
+
+
+def test_async_hedge(daily_series):
+    api = AsyncSlowFirstApi()
+    client = api.client(
+        AsyncNixtlaClient, hedge_policy=HedgePolicy(delay=0.05, max_hedge_ratio=1)
+    )
+    start = time.perf_counter()
+    asyncio.run(client.aforecast(df=daily_series, h=7))
+    assert time.perf_counter() - start < 0.8
+    assert client.hedge_metrics["wins"] == 1
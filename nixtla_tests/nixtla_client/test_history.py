@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+import zstandard as zstd
+
+from nixtla.nixtla_client import (
+    _BINARY_CONTENT_TYPE,
+    AsyncNixtlaClient,
+    _in_sample_tails,
+    _unpack_arrays,
+)
+from nixtla_tests.helpers.mock_api import HORIZON, INPUT_SIZE, MockNixtlaApi
+
+
+class SlowApi(MockNixtlaApi):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            time.sleep(self.delay)
+        return super().__call__(request)
+
+
+def _payload(request):
+    content = request.read()
+    if request.headers.get("content-encoding") == "zstd":
+        content = zstd.ZstdDecompressor().decompress(content)
+    if request.headers.get("content-type") == _BINARY_CONTENT_TYPE:
+        return _unpack_arrays(content)
+    return orjson.loads(content)
+
+
+def _sizes(api, endpoint):
+    # the sizes of the series sent to an endpoint, over all its requests
+    sizes = []
+    for request in api.endpoint_calls(endpoint):
+        sizes.extend(np.asarray(_payload(request)["series"]["sizes"]).tolist())
+    return sizes
+
+
+class InFlightApi(SlowApi):
+    # tracks the maximum number of requests in flight
+    def __init__(self, delay):
+        super().__init__(delay)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, request):
+        if request.method == "POST":
+            with self._lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _exit(self, request):
+        if request.method == "POST":
+            with self._lock:
+                self.in_flight -= 1
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._enter(request)
+        try:
+            return super().__call__(request)
+        finally:
+            self._exit(request)
+
+
+class AsyncInFlightApi(InFlightApi):
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._enter(request)
+        try:
+            if request.method == "POST":
+                await asyncio.sleep(self.delay)
+            return MockNixtlaApi.__call__(self, request)
+        finally:
+            self._exit(request)
+
+
+@pytest.mark.parametrize("num_partitions", [None, 2])
+def test_requests_are_concurrent(daily_series, num_partitions):
+    delay = 0.3
+    client = SlowApi(delay).client(max_concurrency=4)
+    start = time.perf_counter()
+    client.forecast(
+        df=daily_series, h=7, add_history=True, num_partitions=num_partitions
+    )
+    # both endpoints are called at the same time
+    assert time.perf_counter() - start < 1.8 * delay
+
+
+@pytest.mark.parametrize("num_partitions,max_concurrency", [(None, 1), (3, 2)])
+def test_calls_share_the_concurrency(daily_series, num_partitions, max_concurrency):
+    api = InFlightApi(0.05)
+    client = api.client(max_concurrency=max_concurrency)
+    client.forecast(
+        df=daily_series, h=7, add_history=True, num_partitions=num_partitions
+    )
+    assert api.max_in_flight == max_concurrency
+
+
+def test_async_calls_share_the_concurrency(daily_series):
+    api = AsyncInFlightApi(0.05)
+    client = api.client(AsyncNixtlaClient, max_concurrency=2)
+    asyncio.run(
+        client.aforecast(df=daily_series, h=7, add_history=True, num_partitions=3)
+    )
+    assert api.max_in_flight == 2
+
+
+def test_forecast_input_is_restricted(daily_series):
+    api = MockNixtlaApi()
+    client = api.client()
+    fcst = client.forecast(df=daily_series, h=7, add_history=True)
+    assert _sizes(api, "v2/forecast") == [INPUT_SIZE] * 5
+    # the fitted values use the whole history
+    expected_sizes = daily_series.groupby("unique_id", observed=True).size().tolist()
+    assert _sizes(api, "v2/historic_forecast") == expected_sizes
+    future = fcst.groupby("unique_id").tail(7).reset_index(drop=True)
+    pd.testing.assert_frame_equal(future, client.forecast(df=daily_series, h=7))
+
+
+@pytest.mark.parametrize("level", [None, [80]])
+def test_history_window(daily_series, level):
+    api = MockNixtlaApi()
+    client = api.client()
+    full = client.forecast(df=daily_series, h=7, add_history=True, level=level)
+    api.requests.clear()
+    res = client.forecast(
+        df=daily_series, h=7, add_history=True, level=level, history_window=5
+    )
+    assert _sizes(api, "v2/historic_forecast") == [INPUT_SIZE + HORIZON + 5] * 5
+    assert res.groupby("unique_id").size().tolist() == [5 + 7] * 5
+    expected = full.groupby("unique_id").tail(5 + 7).reset_index(drop=True)
+    pd.testing.assert_frame_equal(res, expected)
+
+
+def test_in_sample_tails():
+    resp = {
+        "mean": np.arange(10.0),
+        "sizes": [3, 7],
+        "intervals": {"lo-80": np.arange(10.0), "hi-80": None},
+        "feature_contributions": [np.arange(10.0)],
+    }
+    out = _in_sample_tails(resp, 4)
+    expected = [0.0, 1.0, 2.0, 6.0, 7.0, 8.0, 9.0]
+    np.testing.assert_array_equal(out["sizes"], [3, 4])
+    np.testing.assert_array_equal(out["mean"], expected)
+    np.testing.assert_array_equal(out["intervals"]["lo-80"], expected)
+    assert out["intervals"]["hi-80"] is None
+    np.testing.assert_array_equal(out["feature_contributions"][0], expected)
+    assert _in_sample_tails(resp, 7) is resp
+
+
+def test_history_window_requires_add_history(daily_series):
+    client = MockNixtlaApi().client()
+    with pytest.raises(ValueError, match="requires `add_history=True`"):
+        client.forecast(df=daily_series, h=7, history_window=5)
@@ -0,0 +1,109 @@
+import pandas as pd
+import polars as pl
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+@pytest.fixture
+def series():
+    df = generate_series(
+        12, min_length=50, max_length=120, freq="D", n_static_features=1
+    )
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+def _concat(parts, sort_cols):
+    return pd.concat(parts).sort_values(sort_cols).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "method,kwargs,sort_cols",
+    [
+        ("forecast", dict(h=7, level=[80]), ["unique_id", "ds"]),
+        ("forecast", dict(h=7, add_history=True), ["unique_id", "ds"]),
+        ("detect_anomalies", dict(level=99), ["unique_id", "ds"]),
+        ("cross_validation", dict(h=7, n_windows=2), ["unique_id", "cutoff", "ds"]),
+    ],
+)
+def test_iter_matches_full(series, method, kwargs, sort_cols):
+    df = series.drop(columns="static_0")
+    client = MockNixtlaApi().client(max_concurrency=2)
+    it = getattr(client, f"{method}_iter")(df=df, num_partitions=4, **kwargs)
+    parts = [part.df for part in it]
+    assert len(parts) == 4
+    # every partition has a disjoint set of series
+    part_ids = [set(part["unique_id"]) for part in parts]
+    assert sum(len(ids) for ids in part_ids) == df["unique_id"].nunique()
+    expected = getattr(client, method)(df=df, **kwargs)
+    pd.testing.assert_frame_equal(
+        _concat(parts, sort_cols), _concat([expected], sort_cols)
+    )
+
+
+def test_forecast_iter_exogenous(series):
+    client = MockNixtlaApi().client()
+    X_df = series.groupby("unique_id").tail(7).copy()
+    X_df["ds"] += pd.Timedelta(days=7)
+    X_df = X_df.drop(columns="y")
+    parts = list(
+        client.forecast_iter(
+            df=series, X_df=X_df, h=7, num_partitions=3, feature_contributions=True
+        )
+    )
+    # the outputs of the partitions are returned with them, not set in the client
+    assert not hasattr(client, "weights_x")
+    assert not hasattr(client, "feature_contributions")
+    for part in parts:
+        assert part.weights_x["features"].tolist() == ["static_0"]
+        pd.testing.assert_frame_equal(
+            part.feature_contributions[["unique_id", "ds"]],
+            part.df[["unique_id", "ds"]],
+        )
+    expected = client.forecast(df=series, X_df=X_df, h=7, feature_contributions=True)
+    cols = ["unique_id", "ds"]
+    pd.testing.assert_frame_equal(
+        _concat([part.df for part in parts], cols), _concat([expected], cols)
+    )
+    pd.testing.assert_frame_equal(
+        _concat([part.feature_contributions for part in parts], cols),
+        _concat([client.feature_contributions], cols),
+    )
+
+
+def test_forecast_iter_polars(series):
+    df = pl.from_pandas(series.drop(columns="static_0"))
+    client = MockNixtlaApi().client()
+    it = client.forecast_iter(df=df, h=7, freq="1d", num_partitions=3)
+    parts = [part.df for part in it]
+    assert all(isinstance(part, pl.DataFrame) for part in parts)
+    res = pl.concat(parts).sort(["unique_id", "ds"])
+    expected = client.forecast(df=df, h=7, freq="1d").sort(["unique_id", "ds"])
+    assert res.equals(expected)
+
+
+def test_forecast_iter_default_partitions(series):
+    df = series.drop(columns="static_0")
+    client = MockNixtlaApi().client(max_concurrency=3)
+    assert len(list(client.forecast_iter(df=df, h=7))) == 3
+
+
+def test_forecast_iter_early_stop(series):
+    df = series.drop(columns="static_0")
+    api = MockNixtlaApi()
+    client = api.client(max_concurrency=1)
+    it = client.forecast_iter(df=df, h=7, num_partitions=6)
+    next(it)
+    it.close()
+    # the remaining partitions aren't requested
+    assert len(api.endpoint_calls("v2/forecast")) < 6
+
+
+def test_iter_unsupported_args(series):
+    client = MockNixtlaApi().client()
+    with pytest.raises(ValueError, match="doesn't support `multivariate`"):
+        next(client.forecast_iter(df=series, h=7, multivariate=True))
+    with pytest.raises(ValueError, match="doesn't support `finetune_steps`"):
+        next(client.cross_validation_iter(df=series, h=7, finetune_steps=2))
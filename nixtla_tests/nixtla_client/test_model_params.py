@@ -0,0 +1,115 @@
+import asyncio
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from nixtla.nixtla_client import AsyncNixtlaClient, _model_params_cache
+from nixtla_tests.helpers.mock_api import HORIZON, INPUT_SIZE, MockNixtlaApi
+
+
+class SlowApi(MockNixtlaApi):
+    def _get(self, endpoint, request):
+        time.sleep(0.1)
+        return super()._get(endpoint, request)
+
+
+class AsyncSlowApi(MockNixtlaApi):
+    def client(self, cls=AsyncNixtlaClient, **kwargs):
+        client = super().client(cls, **kwargs)
+
+        async def handler(request):
+            await asyncio.sleep(0.1)
+            return self(request)
+
+        transport = httpx.MockTransport(handler)
+        client._make_async_client = lambda **kw: httpx.AsyncClient(
+            transport=transport, **kw
+        )
+        return client
+
+
+def test_model_params_shared_by_clients(daily_series):
+    api = MockNixtlaApi()
+    for _ in range(3):
+        api.client().forecast(df=daily_series, h=7)
+    assert len(api.endpoint_calls("model_params")) == 1
+    # different frequencies are requested separately
+    assert api.client()._get_model_params("timegpt-1", "H") == (INPUT_SIZE, HORIZON)
+    assert len(api.endpoint_calls("model_params")) == 2
+
+
+def test_concurrent_lookups_are_deduplicated():
+    api = SlowApi()
+
+    def get_params(_):
+        return api.client()._get_model_params("timegpt-1", "D")
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(get_params, range(8)))
+    assert results == [(INPUT_SIZE, HORIZON)] * 8
+    assert len(api.endpoint_calls("model_params")) == 1
+
+
+def test_async_lookups_are_deduplicated(daily_series):
+    api = AsyncSlowApi()
+    client = api.client()
+
+    async def run():
+        return await asyncio.gather(
+            *[client.aforecast(df=daily_series, h=7) for _ in range(5)]
+        )
+
+    asyncio.run(run())
+    assert len(api.endpoint_calls("model_params")) == 1
+
+
+def test_model_params_on_disk(tmp_path):
+    api = MockNixtlaApi()
+    path = tmp_path / "model_params.json"
+    api.client(model_params_cache=path)._get_model_params("timegpt-1", "D")
+    assert path.exists()
+    # a new process only has the file
+    _model_params_cache.clear()
+    params = api.client(model_params_cache=path)._get_model_params("timegpt-1", "D")
+    assert params == (INPUT_SIZE, HORIZON)
+    assert len(api.endpoint_calls("model_params")) == 1
+    # expired metadata is requested again
+    client = api.client(model_params_cache=path, model_params_ttl=0)
+    client._get_model_params("timegpt-1", "D")
+    assert len(api.endpoint_calls("model_params")) == 2
+
+
+def test_prefetch_model_params():
+    api = MockNixtlaApi()
+    client = api.client()
+    client._prefetch_model_params("timegpt-1", "D")
+    # the workers receive a copy of the client with the metadata
+    worker_client = copy.deepcopy(client)
+    _model_params_cache.clear()
+    assert worker_client._get_model_params("timegpt-1", "D") == (INPUT_SIZE, HORIZON)
+    assert len(api.endpoint_calls("model_params")) == 1
+    client._prefetch_model_params("timegpt-1", None)
+    assert len(api.endpoint_calls("model_params")) == 1
+
+
+class AzureApi(MockNixtlaApi):
+    # azure endpoints request the metadata with a POST
+    def __init__(self):
+        super().__init__()
+        self.base_url = self.base_url.replace(".nixtla", ".ai.azure.com")
+
+    def model_params(self, payload):
+        return {"detail": {"input_size": INPUT_SIZE, "horizon": HORIZON}}
+
+
+def test_azure_model_params(daily_series):
+    api = AzureApi()
+    client = api.client()
+    assert client._get_model_params("azureai", "D") == (INPUT_SIZE, HORIZON)
+    [request] = api.endpoint_calls("model_params")
+    assert request.method == "POST"
+    fcst = client.forecast(df=daily_series, h=7, model="azureai")
+    assert fcst.shape[0] == 7 * daily_series["unique_id"].nunique()
@@ -8,6 +8,7 @@ import pytest
 import zstandard as zstd
 from pydantic import ValidationError
 
+from nixtla.nixtla_client import NixtlaClient
 from nixtla_tests.conftest import HYPER_PARAMS_TEST
 from nixtla_tests.helpers.checks import (
     check_equal_fcsts_add_history,
@@ -162,9 +163,10 @@ def test_forecast_date_features_multiple_series_and_different_ends(
         assert actual == expected
 
 
-def test_compression(nixtla_test_client, series_1MB_payload):
+def test_compression(series_1MB_payload):
     with capture_request():
-        nixtla_test_client.forecast(
+        # the connection pool is created on first use, so we need a new client
+        NixtlaClient().forecast(
             df=series_1MB_payload,
             freq="D",
             h=1,
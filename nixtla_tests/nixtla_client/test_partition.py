@@ -0,0 +1,179 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla import nixtla_client
+from nixtla.nixtla_client import (
+    AsyncNixtlaClient,
+    NixtlaClient,
+    RetryPolicy,
+    _compact_partition_result,
+    _encode_payload,
+    _estimate_payload_size,
+    _partition_series,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+class FlakyApi(MockNixtlaApi):
+    # fails the first attempt of every request
+    def __init__(self):
+        super().__init__()
+        self.seen = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        content = request.read()
+        if request.method == "POST" and content not in self.seen:
+            self.seen.add(content)
+            self.requests.append((request.url.path.strip("/"), request))
+            return httpx.Response(503, json={"detail": "Service Unavailable"})
+        return super().__call__(request)
+
+
+def _payload(sizes, n_x=2, h=3):
+    n_obs = sum(sizes)
+    return {
+        "series": {
+            "y": np.arange(n_obs, dtype=np.float32),
+            "sizes": np.array(sizes),
+            "X": [np.arange(n_obs, dtype=np.float32) + i for i in range(n_x)],
+            "X_future": [
+                np.arange(len(sizes) * h, dtype=np.float32) + i for i in range(n_x)
+            ],
+        },
+        "h": h,
+    }
+
+
+def test_partition_series_balances_observations():
+    sizes = [50_000] + [50] * 99 + [50_000] + [50] * 99
+    parts = _partition_series(_payload(sizes), 2, 3)
+    assert [len(p["series"]["sizes"]) for p in parts] == [100, 100]
+    n_obs = [p["series"]["y"].size for p in parts]
+    assert n_obs[0] == n_obs[1]
+    # a single large series can't be split
+    parts = _partition_series(_payload([10, 100_000, 10]), 3, 3)
+    assert [p["series"]["sizes"].tolist() for p in parts] == [
+        [10, 100_000],
+        [10],
+    ]
+
+
+def test_partition_series_slices_arrays():
+    sizes = [5, 10, 3, 7, 20]
+    h = 3
+    payload = _payload(sizes, h=h)
+    parts = _partition_series(payload, 3, h)
+    series = payload["series"]
+    for name in ("y", "sizes"):
+        np.testing.assert_array_equal(
+            np.hstack([p["series"][name] for p in parts]), series[name]
+        )
+    for name in ("X", "X_future"):
+        for i, x in enumerate(series[name]):
+            np.testing.assert_array_equal(
+                np.hstack([p["series"][name][i] for p in parts]), x
+            )
+    assert all(p["h"] == h for p in parts)
+    assert "series" in payload
+
+
+def test_estimate_payload_size():
+    payload = _payload([100] * 10, n_x=2, h=3)
+    n_values = 1000 * 3 + 10 * 3 * 2
+    assert (
+        _estimate_payload_size(payload["series"], 3, "binary") == n_values * 4 + 10 * 16
+    )
+    assert _estimate_payload_size(payload["series"], 3, "json") > 4 * n_values
+
+
+@pytest.fixture
+def series():
+    df = generate_series(20, min_length=50, max_length=500, freq="D")
+    df["unique_id"] = df["unique_id"].astype(str)
+    return df
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80], add_history=True)),
+        ("detect_anomalies_online", dict(h=7, detection_size=5)),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+def test_auto_partition(series, method, kwargs):
+    api = MockNixtlaApi()
+    expected = getattr(api.client(partition_size_mb=None), method)(df=series, **kwargs)
+    n_requests = len(api.requests)
+    res = getattr(api.client(partition_size_mb=0.01), method)(df=series, **kwargs)
+    # at least as many partitions as concurrent requests
+    assert len(api.requests) - n_requests >= 10
+    pd.testing.assert_frame_equal(res, expected)
+
+
+def test_no_auto_partition_multivariate(series):
+    api = MockNixtlaApi()
+    client = api.client(partition_size_mb=0.01)
+    client.forecast(df=series, h=7, multivariate=True)
+    assert len(api.endpoint_calls("v2/forecast")) == 1
+    client.forecast(df=series, h=7, finetune_steps=2)
+    assert len(api.endpoint_calls("v2/forecast")) == 2
+
+
+def test_encode_payload_keeps_payload():
+    payload = _payload([5, 10], h=3)
+    payload["series"]["y"] = payload["series"]["y"].astype(np.float64)
+    _encode_payload(payload, multithreaded_compress=False, codec="binary")
+    # the float32 copies aren't stored in the payload
+    assert payload["series"]["y"].dtype == np.float64
+
+
+def test_compact_partition_result():
+    resp = {
+        "mean": [1.0, 2.0],
+        "sizes": [1, 1],
+        "intervals": {"lo-80": [0.5, 1.5]},
+        "weights_x": [[1.0], [2.0]],
+        "feature_contributions": [[0.0, 1.0], [2.0, 3.0]],
+    }
+    compact = _compact_partition_result(resp)
+    assert compact["mean"].dtype == np.float64
+    assert compact["sizes"].dtype == np.int64
+    assert isinstance(compact["intervals"]["lo-80"], np.ndarray)
+    assert compact["feature_contributions"].shape == (2, 2)
+    assert compact["weights_x"] == resp["weights_x"]
+    # missing values are kept as lists
+    assert _compact_partition_result({"mean": [None, 1.0]})["mean"] == [None, 1.0]
+
+
+@pytest.mark.parametrize("cls", [NixtlaClient, AsyncNixtlaClient])
+def test_partitions_encoded_once(series, monkeypatch, cls):
+    api = FlakyApi()
+    client = api.client(
+        cls,
+        max_concurrency=2,
+        retry_policy=RetryPolicy(initial_interval=0, budget_ratio=None),
+    )
+    n_encoded = 0
+    encode_payload = nixtla_client._encode_payload
+
+    def counting_encode(*args, **kwargs):
+        nonlocal n_encoded
+        n_encoded += 1
+        return encode_payload(*args, **kwargs)
+
+    monkeypatch.setattr(nixtla_client, "_encode_payload", counting_encode)
+    if cls is AsyncNixtlaClient:
+        res = asyncio.run(client.aforecast(df=series, h=7, num_partitions=5))
+    else:
+        res = client.forecast(df=series, h=7, num_partitions=5)
+    # the retries send the payloads that were already encoded
+    assert len(api.endpoint_calls("v2/forecast")) == 10
+    assert n_encoded == 5
+    expected = MockNixtlaApi().client().forecast(df=series, h=7)
+    pd.testing.assert_frame_equal(res, expected)
@@ -0,0 +1,129 @@
+import pandas as pd
+import polars as pl
+import pytest
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import NixtlaClient, _maybe_infer_freq
+from nixtla_tests.helpers.mock_api import INPUT_SIZE, MockNixtlaApi
+
+
+@pytest.fixture
+def series(daily_series):
+    return pl.from_pandas(daily_series)
+
+
+@pytest.mark.parametrize(
+    "freq,expected",
+    [("D", "1d"), ("h", "1h"), ("15min", "15m"), ("W-SUN", "1w"), ("MS", "1mo")],
+)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_infer_freq(freq, expected, lazy):
+    df = pl.from_pandas(generate_series(3, freq=freq).astype({"unique_id": str}))
+    if lazy:
+        df = df.lazy()
+    assert _maybe_infer_freq(df, None, "unique_id", "ds") == expected
+
+
+def test_infer_freq_irregular():
+    df = pl.DataFrame({"unique_id": ["a"] * 3, "ds": [1, 2, 4], "y": [1.0, 2.0, 3.0]})
+    with pytest.raises(RuntimeError, match="Could not infer the frequency"):
+        _maybe_infer_freq(df, None, "unique_id", "ds")
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80])),
+        ("forecast", dict(h=7, add_history=True)),
+        ("detect_anomalies", dict()),
+        ("detect_anomalies_online", dict(h=7, detection_size=5)),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+def test_lazy_frame(series, method, kwargs):
+    client = MockNixtlaApi().client()
+    # shuffled, so that the sorting is done by the query
+    lazy = series.sample(fraction=1.0, shuffle=True, seed=0).lazy()
+    res = getattr(client, method)(df=lazy, **kwargs)
+    expected = getattr(client, method)(df=series, freq="1d", **kwargs)
+    assert isinstance(res, pl.DataFrame)
+    assert res.equals(expected)
+
+
+def test_lazy_frame_collects_tails(series):
+    client = MockNixtlaApi().client()
+    df, freq = client._run(
+        client._collect_lazy_steps(
+            series.lazy(),
+            freq=None,
+            id_col="unique_id",
+            time_col="ds",
+            target_col="y",
+            restrict_input=True,
+            h=7,
+        )
+    )
+    assert freq == "1d"
+    assert (df["unique_id"].value_counts()["count"] == INPUT_SIZE).all()
+    expected = series.group_by("unique_id", maintain_order=True).tail(INPUT_SIZE)
+    assert df.sort("unique_id", "ds").equals(expected.sort("unique_id", "ds"))
+
+
+@pytest.fixture
+def dirty_df():
+    # missing dates, negative values and leading zeros
+    return pd.DataFrame(
+        {
+            "unique_id": ["a"] * 4 + ["b"] * 4,
+            "ds": pd.to_datetime(
+                [
+                    "2023-01-01",
+                    "2023-01-02",
+                    "2023-01-04",
+                    "2023-01-05",
+                    "2023-01-01",
+                    "2023-01-02",
+                    "2023-01-03",
+                    "2023-01-04",
+                ]
+            ),
+            "y": [0.0, 0.0, -2.0, 3.0, 1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+
+def test_audit_and_clean_data(dirty_df):
+    client = NixtlaClient(api_key="dummy")
+    pd_audit = client.audit_data(dirty_df, freq="D")
+    pl_audit = client.audit_data(pl.from_pandas(dirty_df), freq="1d")
+    assert pd_audit[0] is pl_audit[0] is False
+    for pd_dict, pl_dict in zip(pd_audit[1:], pl_audit[1:]):
+        assert pd_dict.keys() == pl_dict.keys()
+        for k in pd_dict:
+            assert len(pd_dict[k]) == len(pl_dict[k])
+    pd_clean = client.clean_data(
+        dirty_df, *pd_audit[1:], freq="D", clean_case_specific=True
+    )
+    pl_clean = client.clean_data(
+        pl.from_pandas(dirty_df), *pl_audit[1:], freq="1d", clean_case_specific=True
+    )
+    assert pd_clean[1] is pl_clean[1] is True
+    pl_res = pl_clean[0].sort("unique_id", "ds").to_pandas()
+    pd_res = pd_clean[0].sort_values(["unique_id", "ds"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(pl_res, pd_res)
+
+
+def test_clean_duplicates(dirty_df):
+    df = pl.from_pandas(pd.concat([dirty_df, dirty_df.iloc[[0]]]))
+    client = NixtlaClient(api_key="dummy")
+    _, fail_dict, case_specific_dict = client.audit_data(df, freq="1d")
+    assert len(fail_dict["D001"]) == 2
+    assert fail_dict["D002"] is None
+    cleaned, *_ = client.clean_data(
+        df, fail_dict, case_specific_dict, freq="1d", agg_dict={"y": "sum"}
+    )
+    assert cleaned.height == dirty_df.shape[0]
+    with pytest.raises(ValueError, match="Only the names of the aggregations"):
+        client.clean_data(
+            df, fail_dict, case_specific_dict, freq="1d", agg_dict={"y": sum}
+        )
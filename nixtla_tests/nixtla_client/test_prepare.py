@@ -0,0 +1,116 @@
+import numpy as np
+import orjson
+import pandas as pd
+import polars as pl
+import pytest
+import zstandard as zstd
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import PreparedSeries
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+def _payload(request):
+    content = request.read()
+    if request.headers.get("content-encoding") == "zstd":
+        content = zstd.ZstdDecompressor().decompress(content)
+    return orjson.loads(content)
+
+
+@pytest.fixture
+def series(daily_series):
+    # unsorted, so that the prepared series are sorted
+    return daily_series.sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "method,kwargs",
+    [
+        ("forecast", dict(h=7, level=[80, 90])),
+        ("forecast", dict(h=7, add_history=True)),
+        ("detect_anomalies", dict(level=99)),
+        ("detect_anomalies_online", dict(h=7, detection_size=5)),
+        ("cross_validation", dict(h=7, n_windows=2)),
+    ],
+)
+@pytest.mark.parametrize("to_polars", [False, True])
+def test_prepared_matches_dataframe(series, method, kwargs, to_polars):
+    if to_polars:
+        series = pl.from_pandas(series)
+    client = MockNixtlaApi().client()
+    prepared = client.prepare(series)
+    expected = getattr(client, method)(df=series, **kwargs)
+    res = getattr(client, method)(df=prepared, **kwargs)
+    if to_polars:
+        assert res.equals(expected)
+    else:
+        pd.testing.assert_frame_equal(res, expected)
+
+
+def test_prepared_is_sorted_and_read_only(series):
+    client = MockNixtlaApi().client()
+    prepared = client.prepare(series)
+    assert isinstance(prepared, PreparedSeries)
+    assert prepared.freq == "D"
+    assert prepared.processed.sort_idxs is None
+    sorted_series = series.sort_values(["unique_id", "ds"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(prepared.df, sorted_series)
+    with pytest.raises(ValueError, match="read-only"):
+        prepared.processed.data[0, 0] = 0
+    with pytest.raises(AttributeError):
+        prepared.freq = "h"
+
+
+def test_calls_skip_validations(series, monkeypatch):
+    client = MockNixtlaApi().client()
+    prepared = client.prepare(series)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the series were validated again")
+
+    monkeypatch.setattr(client, "_validate_series", fail)
+    client.forecast(df=prepared, h=7)
+    client.cross_validation(df=prepared, h=7)
+    client.detect_anomalies(df=prepared)
+    assert client.finetune(df=prepared) == "mock-model"
+
+
+@pytest.mark.parametrize("to_polars", [False, True])
+def test_exogenous_and_date_features(series, to_polars):
+    series["x1"] = np.arange(series.shape[0], dtype=np.float64)
+    series["x2"] = 2 * series["x1"]
+    future = generate_series(5, min_length=7, max_length=7, freq="D")
+    future["unique_id"] = future["unique_id"].astype(str)
+    last_ds = series.groupby("unique_id")["ds"].max()
+    future["ds"] = future["unique_id"].map(last_ds) + pd.to_timedelta(
+        future.groupby("unique_id").cumcount() + 1, unit="D"
+    )
+    future = future.rename(columns={"y": "x1"})
+    if to_polars:
+        series, future = pl.from_pandas(series), pl.from_pandas(future)
+    # polars names the day of the week as weekday
+    weekday = "weekday" if to_polars else "dayofweek"
+    date_kwargs = dict(
+        date_features=[weekday, "month"], date_features_to_one_hot=[weekday]
+    )
+    for kwargs in (
+        dict(X_df=future, hist_exog_list=["x2"]),
+        dict(X_df=future),
+        dict(hist_exog_list=["x1"]),
+    ):
+        api = MockNixtlaApi(binary=False)
+        client = api.client()
+        prepared = client.prepare(series, **date_kwargs)
+        client.forecast(df=series, h=7, **kwargs, **date_kwargs)
+        client.forecast(df=prepared, h=7, **kwargs)
+        expected, res = [_payload(r) for r in api.endpoint_calls("v2/forecast")]
+        assert res == expected
+
+
+def test_prepared_argument_errors(series):
+    client = MockNixtlaApi().client()
+    prepared = client.prepare(series)
+    with pytest.raises(ValueError, match="prepared with freq='D'"):
+        client.forecast(df=prepared, h=7, freq="h")
+    with pytest.raises(ValueError, match="are set in `prepare`"):
+        client.forecast(df=prepared, h=7, date_features=True)
@@ -0,0 +1,71 @@
+import numpy as np
+import orjson
+import pandas as pd
+import polars as pl
+import pytest
+import utilsforecast.processing as ufp
+from utilsforecast.data import generate_series
+
+from nixtla.nixtla_client import _encode_payload, _process_df, _tail
+
+
+@pytest.fixture
+def series():
+    df = generate_series(5, min_length=20, max_length=40, n_static_features=3)
+    df["unique_id"] = df["unique_id"].astype(str)
+    df["flag"] = df["y"] > df["y"].median()
+    return df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("to_polars", [False, True])
+def test_matches_utilsforecast(series, to_polars):
+    if to_polars:
+        series = pl.from_pandas(series)
+    res = _process_df(series, id_col="unique_id", time_col="ds", target_col="y")
+    expected = ufp.process_df(series, id_col="unique_id", time_col="ds", target_col="y")
+    np.testing.assert_array_equal(res.uids, expected.uids)
+    np.testing.assert_array_equal(res.last_times, expected.last_times)
+    np.testing.assert_array_equal(res.indptr, expected.indptr)
+    np.testing.assert_array_equal(res.sort_idxs, expected.sort_idxs)
+    np.testing.assert_array_equal(res.data, expected.data.astype(np.float32))
+
+
+def test_columns_are_contiguous(series):
+    processed = _process_df(series, id_col="unique_id", time_col="ds", target_col="y")
+    assert processed.data.dtype == np.float32
+    # the target and the exogenous features are sent without copies
+    assert processed.data[:, 0].flags.c_contiguous
+    assert processed.data[:, 1:].T.flags.c_contiguous
+    tails = _tail(processed, 10).data
+    assert tails.flags.f_contiguous
+    np.testing.assert_array_equal(
+        tails,
+        processed.data[np.hstack([np.arange(e - 10, e) for e in processed.indptr[1:]])],
+    )
+
+
+def test_nullable_values():
+    df = pd.DataFrame(
+        {
+            "unique_id": [0, 0, 1],
+            "ds": [1, 2, 1],
+            "y": [1.0, 2.0, 3.0],
+            "x": pd.array([1, None, 3], dtype="Int64"),
+        }
+    )
+    for frame in (df, pl.from_pandas(df)):
+        processed = _process_df(
+            frame, id_col="unique_id", time_col="ds", target_col="y"
+        )
+        np.testing.assert_array_equal(processed.data[:, 1], [1.0, np.nan, 3.0])
+
+
+def test_encoding_doesnt_modify_buffers():
+    y = np.array([1.0, np.inf, -np.inf], dtype=np.float32)
+    y.flags.writeable = False
+    content, _ = _encode_payload({"y": y}, multithreaded_compress=False)
+    max_float = np.finfo(np.float32).max
+    np.testing.assert_allclose(
+        orjson.loads(content)["y"], [1.0, max_float, -max_float], rtol=1e-6
+    )
+    assert np.isinf(y[1:]).all()
@@ -0,0 +1,141 @@
+import asyncio
+import pickle
+import threading
+
+import pytest
+
+from nixtla.nixtla_client import (
+    AsyncNixtlaClient,
+    FileRateLimiter,
+    MemoryRateLimiter,
+    RedisRateLimiter,
+)
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
+
+
+class FakeRedis:
+    # implements the subset of the redis client used by the limiter
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None):
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            if isinstance(value, str):
+                value = value.encode()
+            self.data[key] = value
+            return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class RecordingLimiter(MemoryRateLimiter):
+    # keeps the delays returned to the client
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = []
+
+    def acquire(self):
+        delay = super().acquire()
+        self.delays.append(delay)
+        return delay
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(params=["memory", "file", "redis"])
+def make_limiter(request, tmp_path, clock):
+    redis = FakeRedis()
+
+    def make(**kwargs):
+        kwargs["time_fn"] = clock
+        if request.param == "memory":
+            return MemoryRateLimiter(**kwargs)
+        if request.param == "file":
+            return FileRateLimiter(tmp_path / "limiter.json", **kwargs)
+        return RedisRateLimiter(redis, **kwargs)
+
+    return make
+
+
+def test_token_bucket(make_limiter, clock):
+    limiter = make_limiter(requests_per_minute=600, burst=2)
+    delays = [limiter.acquire() for _ in range(4)]
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1)
+    # the requests reserve the next tokens
+    assert delays[3] == pytest.approx(0.2)
+    clock.advance(0.3)
+    assert limiter.acquire() == pytest.approx(0)
+    # the bucket doesn't refill past its capacity
+    clock.advance(60)
+    assert [limiter.acquire() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+
+def test_drain(make_limiter, clock):
+    limiter = make_limiter(requests_per_minute=600, burst=5)
+    limiter.drain()
+    assert limiter.acquire() == pytest.approx(0.1)
+    clock.advance(0.2)
+    assert limiter.acquire() == 0
+
+
+def test_shared_state(tmp_path, clock):
+    # limiters on the same file share the budget, e.g. from several processes
+    path = tmp_path / "limiter.json"
+    a = FileRateLimiter(path, requests_per_minute=600, burst=1, time_fn=clock)
+    b = FileRateLimiter(path, requests_per_minute=600, burst=1, time_fn=clock)
+    assert a.acquire() == 0
+    assert b.acquire() == pytest.approx(0.1)
+    # and the memory ones keep working after being serialized
+    limiter = pickle.loads(pickle.dumps(MemoryRateLimiter(requests_per_minute=60)))
+    assert limiter.acquire() == 0
+
+
+def test_seeded_from_usage(daily_series):
+    api = MockNixtlaApi()
+    limiter = MemoryRateLimiter()
+    client = api.client(rate_limiter=limiter)
+    client.forecast(df=daily_series, h=7, num_partitions=2)
+    client.forecast(df=daily_series, h=7)
+    assert limiter.requests_per_minute == 100
+    assert limiter._capacity == 10
+    assert len(api.endpoint_calls("usage")) == 1
+
+
+def test_partitions_are_paced(daily_series, clock):
+    api = MockNixtlaApi()
+    limiter = RecordingLimiter(requests_per_minute=1200, burst=1, time_fn=clock)
+    client = api.client(rate_limiter=limiter, max_concurrency=4)
+    client.forecast(df=daily_series, h=7, num_partitions=4)
+    # one request every 50ms, the clock is stopped so none is refilled
+    assert sorted(limiter.delays) == pytest.approx([0, 0.05, 0.1, 0.15])
+    assert not api.endpoint_calls("usage")
+
+
+def test_async_pacing(daily_series, clock):
+    api = MockNixtlaApi()
+    limiter = RecordingLimiter(requests_per_minute=1200, burst=1, time_fn=clock)
+    client = api.client(AsyncNixtlaClient, rate_limiter=limiter)
+    asyncio.run(client.aforecast(df=daily_series, h=7, num_partitions=4))
+    assert sorted(limiter.delays) == pytest.approx([0, 0.05, 0.1, 0.15])
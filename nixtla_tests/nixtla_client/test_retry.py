@@ -1,12 +1,21 @@
+import asyncio
+import datetime
+import email.utils
 import httpx
+import pandas as pd
 import pytest
+import threading
 import time
 
 from itertools import product
 from nixtla.nixtla_client import (
     ApiError,
+    AsyncNixtlaClient,
+    RetryPolicy,
+    _parse_retry_after,
 )
 from nixtla_tests.helpers.checks import check_retry_behavior
+from nixtla_tests.helpers.mock_api import MockNixtlaApi
 
 
 def raise_api_error_with_text(*args, **kwargs):
@@ -87,3 +96,120 @@ def test_retry_behavior_set2(air_passengers_df, retry_settings, side_effect_sett
         retry_interval=retry_interval,
         max_wait_time=max_wait_time,
     )
+
+
+class FlakyApi(MockNixtlaApi):
+    """Fails the first `n_failures` forecast requests with a 429."""
+
+    def __init__(self, n_failures, retry_after=None):
+        super().__init__()
+        self.n_failures = n_failures
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if request.url.path.endswith("forecast"):
+            with self.lock:
+                fail = self.n_failures > 0
+                self.n_failures -= 1
+            if fail:
+                headers = {}
+                if self.retry_after is not None:
+                    headers["Retry-After"] = self.retry_after
+                return httpx.Response(
+                    429, json={"detail": "Too many requests"}, headers=headers
+                )
+        return super().__call__(request)
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(initial_interval=1, multiplier=2, max_interval=5, jitter=False)
+    assert [policy._delay(n, None) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+    assert policy._delay(1, retry_after=3) == 3
+    policy = RetryPolicy(initial_interval=1, max_interval=5)
+    delays = [policy._delay(4, None) for _ in range(100)]
+    assert all(0 <= d <= 5 for d in delays)
+    assert len(set(delays)) > 1
+    policy = RetryPolicy(jitter=False, respect_retry_after=False)
+    assert policy._delay(1, retry_after=30) == 1
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("2") == 2
+    assert _parse_retry_after("invalid") is None
+    date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    delay = _parse_retry_after(email.utils.format_datetime(date, usegmt=True))
+    assert 25 < delay <= 30
+
+
+def test_retry_stats(daily_series):
+    api = FlakyApi(n_failures=2)
+    client = api.client(retry_policy=RetryPolicy(initial_interval=0.01))
+    expected = MockNixtlaApi().client().forecast(df=daily_series, h=7)
+    pd.testing.assert_frame_equal(client.forecast(df=daily_series, h=7), expected)
+    assert client.retry_stats["retries"] == 2
+    assert client.retry_stats["requests"] == 2  # model params and forecast
+    assert 0 <= client.retry_stats["wait_time"] <= 0.03
+    client.forecast(df=daily_series, h=7, num_partitions=3)
+    assert client.retry_stats == {
+        "requests": 3,
+        "retries": 0,
+        "wait_time": 0.0,
+        "retries_denied": 0,
+    }
+
+
+def test_retry_stats_partitioned(daily_series):
+    api = FlakyApi(n_failures=3)
+    client = api.client(retry_interval=0)
+    client.forecast(df=daily_series, h=7, num_partitions=3)
+    assert client.retry_stats["retries"] == 3
+    assert client.retry_stats["requests"] == 4
+
+
+def test_retry_after_is_respected(daily_series):
+    api = FlakyApi(n_failures=1, retry_after="0.2")
+    client = api.client(retry_interval=0)
+    client.forecast(df=daily_series, h=7)
+    assert client.retry_stats["wait_time"] == pytest.approx(0.2)
+
+
+def test_retry_budget(daily_series):
+    api = FlakyApi(n_failures=10)
+    policy = RetryPolicy(initial_interval=0, budget_ratio=0.1, budget_reserve=2)
+    client = api.client(retry_policy=policy)
+    with pytest.raises(ApiError, match="429"):
+        client.forecast(df=daily_series, h=7)
+    assert client.retry_stats["retries"] == 2
+    assert client.retry_stats["retries_denied"] == 1
+    # the budget is shared by the client's calls
+    with pytest.raises(ApiError, match="429"):
+        client.forecast(df=daily_series, h=7)
+    assert client.retry_stats["retries"] == 0
+
+
+def test_retry_stats_per_call(daily_series):
+    api = FlakyApi(n_failures=2)
+    policy = RetryPolicy(initial_interval=0.05, jitter=False)
+    client = api.client(AsyncNixtlaClient, retry_policy=policy)
+
+    async def main():
+        fcst_done = asyncio.Event()
+
+        async def forecast():
+            await client.aforecast(df=daily_series, h=7)
+            fcst_done.set()
+            return client.retry_stats
+
+        async def detect_anomalies():
+            await client.adetect_anomalies(df=daily_series)
+            # the other call finished after this one
+            await fcst_done.wait()
+            return client.retry_stats
+
+        return await asyncio.gather(forecast(), detect_anomalies())
+
+    fcst_stats, anomalies_stats = asyncio.run(main())
+    assert fcst_stats["retries"] == 2
+    assert anomalies_stats["retries"] == 0
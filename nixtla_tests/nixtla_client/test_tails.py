@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import utilsforecast.processing as ufp
+
+from nixtla.nixtla_client import _array_tails, _tail
+
+
+def _reference_tails(x, indptr, out_sizes):
+    # gathers the tails with a loop over the series
+    return np.concatenate(
+        [x[end - size : end] for end, size in zip(indptr[1:], out_sizes)]
+    )
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(0, 20, size=1_000)
+    indptr = np.append(0, sizes.cumsum())
+    x = rng.random((indptr[-1], 3))
+    return x, indptr, sizes
+
+
+def test_array_tails(data):
+    x, indptr, sizes = data
+    out_sizes = np.minimum(sizes, 5)
+    np.testing.assert_array_equal(
+        _array_tails(x, indptr, out_sizes), _reference_tails(x, indptr, out_sizes)
+    )
+    np.testing.assert_array_equal(
+        _array_tails(x[:, 0], indptr, np.zeros_like(sizes)), np.empty(0)
+    )
+    with pytest.raises(ValueError, match="at most the original sizes"):
+        _array_tails(x, indptr, sizes + 1)
+
+
+def test_whole_series_are_not_copied(data):
+    x, indptr, sizes = data
+    assert _array_tails(x, indptr, sizes) is x
+    proc = ufp.ProcessedDF(
+        uids=np.arange(sizes.size),
+        last_times=np.arange(sizes.size),
+        data=x,
+        indptr=indptr,
+        sort_idxs=np.arange(x.shape[0]),
+    )
+    tailed = _tail(proc, sizes.max())
+    assert tailed.data is x
+    assert tailed.sort_idxs is None
+    tailed = _tail(proc, 5)
+    np.testing.assert_array_equal(np.diff(tailed.indptr), np.minimum(sizes, 5))
+    np.testing.assert_array_equal(
+        tailed.data, _reference_tails(x, indptr, np.minimum(sizes, 5))
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tails_match_loop(seed):
+    rng = np.random.default_rng(seed)
+    # includes empty and short series
+    sizes = rng.integers(0, 8, size=rng.integers(1, 50))
+    indptr = np.append(0, sizes.cumsum())
+    proc = ufp.ProcessedDF(
+        uids=np.arange(sizes.size),
+        last_times=np.arange(sizes.size),
+        data=rng.random((indptr[-1], 2)),
+        indptr=indptr,
+        sort_idxs=np.arange(indptr[-1]),
+    )
+    # n can be larger than every series
+    for n in range(10):
+        out_sizes = np.minimum(sizes, n)
+        tailed = _tail(proc, n)
+        np.testing.assert_array_equal(np.diff(tailed.indptr), out_sizes)
+        np.testing.assert_array_equal(
+            tailed.data, _reference_tails(proc.data, indptr, out_sizes)
+        )
+        np.testing.assert_array_equal(
+            _array_tails(proc.data[:, 0], indptr, out_sizes),
+            _reference_tails(proc.data[:, 0], indptr, out_sizes),
+        )
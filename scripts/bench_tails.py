@@ -0,0 +1,42 @@
+"""Times the gather of the series' tails against a loop over the series.
+
+Run with `python scripts/bench_tails.py`. The time of `_array_tails` should
+grow linearly with the number of series.
+"""
+
+import time
+
+import numpy as np
+
+from nixtla.nixtla_client import _array_tails
+
+
+def loop_tails(x, indptr, out_sizes):
+    idxs = np.hstack(
+        [np.arange(end - size, end) for end, size in zip(indptr[1:], out_sizes)]
+    )
+    return x[idxs]
+
+
+def best_time(fn, *args, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+print(f"{'series':>10} {'loop':>9} {'vectorized':>11}")
+for n_series in (100_000, 1_000_000, 5_000_000):
+    # gathers 3 of 10 rows per series
+    sizes = np.full(n_series, 10)
+    indptr = np.append(0, sizes.cumsum())
+    x = np.zeros(indptr[-1], dtype=np.float32)
+    out_sizes = np.full(n_series, 3)
+    vectorized = best_time(_array_tails, x, indptr, out_sizes)
+    if n_series <= 1_000_000:
+        loop = f"{best_time(loop_tails, x, indptr, out_sizes, repeats=1):.3f}s"
+    else:
+        loop = "-"
+    print(f"{n_series:>10,} {loop:>9} {vectorized:>10.3f}s")